@@ -0,0 +1,86 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+
+# Alias of the replica serving the reads of the current request, if any.
+read_replica = ContextVar("read_replica", default=None)
+
+
+def get_primary_pin_key(user_id) -> str:
+    return f"app:databases:primary-pin:user:{user_id}"
+
+
+def pin_to_primary(user_id) -> None:
+    """
+    Reads of the user go to the primary until replicas have caught up
+    with their writes (read-your-writes). Deployments with several
+    processes need a shared default cache (DEFAULT_CACHE_BACKEND=redis).
+    """
+    cache.set(get_primary_pin_key(user_id), True, settings.DATABASE_REPLICA_LAG.total_seconds())
+
+
+def is_pinned_to_primary(user) -> bool:
+    return user.is_authenticated and cache.get(get_primary_pin_key(user.pk), False)
+
+
+def get_read_replica(user, changed_at: float) -> str | None:
+    """
+    Alias of a randomly picked replica, or None when there are none, the
+    user is pinned to the primary, or the data to read changed at
+    `changed_at` (a timestamp) more recently than replicas may lag behind.
+    """
+    if not settings.DATABASE_REPLICAS or time.time() - changed_at <= settings.DATABASE_REPLICA_LAG.total_seconds():
+        return None
+
+    if is_pinned_to_primary(user):
+        return None
+
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+@contextmanager
+def reads_from(alias: str | None):
+    """Routes the reads of the block to the replica `alias`, or the primary."""
+    token = read_replica.set(alias)
+
+    try:
+        yield
+    finally:
+        read_replica.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends reads inside reads_from() to its replica and everything else,
+    writes and migrations included, to the primary ("default").
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_replica.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+def get_pool_stats() -> dict:
+    """
+    Statistics of the connection pool of every database in this process
+    (see psycopg_pool's ConnectionPool.get_stats()), None when not pooled.
+    """
+    return {
+        alias: connections[alias].pool.get_stats() if connections[alias].pool else None
+        for alias in settings.DATABASES
+    }
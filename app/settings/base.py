@@ -48,6 +48,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'debug_toolbar',
@@ -129,21 +130,116 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": False,
 }
 
+# Seats reserved through /flights/{id}/holds/ are released after this delay.
+SEAT_HOLD_TTL = timedelta(seconds=int(os.environ.get("SEAT_HOLD_TTL_SECONDS", 10 * 60)))
+
 WSGI_APPLICATION = 'app.wsgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# POSTGRES_POOL=1 serves connections from a psycopg pool per process (sized
+# by POSTGRES_POOL_MIN_SIZE / POSTGRES_POOL_MAX_SIZE); otherwise connections
+# are kept open for POSTGRES_CONN_MAX_AGE seconds. The pool is the one to use
+# under ASGI, where persistent connections are not reused.
+# POSTGRES_REPLICA_HOSTS ("host:port,host:port") adds streaming replicas of
+# the primary; list and retrieve responses are read from them, see
+# app.databases.
 
-DATABASES = {
-    "default": {
+POSTGRES_POOL = os.environ.get("POSTGRES_POOL", "0") == "1"
+
+
+def get_database(host, port) -> dict:
+    database = {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": os.environ.get("POSTGRES_DB"),
         "USER": os.environ.get("POSTGRES_USER"),
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
-        "HOST": os.environ.get('POSTGRES_HOST'),
-        "PORT": os.environ.get('POSTGRES_PORT'),
+        "HOST": host,
+        "PORT": port,
     }
+
+    if POSTGRES_POOL:
+        database["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.environ.get("POSTGRES_POOL_MIN_SIZE", 2)),
+                "max_size": int(os.environ.get("POSTGRES_POOL_MAX_SIZE", 10)),
+                "timeout": int(os.environ.get("POSTGRES_POOL_TIMEOUT_SECONDS", 10)),
+            },
+        }
+    else:
+        database["CONN_MAX_AGE"] = int(os.environ.get("POSTGRES_CONN_MAX_AGE", 60))
+        database["CONN_HEALTH_CHECKS"] = True
+
+    return database
+
+
+DATABASE_REPLICA_HOSTS = [
+    host.strip().partition(":")
+    for host in os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")
+    if host.strip()
+]
+
+DATABASE_REPLICAS = [f"replica_{number}" for number in range(1, len(DATABASE_REPLICA_HOSTS) + 1)]
+
+# Replicas are assumed to replay a write within this delay: data changed
+# more recently, and users who have just placed an order, read from the
+# primary.
+DATABASE_REPLICA_LAG = timedelta(seconds=int(os.environ.get("POSTGRES_REPLICA_LAG_SECONDS", 5)))
+
+DATABASES = {
+    "default": get_database(os.environ.get("POSTGRES_HOST"), os.environ.get("POSTGRES_PORT")),
+    **{
+        alias: {**get_database(host, port), "TEST": {"MIRROR": "default"}}
+        for alias, (host, _, port) in zip(DATABASE_REPLICAS, DATABASE_REPLICA_HOSTS)
+    },
+}
+
+DATABASE_ROUTERS = ["app.databases.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The "catalog" cache keeps rendered responses of the reference catalogs
+# (airports, routes, manufacturers, airplanes) and the version tokens that
+# invalidate them; CATALOG_CACHE_BACKEND picks "locmem", "file" or "redis".
+# Only redis is shared by several processes: with locmem, a write through
+# one process leaves the cached responses and ETags of the others stale.
+
+CATALOG_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "catalog",
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("CATALOG_CACHE_LOCATION") or "/tmp/airport-api-catalog-cache",
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("CATALOG_CACHE_LOCATION") or "redis://127.0.0.1:6379/1",
+    },
+}
+
+# The default cache holds seat maps, departure boards and route graphs;
+# DEFAULT_CACHE_BACKEND=redis shares them between processes.
+
+DEFAULT_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "redis": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("DEFAULT_CACHE_LOCATION") or "redis://127.0.0.1:6379/0",
+    },
+}
+
+CACHES = {
+    "default": DEFAULT_CACHE_BACKENDS[os.environ.get("DEFAULT_CACHE_BACKEND") or "locmem"],
+    "catalog": {
+        **CATALOG_CACHE_BACKENDS[os.environ.get("CATALOG_CACHE_BACKEND") or "locmem"],
+        "TIMEOUT": int(os.environ.get("CATALOG_CACHE_TIMEOUT_SECONDS", 60 * 60)),
+    },
 }
 
 
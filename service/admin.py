@@ -1,9 +1,10 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
-from .models import Airport, Route, AirplaneType, Manufacturer, Airplane, Crew, Order, Flight, Ticket
+from .models import Airport, Route, AirplaneType, Manufacturer, Airplane, Crew, Order, Flight, Ticket, SeatHold
 from .utils import get_admin_url
+from .crews import flights_crew_composition_errors
 from .forms import FlightForm
 
 admin.site.register(Crew)
@@ -120,6 +121,17 @@ class FlightAdmin(admin.ModelAdmin):
     list_display = ("id", "route", "airplane", "departure_time", "arrival_time")
     list_filter = ("departure_time", "arrival_time")
     search_fields = ("route__source__name", "route__destination__name")
+    actions = ["check_crew_composition"]
+
+    @admin.action(description="Check crew composition of selected flights")
+    def check_crew_composition(self, request, queryset):
+        errors = flights_crew_composition_errors(list(queryset.select_related("airplane")))
+
+        for flight_id, error in errors.items():
+            self.message_user(request, f"Flight {flight_id}: {error}", messages.ERROR)
+
+        if not errors:
+            self.message_user(request, "All selected flights have a complete crew.", messages.SUCCESS)
 
 
 @admin.register(Order)
@@ -145,4 +157,11 @@ class TicketAdmin(admin.ModelAdmin):
             return format_html(mark_safe('<a href="{}">{}</a>'), url, obj.flight)
         return None
 
-    flight_link.short_description = "Destination"
\ No newline at end of file
+    flight_link.short_description = "Destination"
+
+
+@admin.register(SeatHold)
+class SeatHoldAdmin(admin.ModelAdmin):
+    list_display = ("id", "flight", "user", "row", "seat", "expires_at")
+    list_filter = ("expires_at",)
+    search_fields = ("user__username",)
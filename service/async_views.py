@@ -0,0 +1,180 @@
+from inspect import isawaitable
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from drf_spectacular.utils import extend_schema_view, extend_schema
+from rest_framework import status
+from rest_framework.response import Response
+
+from service.serializers import (
+    AirportSerializer,
+    RouteListSerializer,
+    RouteRetrieveSerializer,
+    FlightReadSerializer,
+    OrderReadSerializer,
+)
+from service.views import AirportViewSet, RouteViewSet, FlightViewSet, OrdersViewSet
+
+
+class AsyncReadOnlyMixin:
+    """
+    Serves list and retrieve of a (conditional response) viewset from an
+    async view: querysets are evaluated through the async ORM and cache
+    lookups through the async cache API, so under ASGI a request waiting
+    on Postgres or Redis does not hold a worker.
+
+    Authentication, permissions and serialization are synchronous in DRF
+    and run in a thread with sync_to_async. Other actions of the viewset
+    are not routed and other methods are answered with 405.
+    """
+    http_method_names = ["get", "head", "options"]
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        # ViewSetMixin.as_view() returns a plain function, which Django
+        # would call as a sync view.
+        return markcoroutinefunction(super().as_view(actions, **initkwargs))
+
+    @classmethod
+    def get_extra_actions(cls):
+        return []
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+
+            if isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def list(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.alist, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.aretrieve, request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+
+            if page is not None:
+                return self.get_paginated_response(await self.aserialize(page, many=True))
+
+        instances = [instance async for instance in queryset]
+
+        return Response(await self.aserialize(instances, many=True), status=status.HTTP_200_OK)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+
+        return Response(await self.aserialize(instance), status=status.HTTP_200_OK)
+
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+
+        try:
+            instance = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+
+        self.check_object_permissions(self.request, instance)
+
+        return instance
+
+    async def aserialize(self, instance, many: bool = False):
+        # Serializers may still follow relations the queryset did not load.
+        return await sync_to_async(lambda: self.get_serializer(instance, many=many).data)()
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Airports list (async)",
+        description="Get a list of airports. Served by an async view.",
+        tags=["Async"],
+        responses={200: AirportSerializer(many=True)},
+    ),
+    retrieve=extend_schema(
+        summary="Airport details (async)",
+        description="Get details of an airport. Served by an async view.",
+        tags=["Async"],
+        responses={200: AirportSerializer},
+    ),
+)
+class AsyncAirportViewSet(AsyncReadOnlyMixin, AirportViewSet):
+    pass
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Routes list (async)",
+        description="Get a list of routes. Served by an async view.",
+        tags=["Async"],
+        responses={200: RouteListSerializer(many=True)},
+    ),
+    retrieve=extend_schema(
+        summary="Route details (async)",
+        description="Get details of a route. Served by an async view.",
+        tags=["Async"],
+        responses={200: RouteRetrieveSerializer},
+    ),
+)
+class AsyncRouteViewSet(AsyncReadOnlyMixin, RouteViewSet):
+    pass
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Flights list (async)",
+        description="Get a list of flights. Served by an async view.",
+        tags=["Async"],
+        responses={200: FlightReadSerializer(many=True)},
+    ),
+    retrieve=extend_schema(
+        summary="Flight details (async)",
+        description="Get details of a flight. Served by an async view.",
+        tags=["Async"],
+        responses={200: FlightReadSerializer},
+    ),
+)
+class AsyncFlightViewSet(AsyncReadOnlyMixin, FlightViewSet):
+    pass
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Orders list (async)",
+        description="Get a list of the current user's orders. Served by an async view.",
+        tags=["Async"],
+        responses={200: OrderReadSerializer(many=True)},
+    ),
+    retrieve=extend_schema(
+        summary="Order details (async)",
+        description="Get details of an order of the current user. Served by an async view.",
+        tags=["Async"],
+        responses={200: OrderReadSerializer},
+    ),
+)
+class AsyncOrdersViewSet(AsyncReadOnlyMixin, OrdersViewSet):
+    pass
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .constants import BOARD_SINCE_MAX_HOURS
+from .models import Flight, FlightRemoval
+
+
+DEPARTURES = "departures"
+ARRIVALS = "arrivals"
+
+BOARD_LOOKUPS = {
+    DEPARTURES: ("route__source", "departure_time", "route__destination"),
+    ARRIVALS: ("route__destination", "arrival_time", "route__source"),
+}
+
+REMOVAL_LOOKUPS = {
+    DEPARTURES: ("source_id", "departure_time"),
+    ARRIVALS: ("destination_id", "arrival_time"),
+}
+
+
+def get_window(airport_id: int, direction: str, after: datetime, before: datetime) -> QuerySet:
+    airport_field, time_field, _ = BOARD_LOOKUPS[direction]
+
+    return Flight.objects.filter(**{
+        airport_field: airport_id,
+        f"{time_field}__gte": after,
+        f"{time_field}__lt": before,
+    })
+
+
+def get_board(
+    airport_id: int,
+    direction: str,
+    after: datetime,
+    before: datetime,
+    since: datetime | None,
+    limit: int,
+) -> list[Flight]:
+    """
+    Flights leaving (departures) or reaching (arrivals) the airport within
+    the window, by time. The airport's routes are joined to flights through
+    the (route, departure_time) or (route, arrival_time) index. With `since`,
+    only flights changed after it are returned; see get_board_removals()
+    for the ones that left the window.
+    """
+    _, time_field, other_airport = BOARD_LOOKUPS[direction]
+
+    flights = (
+        get_window(airport_id, direction, after, before)
+            .select_related(other_airport, "airplane")
+            .order_by(time_field, "id")
+    )
+
+    if since is not None:
+        flights = flights.filter(updated_at__gt=since)
+
+    return list(flights[:limit])
+
+
+def get_board_removals(
+    airport_id: int,
+    direction: str,
+    after: datetime,
+    before: datetime,
+    since: datetime,
+) -> list[int]:
+    """
+    Ids of flights that were in the window and left it after `since`:
+    deleted, or moved to another route or time outside the window.
+    """
+    airport_field, time_field = REMOVAL_LOOKUPS[direction]
+
+    return list(
+        FlightRemoval.objects
+            .filter(**{
+                airport_field: airport_id,
+                f"{time_field}__gte": after,
+                f"{time_field}__lt": before,
+                "removed_at__gt": since,
+            })
+            .exclude(flight_id__in=get_window(airport_id, direction, after, before).values("id"))
+            .order_by("flight_id")
+            .values_list("flight_id", flat=True)
+            .distinct()
+    )
+
+
+def reap_flight_removals() -> int:
+    """Delete removals older than any `since` that boards accept."""
+    deleted, _ = FlightRemoval.objects.filter(
+        removed_at__lt=timezone.now() - timedelta(hours=BOARD_SINCE_MAX_HOURS)
+    ).delete()
+
+    return deleted
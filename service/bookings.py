@@ -0,0 +1,165 @@
+import uuid
+from collections import defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .caches import bump_catalog_version
+from .exceptions import SeatsAlreadyBooked
+from .models import Flight, Ticket, SeatHold
+from .seat_maps import invalidate_seat_maps
+
+
+SEATS_HELD_MESSAGE = "Some of the requested seats are held by another customer."
+
+
+def _group_seats(tickets) -> dict[int, list[tuple[int, int]]]:
+    seats = defaultdict(list)
+
+    for ticket in tickets:
+        seats[ticket.flight_id].append((ticket.row, ticket.seat))
+
+    return seats
+
+
+def seats_filter(tickets) -> Q:
+    """Match rows having any of the (flight, row, seat) triples of the given tickets."""
+    seats = Q()
+
+    for ticket in tickets:
+        seats |= Q(flight=ticket.flight_id, row=ticket.row, seat=ticket.seat)
+
+    return seats
+
+
+def tickets_booked(tickets) -> None:
+    """Keep flight counters, cached seat maps and response versions in step with new tickets."""
+    seats = _group_seats(tickets)
+
+    for flight_id, flight_seats in seats.items():
+        Flight.change_tickets_sold(flight_id, len(flight_seats))
+
+    transaction.on_commit(partial(invalidate_seat_maps, list(seats)))
+    transaction.on_commit(partial(bump_catalog_version, Ticket))
+
+
+def tickets_released(tickets) -> None:
+    seats = _group_seats(tickets)
+
+    for flight_id, flight_seats in seats.items():
+        Flight.change_tickets_sold(flight_id, -len(flight_seats))
+
+    transaction.on_commit(partial(invalidate_seat_maps, list(seats)))
+    transaction.on_commit(partial(bump_catalog_version, Ticket))
+
+
+def hold_seats(flight: Flight, user, seats: list[tuple[int, int]]) -> list[SeatHold]:
+    """
+    Reserve all seats for the user until SEAT_HOLD_TTL passes, or none of them.
+    Seats are claimed with INSERT ... ON CONFLICT DO NOTHING: losers skip
+    seats already held by a committed transaction and find fewer holds under
+    their token. They wait only on a seat another booker is inserting at the
+    same moment, until that short transaction ends. The user's own live
+    holds are extended.
+    """
+    now = timezone.now()
+    token = uuid.uuid4()
+    expires_at = now + settings.SEAT_HOLD_TTL
+    holds = [
+        SeatHold(flight=flight, user=user, row=row, seat=seat, token=token, expires_at=expires_at)
+        for row, seat in seats
+    ]
+    requested = seats_filter(holds)
+
+    with transaction.atomic():
+        booked = list(
+            Ticket.objects
+                .filter(requested)
+                .order_by("row", "seat")
+                .values("flight", "row", "seat")
+        )
+
+        if booked:
+            raise SeatsAlreadyBooked(booked)
+
+        SeatHold.objects.filter(requested, expires_at__lte=now).delete()
+        SeatHold.objects.filter(requested, user=user).update(token=token, expires_at=expires_at)
+        SeatHold.objects.bulk_create(holds, ignore_conflicts=True)
+
+        claimed = list(SeatHold.objects.filter(flight=flight, token=token).order_by("row", "seat"))
+
+        if len(claimed) < len(holds):
+            claimed_seats = {(hold.row, hold.seat) for hold in claimed}
+
+            raise SeatsAlreadyBooked(
+                [
+                    {"flight": flight.id, "row": row, "seat": seat}
+                    for row, seat in sorted(seats)
+                    if (row, seat) not in claimed_seats
+                ],
+                detail=SEATS_HELD_MESSAGE
+            )
+
+    return claimed
+
+
+def release_seat_holds(flight: Flight, user) -> int:
+    deleted, _ = SeatHold.objects.filter(flight=flight, user=user).delete()
+    return deleted
+
+
+def held_seats(flight: Flight, user) -> list[tuple[int, int]]:
+    """Seats of the flight currently held by other customers."""
+    return list(
+        SeatHold.objects
+            .filter(flight=flight, expires_at__gt=timezone.now())
+            .exclude(user=user)
+            .values_list("row", "seat")
+    )
+
+
+def confirm_seat_holds(user, tickets) -> None:
+    """
+    Called inside order creation: fails when another customer holds one of
+    the seats and consumes the user's own holds for them.
+    """
+    requested = seats_filter(tickets)
+    held = list(
+        SeatHold.objects
+            .filter(requested, expires_at__gt=timezone.now())
+            .exclude(user=user)
+            .order_by("flight", "row", "seat")
+            .values("flight", "row", "seat")
+    )
+
+    if held:
+        raise SeatsAlreadyBooked(held, detail=SEATS_HELD_MESSAGE)
+
+    SeatHold.objects.filter(requested, user=user).delete()
+
+
+def reap_expired_seat_holds(batch_size: int = 1000) -> int:
+    """
+    Delete expired holds in batches. Rows locked by a concurrent reaper or
+    booker are skipped rather than waited for.
+    """
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            expired = list(
+                SeatHold.objects
+                    .filter(expires_at__lte=timezone.now())
+                    .select_for_update(skip_locked=True)
+                    .order_by("expires_at")
+                    .values_list("id", flat=True)[:batch_size]
+            )
+
+            if not expired:
+                return total
+
+            deleted, _ = SeatHold.objects.filter(id__in=expired).delete()
+            total += deleted
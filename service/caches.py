@@ -0,0 +1,223 @@
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from app.databases import get_read_replica, reads_from
+
+
+CATALOG_CACHE_ALIAS = "catalog"
+CATALOG_STATS_KEYS = {
+    "hits": "service:catalog:stats:hits",
+    "misses": "service:catalog:stats:misses",
+}
+
+
+def get_catalog_cache():
+    return caches[CATALOG_CACHE_ALIAS]
+
+
+def get_catalog_version_key(model) -> str:
+    return f"service:catalog:version:{model._meta.label_lower}"
+
+
+def get_catalog_versions(models) -> list[int]:
+    """
+    Current version token of every model. A token that is missing (never
+    set or evicted) is started afresh, which can only cause extra misses.
+    """
+    cache = get_catalog_cache()
+    keys = [get_catalog_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+
+def bump_catalog_version(model) -> None:
+    get_catalog_cache().set(get_catalog_version_key(model), time.time_ns(), None)
+
+
+def record_catalog_lookup(hit: bool) -> None:
+    cache = get_catalog_cache()
+    key = CATALOG_STATS_KEYS["hits" if hit else "misses"]
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def get_catalog_stats() -> dict:
+    counters = get_catalog_cache().get_many(CATALOG_STATS_KEYS.values())
+    stats = {name: counters.get(key, 0) for name, key in CATALOG_STATS_KEYS.items()}
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else None
+
+    return stats
+
+
+def reset_catalog_stats() -> None:
+    get_catalog_cache().delete_many(CATALOG_STATS_KEYS.values())
+
+
+class ConditionalResponseMixin:
+    """
+    Conditional GET for list and retrieve. The ETag is derived from the
+    version tokens of `cache_dependencies` (bumped by signals on every save
+    or delete, see signals) together with the request parameters and the
+    requester's role, and Last-Modified from the newest token, so a 304 is
+    answered without touching the queryset or the serializer. Other
+    responses are read from a replica once the newest token is older than
+    replicas may lag behind (see app.databases).
+    Queryset-level update()/bulk_create() send no signals and must call
+    bump_catalog_version() themselves. Actions left out of
+    `conditional_actions` are served as is, for responses that change
+    without a model change.
+    """
+    cache_dependencies = ()
+    conditional_actions = ("list", "retrieve")
+
+    def get_cache_role(self) -> str:
+        user = self.request.user
+
+        if user.is_staff:
+            return "admin"
+
+        return "user" if user.is_authenticated else "anonymous"
+
+    def get_response_cache_key(self, versions) -> str:
+        request = self.request
+        params = repr((
+            request.get_host(),
+            request.accepted_renderer.format,
+            sorted(self.kwargs.items()),
+            sorted(request.query_params.lists()),
+        ))
+
+        return ":".join((
+            "service:catalog:response",
+            self.basename,
+            self.action,
+            self.get_cache_role(),
+            ".".join(str(version) for version in versions),
+            hashlib.md5(params.encode()).hexdigest(),
+        ))
+
+    def get_response(self, handler, key, request, *args, **kwargs):
+        return handler(request, *args, **kwargs)
+
+    async def aget_response(self, handler, key, request, *args, **kwargs):
+        return await handler(request, *args, **kwargs)
+
+    def get_validators(self) -> tuple[str, str, float]:
+        """Response cache key, ETag and time of the newest version token (a timestamp)."""
+        versions = get_catalog_versions(self.cache_dependencies)
+        key = self.get_response_cache_key(versions)
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        changed_at = max(versions, default=0) / 10 ** 9
+
+        return key, etag, changed_at
+
+    @staticmethod
+    def set_validators(response, etag: str, last_modified: int):
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+
+        return response
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        key, etag, changed_at = self.get_validators()
+        last_modified = int(changed_at)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        with reads_from(get_read_replica(request.user, changed_at)):
+            response = self.get_response(handler, key, request, *args, **kwargs)
+
+        return self.set_validators(response, etag, last_modified)
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        """conditional_response() for an async handler."""
+        if self.action not in self.conditional_actions:
+            return await handler(request, *args, **kwargs)
+
+        key, etag, changed_at = await sync_to_async(self.get_validators)()
+        last_modified = int(changed_at)
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        replica = await sync_to_async(get_read_replica)(request.user, changed_at)
+
+        with reads_from(replica):
+            response = await self.aget_response(handler, key, request, *args, **kwargs)
+
+        return self.set_validators(response, etag, last_modified)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+
+class CachedResponseMixin(ConditionalResponseMixin):
+    """
+    Also serves list and retrieve responses from the catalog cache, under
+    keys holding the same version tokens, so stale entries are never read
+    again and simply expire.
+    """
+
+    def get_response(self, handler, key, request, *args, **kwargs):
+        cache = get_catalog_cache()
+        data = cache.get(key)
+
+        if data is not None:
+            record_catalog_lookup(hit=True)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        record_catalog_lookup(hit=False)
+        response = handler(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data)
+
+        response["X-Cache"] = "MISS"
+
+        return response
+
+    async def aget_response(self, handler, key, request, *args, **kwargs):
+        cache = get_catalog_cache()
+        data = await cache.aget(key)
+
+        if data is not None:
+            await sync_to_async(record_catalog_lookup)(hit=True)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        await sync_to_async(record_catalog_lookup)(hit=False)
+        response = await handler(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            await cache.aset(key, response.data)
+
+        response["X-Cache"] = "MISS"
+
+        return response
@@ -1 +1,59 @@
-MAX_PILOT_CAPACITY = 2
\ No newline at end of file
+MAX_PILOT_CAPACITY = 2
+
+SEAT_MAP_CACHE_TIMEOUT = 60 * 60
+
+SEAT_EVENTS_HEARTBEAT_SECONDS = 15
+SEAT_EVENTS_QUEUE_SIZE = 256
+SEAT_EVENTS_RETRY_MS = 3000
+
+ROUTE_GRAPH_CACHE_TIMEOUT = 60 * 60 * 24
+
+ITINERARY_MAX_LEGS = 3
+ITINERARY_DEFAULT_MAX_LEGS = 2
+ITINERARY_DEFAULT_MIN_CONNECTION_MINUTES = 45
+ITINERARY_DEFAULT_MAX_CONNECTION_MINUTES = 6 * 60
+ITINERARY_MAX_CONNECTION_MINUTES = 24 * 60
+ITINERARY_MAX_WINDOW_DAYS = 7
+ITINERARY_MAX_PARTIAL_JOURNEYS = 5000
+ITINERARY_RESULTS_LIMIT = 20
+
+GROUP_BOOKING_MAX_PASSENGERS = 20
+GROUP_BOOKING_ATTEMPTS = 3
+
+MANUFACTURER_AIRPLANES_DEFAULT_LIMIT = 20
+MANUFACTURER_AIRPLANES_MAX_LIMIT = 100
+
+AIRPLANE_FLIGHTS_DEFAULT_WINDOW_DAYS = 7
+AIRPLANE_FLIGHTS_MAX_WINDOW_DAYS = 90
+AIRPLANE_FLIGHTS_WINDOW_LIMIT = 50
+
+AIRPORT_SEARCH_DEFAULT_LIMIT = 10
+AIRPORT_SEARCH_MAX_LIMIT = 50
+AIRPORT_SEARCH_CACHED_PREFIX_LENGTH = 3
+AIRPORT_SEARCH_CACHE_TIMEOUT = 60 * 5
+
+BOARD_DEFAULT_PAST_HOURS = 1
+BOARD_DEFAULT_WINDOW_HOURS = 12
+BOARD_MAX_WINDOW_HOURS = 72
+BOARD_RESULTS_LIMIT = 200
+BOARD_CACHE_TIMEOUT = 5
+BOARD_SINCE_MAX_HOURS = 24
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNAR_BATCH_SIZE = 64 * 1024
+
+IMPORT_BATCH_SIZE = 2000
+IMPORT_MAX_REPORTED_ERRORS = 20
+
+SCHEDULE_MAX_DAYS = 366
+SCHEDULE_MAX_FLIGHTS = 2000
+
+UTILIZATION_DEFAULT_WINDOW_DAYS = 7
+UTILIZATION_MAX_WINDOW_DAYS = 31
+UTILIZATION_DEFAULT_MIN_GAP_HOURS = 1
+
+CREW_MAX_DUTY_HOURS_7_DAYS = 60
+CREW_MAX_DUTY_HOURS_28_DAYS = 190
+
+CREW_SCHEDULE_DEFAULT_WINDOW_DAYS = 28
+CREW_SCHEDULE_MAX_WINDOW_DAYS = 92
@@ -0,0 +1,254 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import Count, Exists, OuterRef, QuerySet
+
+from .choices import CrewTypeChoices
+from .constants import CREW_MAX_DUTY_HOURS_7_DAYS, CREW_MAX_DUTY_HOURS_28_DAYS
+from .models import Crew, Flight
+
+
+def count_crew(crew) -> Counter:
+    """
+    Crew members per crew type. A queryset is counted with one grouped
+    aggregate, loaded instances without a query.
+    """
+    if isinstance(crew, QuerySet):
+        return Counter(dict(
+            crew
+                .order_by()
+                .values("crew_type")
+                .annotate(count=Count("id"))
+                .values_list("crew_type", "count")
+        ))
+
+    return Counter(crew_person.crew_type for crew_person in crew)
+
+
+def crew_composition_error(airplane, counts: Counter) -> str | None:
+    """The first rule of the airplane's crew capacity broken by the counts, if any."""
+    flight_crew = counts[CrewTypeChoices.FLIGHT_CREW]
+    cabin_crew = counts[CrewTypeChoices.CABIN_CREW]
+
+    if cabin_crew > airplane.personal_capacity:
+        return "The number of cabin crew exceeds the airline's personal capacity."
+
+    if flight_crew > airplane.pilots_capacity:
+        return "The number of flight crew exceeds the airline's pilot capacity."
+
+    if cabin_crew < airplane.personal_capacity:
+        return f"The number of airline personal capacity must be at least {airplane.personal_capacity}."
+
+    if flight_crew < airplane.pilots_capacity:
+        return f"The number of airline pilots capacity must be at least {airplane.pilots_capacity}."
+
+    return None
+
+
+def validate_crew_composition(airplane, crew) -> None:
+    """Shared by FlightSerializer, FlightForm and the schedule endpoint."""
+    error = crew_composition_error(airplane, count_crew(crew))
+
+    if error:
+        raise ValidationError(error)
+
+
+def flights_crew_composition_errors(flights) -> dict[int, str]:
+    """
+    Composition errors of saved flights by flight id, from one grouped
+    aggregate over their crew rows. The flights' airplanes must be loaded.
+    """
+    counts = defaultdict(Counter)
+    rows = (
+        Flight.crew.through.objects
+            .filter(flight__in=[flight.pk for flight in flights])
+            .order_by()
+            .values("flight", "crew__crew_type")
+            .annotate(count=Count("id"))
+            .values_list("flight", "crew__crew_type", "count")
+    )
+
+    for flight_id, crew_type, count in rows:
+        counts[flight_id][crew_type] = count
+
+    errors = {}
+
+    for flight in flights:
+        error = crew_composition_error(flight.airplane, counts[flight.pk])
+
+        if error:
+            errors[flight.pk] = error
+
+    return errors
+
+
+# Flight time stands in for duty time: flights are the only duty recorded.
+ROSTER_SQL = """
+WITH roster AS (
+    SELECT flight_crew.crew_id, flight.id AS flight_id, flight.departure_time, flight.arrival_time
+    FROM {through} AS flight_crew
+    JOIN {flight} AS flight ON flight.id = flight_crew.flight_id
+    WHERE flight_crew.crew_id = ANY(%(crew)s)
+        AND flight.departure_time < %(last_arrival)s + INTERVAL '28 days'
+        AND flight.arrival_time > %(first_departure)s - INTERVAL '28 days'
+        AND flight.id IS DISTINCT FROM %(flight)s
+    UNION ALL
+    SELECT crew.crew_id, NULL, proposed.departure_time, proposed.arrival_time
+    FROM unnest(%(crew)s::bigint[]) AS crew (crew_id)
+    CROSS JOIN unnest(%(departures)s::timestamptz[], %(arrivals)s::timestamptz[])
+        AS proposed (departure_time, arrival_time)
+),
+duty AS (
+    SELECT
+        roster.*,
+        EXISTS (
+            SELECT 1
+            FROM unnest(%(departures)s::timestamptz[], %(arrivals)s::timestamptz[])
+                AS proposed (departure_time, arrival_time)
+            WHERE roster.flight_id IS NOT NULL
+                AND proposed.departure_time < roster.arrival_time
+                AND proposed.arrival_time > roster.departure_time
+        ) AS overlapping,
+        SUM(arrival_time - departure_time) OVER (
+            PARTITION BY crew_id ORDER BY departure_time
+            RANGE BETWEEN INTERVAL '7 days' PRECEDING AND CURRENT ROW
+        ) AS duty_7_days,
+        SUM(arrival_time - departure_time) OVER (
+            PARTITION BY crew_id ORDER BY departure_time
+            RANGE BETWEEN INTERVAL '28 days' PRECEDING AND CURRENT ROW
+        ) AS duty_28_days
+    FROM roster
+)
+SELECT
+    crew_id,
+    COALESCE(ARRAY_AGG(flight_id ORDER BY departure_time) FILTER (WHERE overlapping), '{{}}'),
+    EXTRACT(EPOCH FROM MAX(duty_7_days) FILTER (
+        WHERE departure_time >= %(first_departure)s
+            AND departure_time < %(last_departure)s + INTERVAL '7 days'
+    )) / 3600,
+    EXTRACT(EPOCH FROM MAX(duty_28_days) FILTER (
+        WHERE departure_time >= %(first_departure)s
+            AND departure_time < %(last_departure)s + INTERVAL '28 days'
+    )) / 3600
+FROM duty
+GROUP BY crew_id
+ORDER BY crew_id
+"""
+
+
+def roster_duty(crew_ids, periods, exclude_flight: int | None = None) -> list[dict]:
+    """
+    Check a roster against the crew's other flights, for one or more
+    proposed (departure, arrival) periods, in one statement. Per crew
+    member: flights overlapping any period, and the highest rolling 7 and
+    28 day duty hours over the windows the periods fall into.
+    """
+    crew_ids = sorted(set(crew_ids))
+    periods = sorted(periods)
+
+    if not crew_ids or not periods:
+        return []
+
+    departures = [departure for departure, _arrival in periods]
+    arrivals = [arrival for _departure, arrival in periods]
+    sql = ROSTER_SQL.format(
+        through=connection.ops.quote_name(Flight.crew.through._meta.db_table),
+        flight=connection.ops.quote_name(Flight._meta.db_table),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {
+            "crew": crew_ids,
+            "flight": exclude_flight,
+            "departures": departures,
+            "arrivals": arrivals,
+            "first_departure": departures[0],
+            "last_departure": departures[-1],
+            "last_arrival": max(arrivals),
+        })
+
+        return [
+            {
+                "crew": crew_id,
+                "overlapping_flights": overlapping,
+                "duty_hours_7_days": float(duty_7_days or 0),
+                "duty_hours_28_days": float(duty_28_days or 0),
+            }
+            for crew_id, overlapping, duty_7_days, duty_28_days in cursor.fetchall()
+        ]
+
+
+def roster_errors(crew_ids, periods, exclude_flight: int | None = None) -> list[str]:
+    errors = []
+
+    for duty in roster_duty(crew_ids, periods, exclude_flight):
+        crew_id = duty["crew"]
+
+        if duty["overlapping_flights"]:
+            flights = ", ".join(str(flight_id) for flight_id in duty["overlapping_flights"])
+            errors.append(f"Crew member {crew_id} is rostered on overlapping flights: {flights}.")
+
+        if duty["duty_hours_7_days"] > CREW_MAX_DUTY_HOURS_7_DAYS:
+            errors.append(
+                f"Crew member {crew_id} would be on duty {duty['duty_hours_7_days']:.1f} hours "
+                f"within 7 days, more than {CREW_MAX_DUTY_HOURS_7_DAYS}."
+            )
+
+        if duty["duty_hours_28_days"] > CREW_MAX_DUTY_HOURS_28_DAYS:
+            errors.append(
+                f"Crew member {crew_id} would be on duty {duty['duty_hours_28_days']:.1f} hours "
+                f"within 28 days, more than {CREW_MAX_DUTY_HOURS_28_DAYS}."
+            )
+
+    return errors
+
+
+def eligible_crew(flight: Flight, position: str | None = None, crew_type: str | None = None) -> list[Crew]:
+    """
+    Crew free for the flight: not on the flight already, not on any
+    overlapping flight, and with room for it in every rolling 7 and 28 day
+    window it falls into, checked by roster_duty() like roster_errors().
+    Each member gets the duty already rostered in the busiest windows as
+    duty_7_days and duty_28_days. Two statements whatever the crew size.
+    """
+    duration = flight.arrival_time - flight.departure_time
+    busy = Flight.objects.filter(
+        crew=OuterRef("pk"),
+        departure_time__lt=flight.arrival_time,
+        arrival_time__gt=flight.departure_time,
+    )
+    crew = Crew.objects.filter(~Exists(busy))
+
+    if position:
+        crew = crew.filter(position=position)
+
+    if crew_type:
+        crew = crew.filter(crew_type=crew_type)
+
+    crew = list(crew.order_by("position", "last_name", "first_name", "id"))
+    duties = {
+        duty["crew"]: duty
+        for duty in roster_duty(
+            [crew_person.pk for crew_person in crew],
+            [(flight.departure_time, flight.arrival_time)],
+            flight.pk,
+        )
+    }
+    eligible = []
+
+    for crew_person in crew:
+        duty = duties[crew_person.pk]
+
+        if (
+            duty["duty_hours_7_days"] > CREW_MAX_DUTY_HOURS_7_DAYS
+            or duty["duty_hours_28_days"] > CREW_MAX_DUTY_HOURS_28_DAYS
+        ):
+            continue
+
+        crew_person.duty_7_days = timedelta(hours=duty["duty_hours_7_days"]) - duration
+        crew_person.duty_28_days = timedelta(hours=duty["duty_hours_28_days"]) - duration
+        eligible.append(crew_person)
+
+    return eligible
@@ -0,0 +1,31 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class SeatsAlreadyBooked(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some of the requested seats are already booked."
+    default_code = "seats_already_booked"
+
+    def __init__(self, seats: list[dict], detail=None, code=None):
+        super().__init__(detail, code)
+
+        # Seats are kept as plain values instead of being coerced to ErrorDetail strings.
+        self.detail = {"detail": self.detail, "seats": seats}
+
+
+class NotEnoughSeats(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The flight has not enough free seats for this group."
+    default_code = "not_enough_seats"
+
+
+class ScheduleConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Some flights of the schedule overlap existing flights of the airplane."
+    default_code = "schedule_conflict"
+
+    def __init__(self, conflicts: list[dict], detail=None, code=None):
+        super().__init__(detail, code)
+
+        self.detail = {"detail": self.detail, "conflicts": conflicts}
@@ -0,0 +1,215 @@
+import csv
+import json
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .columnar import columnar_chunks
+from .constants import EXPORT_CHUNK_SIZE
+from .models import Route, Airplane, Crew, Flight, Ticket, Order
+
+
+# Column name -> lookup, per dataset.
+FLIGHT_COLUMNS = {
+    "id": "id",
+    "route": "route_id",
+    "source": "route__source__name",
+    "destination": "route__destination__name",
+    "airplane": "airplane__name",
+    "departure_time": "departure_time",
+    "arrival_time": "arrival_time",
+    "tickets_sold": "tickets_sold",
+}
+TICKET_COLUMNS = {
+    "id": "id",
+    "order": "order_id",
+    "user": "order__user_id",
+    "flight": "flight_id",
+    "row": "row",
+    "seat": "seat",
+    "departure_time": "flight__departure_time",
+    "arrival_time": "flight__arrival_time",
+    "source": "flight__route__source__name",
+    "destination": "flight__route__destination__name",
+}
+ORDER_COLUMNS = {
+    "id": "id",
+    "user": "user_id",
+    "created_at": "created_at",
+    "tickets": "tickets_count",
+}
+ROUTE_COLUMNS = {
+    "id": "id",
+    "source": "source_id",
+    "source_name": "source__name",
+    "destination": "destination_id",
+    "destination_name": "destination__name",
+    "distance": "distance",
+}
+AIRPLANE_COLUMNS = {
+    "id": "id",
+    "name": "name",
+    "type": "type__name",
+    "manufacturer": "manufacturer__name",
+    "rows": "rows",
+    "seats_in_row": "seats_in_row",
+    "pilots_capacity": "pilots_capacity",
+    "personal_capacity": "personal_capacity",
+    "year_of_manufacture": "year_of_manufacture",
+}
+CREW_COLUMNS = {
+    "id": "id",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "crew_type": "crew_type",
+    "position": "position",
+}
+
+
+def _date_range(field: str, after: date | None, before: date | None) -> Q:
+    q = Q()
+
+    if after is not None:
+        q &= Q(**{f"{field}__gte": datetime.combine(after, time.min)})
+
+    if before is not None:
+        q &= Q(**{f"{field}__lt": datetime.combine(before + timedelta(days=1), time.min)})
+
+    return q
+
+
+def _route_airport(prefix: str, airport: int | None) -> Q:
+    if airport is None:
+        return Q()
+
+    return Q(**{f"{prefix}route__source": airport}) | Q(**{f"{prefix}route__destination": airport})
+
+
+def flights_export(after=None, before=None, airport=None):
+    return (
+        Flight.objects
+            .filter(_date_range("departure_time", after, before), _route_airport("", airport))
+            .order_by("departure_time", "id")
+            .values_list(*FLIGHT_COLUMNS.values())
+    )
+
+
+def tickets_export(after=None, before=None, airport=None):
+    return (
+        Ticket.objects
+            .filter(_date_range("flight__departure_time", after, before), _route_airport("flight__", airport))
+            .order_by("id")
+            .values_list(*TICKET_COLUMNS.values())
+    )
+
+
+def orders_export(after=None, before=None, airport=None):
+    orders = Order.objects.filter(_date_range("created_at", after, before))
+
+    if airport is not None:
+        orders = orders.filter(Exists(
+            Ticket.objects.filter(_route_airport("flight__", airport), order=OuterRef("pk"))
+        ))
+
+    return (
+        orders
+            .annotate(tickets_count=Count("tickets"))
+            .order_by("id")
+            .values_list(*ORDER_COLUMNS.values())
+    )
+
+
+def routes_export(after=None, before=None, airport=None):
+    routes = Route.objects.order_by("id")
+
+    if airport is not None:
+        routes = routes.filter(Q(source=airport) | Q(destination=airport))
+
+    return routes.values_list(*ROUTE_COLUMNS.values())
+
+
+def airplanes_export(after=None, before=None, airport=None):
+    return Airplane.objects.order_by("id").values_list(*AIRPLANE_COLUMNS.values())
+
+
+def crew_export(after=None, before=None, airport=None):
+    return Crew.objects.order_by("id").values_list(*CREW_COLUMNS.values())
+
+
+# Dataset -> (model, columns, queryset). Date ranges and the airport filter
+# are ignored by datasets they do not apply to.
+EXPORTS = {
+    "flights": (Flight, FLIGHT_COLUMNS, flights_export),
+    "tickets": (Ticket, TICKET_COLUMNS, tickets_export),
+    "orders": (Order, ORDER_COLUMNS, orders_export),
+    "routes": (Route, ROUTE_COLUMNS, routes_export),
+    "airplanes": (Airplane, AIRPLANE_COLUMNS, airplanes_export),
+    "crew": (Crew, CREW_COLUMNS, crew_export),
+}
+
+
+def export_rows(dataset: str, after=None, before=None, airport=None) -> tuple[list[str], object]:
+    """
+    Column names and an iterator over row tuples. Rows are fetched through a
+    server-side cursor EXPORT_CHUNK_SIZE at a time, so memory stays flat.
+    """
+    _model, columns, queryset = EXPORTS[dataset]
+
+    return list(columns), queryset(after, before, airport).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+class Echo:
+    """File-like object that returns what is written, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(dataset, columns, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def csv_lines(dataset, columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def parquet_chunks(dataset, columns, rows):
+    model, lookups, _queryset = EXPORTS[dataset]
+    return columnar_chunks(model, lookups, rows, "parquet")
+
+
+def arrow_chunks(dataset, columns, rows):
+    model, lookups, _queryset = EXPORTS[dataset]
+    return columnar_chunks(model, lookups, rows, "arrow")
+
+
+async def iterate_in_thread(chunks, batch_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Async iterator over the sync `chunks`, advanced batch_size chunks at a
+    time in the request's sync thread, where its server-side cursor lives.
+    Django would drain a sync iterator into a list before sending it from
+    an ASGI server.
+    """
+    chunks = iter(chunks)
+    next_batch = sync_to_async(lambda: list(islice(chunks, batch_size)))
+
+    while batch := await next_batch():
+        for chunk in batch:
+            yield chunk
+
+
+# Output name -> (content type, file extension, chunk generator, binary).
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson", ndjson_lines, False),
+    "csv": ("text/csv", "csv", csv_lines, False),
+    "parquet": ("application/vnd.apache.parquet", "parquet", parquet_chunks, True),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows", arrow_chunks, True),
+}
@@ -1,8 +1,10 @@
-from django.db.models import Q
+from django.db.models import Q, F
+from django.db.models.functions import Coalesce, Upper
 from django_filters import FilterSet
 from django_filters import filters
 
-from .models import Airplane
+from .choices import CrewTypeChoices, CREW_POSITION_CHOICES_LIST
+from .models import Airplane, Crew, Flight
 from .utils import params_from_query
 
 
@@ -15,13 +17,15 @@ class AirportFilterSet(FilterSet):
 
     @staticmethod
     def get_city(queryset, _name, value):
+        # UPPER(city) LIKE '%CITY%' is served by the airport_city_trgm_idx
+        # GIN index, one bitmap scan per city.
         q = Q()
         cities_param = params_from_query(value)
 
         for city in cities_param:
-            q |= Q(city__icontains=city)
+            q |= Q(city_upper__contains=city.upper())
 
-        return queryset.filter(q)
+        return queryset.alias(city_upper=Upper("city")).filter(q)
 
 
 class AirplaneFilterSet(FilterSet):
@@ -45,3 +49,82 @@ class AirplaneFilterSet(FilterSet):
             "type",
             "fuel_capacity_l",
         )
+
+
+class CrewFilterSet(FilterSet):
+    search = filters.CharFilter(
+        method="get_search",
+        help_text="Name prefix: 'Jo' matches first or last names, 'John Sm' first and last name."
+    )
+    crew_type = filters.ChoiceFilter(choices=CrewTypeChoices.choices)
+    position = filters.ChoiceFilter(choices=CREW_POSITION_CHOICES_LIST)
+
+    @staticmethod
+    def get_search(queryset, _name, value):
+        # UPPER(name) LIKE 'PREFIX%' is served by the crew_name_prefix_idx and
+        # crew_last_name_prefix_idx text_pattern_ops indexes.
+        words = value.upper().split()
+        queryset = queryset.alias(first_name_upper=Upper("first_name"), last_name_upper=Upper("last_name"))
+
+        match words:
+            case []:
+                return queryset
+            case [word]:
+                return queryset.filter(Q(first_name_upper__startswith=word) | Q(last_name_upper__startswith=word))
+            case [first_name, *last_name]:
+                return queryset.filter(
+                    first_name_upper=first_name,
+                    last_name_upper__startswith=" ".join(last_name)
+                )
+
+    class Meta:
+        model = Crew
+        fields = ("search", "crew_type", "position")
+
+
+class FlightFilterSet(FilterSet):
+    source = filters.NumberFilter(field_name="route__source")
+    destination = filters.NumberFilter(field_name="route__destination")
+    source_city = filters.CharFilter(
+        field_name="route__source__city",
+        lookup_expr="iexact"
+    )
+    destination_city = filters.CharFilter(
+        field_name="route__destination__city",
+        lookup_expr="iexact"
+    )
+    departure = filters.DateFromToRangeFilter(field_name="departure_time")
+    airplane_type = filters.CharFilter(
+        field_name="airplane__type__name",
+        lookup_expr="icontains"
+    )
+    manufacturer = filters.CharFilter(
+        field_name="airplane__manufacturer__name",
+        lookup_expr="icontains"
+    )
+    min_seats = filters.NumberFilter(method="get_min_seats")
+
+    @staticmethod
+    def get_min_seats(queryset, _name, value):
+        return (
+            queryset
+                .alias(
+                    seats_left=Coalesce(
+                        F("airplane__rows") * F("airplane__seats_in_row"), 0
+                    ) - F("tickets_sold")
+                )
+                .filter(seats_left__gte=value)
+        )
+
+    class Meta:
+        model = Flight
+        fields = (
+            "source",
+            "destination",
+            "source_city",
+            "destination_city",
+            "departure",
+            "airplane_type",
+            "manufacturer",
+            "min_seats",
+        )
@@ -1,7 +1,7 @@
 from django import forms
 from django.core.exceptions import ValidationError
 
-from .choices import CrewTypeChoices
+from .crews import roster_errors, validate_crew_composition
 from .models import Flight
 
 class FlightForm(forms.ModelForm):
@@ -16,19 +16,19 @@ class FlightForm(forms.ModelForm):
         airplane = cleaned_data.get("airplane")
 
         if crew is not None and airplane is not None:
-            flight_crew = crew.filter(crew_type=CrewTypeChoices.FLIGHT_CREW)
-            cabin_crew = crew.filter(crew_type=CrewTypeChoices.CABIN_CREW)
+            validate_crew_composition(airplane, crew)
 
-            if cabin_crew.count() > airplane.personal_capacity:
-                raise ValidationError(f"The number of cabin crew exceeds the airline's personal capacity.")
+        departure_time = cleaned_data.get("departure_time")
+        arrival_time = cleaned_data.get("arrival_time")
 
-            if flight_crew.count() > airplane.pilots_capacity:
-                raise ValidationError(f"The number of flight crew exceeds the airline's pilot capacity.")
+        if crew and departure_time is not None and arrival_time is not None:
+            errors = roster_errors(
+                crew.values_list("id", flat=True),
+                [(departure_time, arrival_time)],
+                exclude_flight=self.instance.pk
+            )
 
-            if cabin_crew.count() < airplane.personal_capacity:
-                raise ValidationError(f"The number of airline personal capacity must be at least {airplane.personal_capacity}.")
-
-            if flight_crew.count() < airplane.pilots_capacity:
-                raise ValidationError(f"The number of airline pilots capacity must be at least {airplane.pilots_capacity}.")
+            if errors:
+                raise ValidationError(errors)
 
         return cleaned_data
@@ -0,0 +1,401 @@
+import csv
+import json
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.utils import timezone
+
+from .constants import IMPORT_BATCH_SIZE
+from .crews import crew_composition_error
+from .itineraries import invalidate_route_graph
+from .models import Airport, Route, AirplaneType, Manufacturer, Airplane, Crew, Flight
+from .signals import catalog_changed
+from .utils import batches
+
+
+# Datasets in the order they are imported, so later ones can refer to rows of earlier ones.
+IMPORT_DATASETS = ("airports", "routes", "airplanes", "flights")
+
+
+class ImportRowError(Exception):
+    pass
+
+
+def read_rows(path):
+    """
+    (line number, row dict) of a .csv, .json (array of objects) or
+    .ndjson/.jsonl file. CSV and NDJSON are read lazily.
+    """
+    path = Path(path)
+
+    if path.suffix == ".csv":
+        with path.open(newline="") as file:
+            reader = csv.DictReader(file)
+
+            for row in reader:
+                yield reader.line_num, row
+    elif path.suffix in (".ndjson", ".jsonl"):
+        with path.open() as file:
+            for line_num, line in enumerate(file, start=1):
+                if line.strip():
+                    yield line_num, json.loads(line)
+    elif path.suffix == ".json":
+        with path.open() as file:
+            yield from enumerate(json.load(file), start=1)
+    else:
+        raise ValueError(f"Unsupported file type: {path.name}.")
+
+
+def _clean(instance, exclude=()):
+    """Convert and validate plain fields in memory; relations are resolved by the importer."""
+    try:
+        instance.clean_fields(exclude=["image", *exclude])
+    except ValidationError as error:
+        raise ImportRowError("; ".join(
+            f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items()
+        ))
+
+    return instance
+
+
+def _crew_ids(value) -> list[int]:
+    if not value:
+        return []
+
+    if isinstance(value, str):
+        value = value.replace(";", " ").split()
+
+    try:
+        return [int(crew_id) for crew_id in value]
+    except (TypeError, ValueError):
+        raise ImportRowError(f"crew: Invalid crew ids {value!r}.")
+
+
+def _datetime(row, name: str) -> datetime:
+    try:
+        value = datetime.fromisoformat(row[name])
+    except (KeyError, TypeError, ValueError):
+        raise ImportRowError(f"{name}: Enter a valid ISO 8601 date/time.")
+
+    # Comparable with the naive datetimes read from the database (USE_TZ is off).
+    return timezone.make_naive(value) if timezone.is_aware(value) else value
+
+
+class ScheduleImporter:
+    """
+    Loads airports, routes, airplanes and flights with crew assignments.
+    Foreign keys are given by natural key (Airport.name, AirplaneType.code,
+    Manufacturer.name, Airplane.name; crew by id, as Crew has no natural
+    key) and resolved through lookup maps loaded once up front.
+
+    Airports and routes are upserted, airplanes whose name already exists
+    are skipped, flights are always inserted, unless they overlap another
+    flight of their airplane, stored or imported. On PostgreSQL flights and
+    their crew rows are written with COPY into ids reserved from the
+    sequence; elsewhere bulk_create() is used.
+
+    With dry_run, every row is validated and nothing is written.
+    """
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE, dry_run: bool = False):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.errors = []
+        self.stats = {}
+
+        self.airports = {airport.name: airport for airport in Airport.objects.only("id", "name")}
+        self.routes = {
+            (source, destination): Route(id=route_id)
+            for route_id, source, destination in Route.objects.values_list(
+                "id", "source__name", "destination__name"
+            )
+        }
+        self.airplane_types = dict(AirplaneType.objects.values_list("code", "id"))
+        self.manufacturers = dict(Manufacturer.objects.values_list("name", "id"))
+        self.airplanes = {}
+
+        for airplane in Airplane.objects.only("id", "name", "pilots_capacity", "personal_capacity"):
+            # Airplane names are not unique; flights cannot refer to a repeated one.
+            self.airplanes[airplane.name] = None if airplane.name in self.airplanes else airplane
+
+        self.crew = dict(Crew.objects.values_list("id", "crew_type"))
+        # Airplane name: sorted (departure, arrival) of its flights, loaded on first use.
+        self.airplane_flights = {}
+
+    def run(self, files: dict) -> dict:
+        """Import the given {dataset: path} files in one transaction."""
+        using = router.db_for_write(Flight)
+
+        with transaction.atomic(using=using):
+            for dataset in IMPORT_DATASETS:
+                if dataset in files:
+                    self.import_file(dataset, files[dataset])
+
+            if self.errors:
+                transaction.set_rollback(True, using=using)
+            elif not self.dry_run:
+                self.changed(files)
+
+        return self.stats
+
+    def import_file(self, dataset: str, path) -> None:
+        build = getattr(self, f"build_{dataset.removesuffix('s')}")
+        write = getattr(self, f"write_{dataset}")
+        seen = set()
+        stats = {"rows": 0, "valid": 0, "skipped": 0, "invalid": 0}
+        started = time.perf_counter()
+
+        try:
+            for batch in batches(read_rows(path), self.batch_size):
+                objects = []
+
+                for line_num, row in batch:
+                    stats["rows"] += 1
+
+                    try:
+                        built = build(row, seen)
+                    except ImportRowError as error:
+                        stats["invalid"] += 1
+                        self.error(f"{Path(path).name}:{line_num}: {error}")
+                        continue
+
+                    if built is None:
+                        stats["skipped"] += 1
+                    else:
+                        objects.append(built)
+
+                if objects and not self.errors and not self.dry_run:
+                    try:
+                        with transaction.atomic(using=router.db_for_write(Flight)):
+                            write(objects)
+                    except IntegrityError as error:
+                        # Rows written concurrently since they were validated.
+                        self.error(f"{Path(path).name}:{batch[0][0]}-{batch[-1][0]}: {error}")
+
+                stats["valid"] += len(objects)
+        except (OSError, ValueError) as error:
+            self.error(f"{Path(path).name}: {error}")
+
+        stats["seconds"] = time.perf_counter() - started
+        stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else None
+        self.stats[dataset] = stats
+
+    def error(self, message: str) -> None:
+        self.errors.append(message)
+
+    def build_airport(self, row, seen):
+        airport = _clean(Airport(name=row.get("name"), city=row.get("city"), open_year=row.get("open_year")))
+
+        if airport.name in seen:
+            raise ImportRowError(f"name: Duplicate airport {airport.name!r}.")
+
+        seen.add(airport.name)
+        self.airports[airport.name] = airport
+
+        return airport
+
+    def build_route(self, row, seen):
+        source = self.airports.get(row.get("source"))
+        destination = self.airports.get(row.get("destination"))
+
+        if source is None or destination is None:
+            raise ImportRowError(f"Unknown airport {row.get('source' if source is None else 'destination')!r}.")
+
+        if source is destination:
+            raise ImportRowError("Source and destination must differ.")
+
+        key = (source.name, destination.name)
+
+        if key in seen:
+            raise ImportRowError(f"Duplicate route {source.name!r} - {destination.name!r}.")
+
+        route = _clean(
+            Route(source=source, destination=destination, distance=row.get("distance")),
+            ["source", "destination"]
+        )
+        seen.add(key)
+        self.routes[key] = route
+
+        return route
+
+    def build_airplane(self, row, seen):
+        name = row.get("name")
+        type_id = self.airplane_types.get(row.get("type"))
+        manufacturer_id = self.manufacturers.get(row.get("manufacturer"))
+
+        if type_id is None:
+            raise ImportRowError(f"type: Unknown airplane type code {row.get('type')!r}.")
+
+        if manufacturer_id is None:
+            raise ImportRowError(f"manufacturer: Unknown manufacturer {row.get('manufacturer')!r}.")
+
+        if name in seen:
+            raise ImportRowError(f"name: Duplicate airplane {name!r}.")
+
+        seen.add(name)
+
+        if name in self.airplanes:
+            return None
+
+        airplane = _clean(
+            Airplane(
+                name=name,
+                type_id=type_id,
+                manufacturer_id=manufacturer_id,
+                rows=row.get("rows") or None,
+                seats_in_row=row.get("seats_in_row") or None,
+                pilots_capacity=row.get("pilots_capacity"),
+                personal_capacity=row.get("personal_capacity") or 0,
+                year_of_manufacture=row.get("year_of_manufacture"),
+                fuel_capacity_l=row.get("fuel_capacity_l"),
+                cargo_capacity_kg=row.get("cargo_capacity_kg"),
+                max_speed_kmh=row.get("max_speed_kmh"),
+                max_distance_km=row.get("max_distance_km"),
+            ),
+            ["type", "manufacturer"]
+        )
+        self.airplanes[name] = airplane
+
+        return airplane
+
+    def build_flight(self, row, seen):
+        route = self.routes.get((row.get("source"), row.get("destination")))
+        airplane = self.airplanes.get(row.get("airplane"))
+
+        if route is None:
+            raise ImportRowError(f"Unknown route {row.get('source')!r} - {row.get('destination')!r}.")
+
+        if airplane is None:
+            if row.get("airplane") in self.airplanes:
+                raise ImportRowError(f"airplane: Ambiguous airplane name {row.get('airplane')!r}.")
+
+            raise ImportRowError(f"airplane: Unknown airplane {row.get('airplane')!r}.")
+
+        departure_time = _datetime(row, "departure_time")
+        arrival_time = _datetime(row, "arrival_time")
+
+        if arrival_time <= departure_time:
+            raise ImportRowError("arrival_time: Must be after departure_time.")
+
+        crew = sorted(set(_crew_ids(row.get("crew"))))
+        unknown = [crew_id for crew_id in crew if crew_id not in self.crew]
+
+        if unknown:
+            raise ImportRowError(f"crew: Unknown crew ids {unknown}.")
+
+        # Flights may be imported without a roster; a given roster must be complete.
+        if crew:
+            error = crew_composition_error(airplane, Counter(self.crew[crew_id] for crew_id in crew))
+
+            if error:
+                raise ImportRowError(f"crew: {error}")
+
+        self.reserve_airplane(row.get("airplane"), airplane, departure_time, arrival_time)
+        flight = Flight(route=route, airplane=airplane, departure_time=departure_time, arrival_time=arrival_time)
+
+        return flight, crew
+
+    def reserve_airplane(self, name: str, airplane: Airplane, departure_time, arrival_time) -> None:
+        """Take [departure_time, arrival_time) in the airplane's schedule, as flight_airplane_no_overlap does."""
+        if name not in self.airplane_flights:
+            self.airplane_flights[name] = list(
+                Flight.objects
+                    .filter(airplane_id=airplane.pk)
+                    .order_by("departure_time")
+                    .values_list("departure_time", "arrival_time")
+            ) if airplane.pk else []
+
+        flights = self.airplane_flights[name]
+        position = bisect_left(flights, (departure_time, arrival_time))
+
+        for other_departure, other_arrival in flights[max(position - 1, 0):position + 1]:
+            if other_departure < arrival_time and departure_time < other_arrival:
+                raise ImportRowError(
+                    f"airplane: The airplane is assigned to another flight at this time "
+                    f"({other_departure.isoformat()} - {other_arrival.isoformat()})."
+                )
+
+        insort(flights, (departure_time, arrival_time))
+
+    def write_airports(self, airports) -> None:
+        Airport.objects.bulk_create(
+            airports,
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["city", "open_year"],
+        )
+
+    def write_routes(self, routes) -> None:
+        Route.objects.bulk_create(
+            routes,
+            update_conflicts=True,
+            unique_fields=["source", "destination"],
+            update_fields=["distance"],
+        )
+
+    def write_airplanes(self, airplanes) -> None:
+        Airplane.objects.bulk_create(airplanes)
+
+    def write_flights(self, flights) -> None:
+        connection = connections[router.db_for_write(Flight)]
+        through = Flight.crew.through
+
+        if connection.vendor != "postgresql":
+            Flight.objects.bulk_create(flight for flight, _crew in flights)
+            through.objects.bulk_create(
+                through(flight_id=flight.id, crew_id=crew_id)
+                for flight, crew in flights
+                for crew_id in crew
+            )
+            return
+
+        now = datetime.now()
+        table = connection.ops.quote_name(Flight._meta.db_table)
+
+        # COPY goes to the psycopg cursor directly, past Django's error wrapping.
+        with connection.cursor() as cursor, connection.wrap_database_errors:
+            cursor.execute(
+                f"SELECT nextval(pg_get_serial_sequence(%s, 'id')) FROM generate_series(1, %s)",
+                [Flight._meta.db_table, len(flights)]
+            )
+
+            for (flight, _crew), (flight_id,) in zip(flights, cursor.fetchall()):
+                flight.id = flight_id
+
+            with cursor.copy(
+                f"COPY {table} (id, route_id, airplane_id, departure_time, arrival_time, tickets_sold, updated_at) "
+                f"FROM STDIN"
+            ) as copy:
+                for flight, _crew in flights:
+                    copy.write_row((
+                        flight.id,
+                        flight.route.id,
+                        flight.airplane.id,
+                        flight.departure_time,
+                        flight.arrival_time,
+                        0,
+                        now,
+                    ))
+
+            with cursor.copy(
+                f"COPY {connection.ops.quote_name(through._meta.db_table)} (flight_id, crew_id) FROM STDIN"
+            ) as copy:
+                for flight, crew in flights:
+                    for crew_id in crew:
+                        copy.write_row((flight.id, crew_id))
+
+    def changed(self, files: dict) -> None:
+        # bulk_create() and COPY send no signals.
+        models = {"airports": Airport, "routes": Route, "airplanes": Airplane, "flights": Flight}
+
+        for dataset in files:
+            catalog_changed(models[dataset])
+
+        if "airports" in files or "routes" in files:
+            invalidate_route_graph()
+            transaction.on_commit(invalidate_route_graph)
@@ -0,0 +1,187 @@
+import heapq
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+
+from .constants import (
+    ROUTE_GRAPH_CACHE_TIMEOUT,
+    ITINERARY_MAX_PARTIAL_JOURNEYS,
+    ITINERARY_RESULTS_LIMIT,
+)
+from .models import Route, Flight
+
+
+ROUTE_GRAPH_CACHE_KEY = "service:route-graph"
+
+
+def build_route_graph() -> dict[int, list[tuple[int, int, int]]]:
+    """
+    Adjacency list of the route network:
+    source airport id -> [(destination airport id, route id, distance), ...].
+    """
+    graph = defaultdict(list)
+
+    for route_id, source_id, destination_id, distance in (
+        Route.objects.order_by().values_list("id", "source_id", "destination_id", "distance")
+    ):
+        graph[source_id].append((destination_id, route_id, distance))
+
+    return dict(graph)
+
+
+def get_route_graph() -> dict[int, list[tuple[int, int, int]]]:
+    graph = cache.get(ROUTE_GRAPH_CACHE_KEY)
+
+    if graph is None:
+        graph = build_route_graph()
+        cache.set(ROUTE_GRAPH_CACHE_KEY, graph, ROUTE_GRAPH_CACHE_TIMEOUT)
+
+    return graph
+
+
+def invalidate_route_graph() -> None:
+    cache.delete(ROUTE_GRAPH_CACHE_KEY)
+
+
+def find_route_paths(graph, source: int, destination: int, max_legs: int) -> list[tuple[int, ...]]:
+    """All simple paths (as route id tuples) of at most max_legs edges."""
+    paths = []
+    stack = [(source, (), {source})]
+
+    while stack:
+        airport, path, visited = stack.pop()
+
+        for next_airport, route_id, _distance in graph.get(airport, ()):
+            if next_airport == destination:
+                paths.append(path + (route_id,))
+            elif len(path) + 1 < max_legs and next_airport not in visited:
+                stack.append((next_airport, path + (route_id,), visited | {next_airport}))
+
+    return paths
+
+
+class Itinerary:
+    def __init__(self, legs: list[Flight]):
+        self.legs = legs
+
+    @property
+    def departure_time(self) -> datetime:
+        return self.legs[0].departure_time
+
+    @property
+    def arrival_time(self) -> datetime:
+        return self.legs[-1].arrival_time
+
+    @property
+    def duration_minutes(self) -> int:
+        return int((self.arrival_time - self.departure_time).total_seconds() // 60)
+
+    @property
+    def distance(self) -> int:
+        return sum(leg.route.distance for leg in self.legs)
+
+
+def _load_flights(route_ids, departure_from: datetime, departure_to: datetime) -> dict[int, list[Flight]]:
+    flights = defaultdict(list)
+
+    for flight in (
+        Flight.objects
+            .select_related("airplane", "route__source", "route__destination")
+            .filter(
+                route_id__in=route_ids,
+                departure_time__gte=departure_from,
+                departure_time__lte=departure_to,
+            )
+            .order_by("departure_time")
+    ):
+        flights[flight.route_id].append(flight)
+
+    return flights
+
+
+def _journey_rank(journey) -> tuple[datetime, timedelta]:
+    """Rank of a (path, legs) partial journey: earliest arrival, then shortest."""
+    _path, legs = journey
+
+    return legs[-1].arrival_time, legs[-1].arrival_time - legs[0].departure_time
+
+
+def search_itineraries(
+    source: int,
+    destination: int,
+    departure_from: datetime,
+    departure_to: datetime,
+    max_legs: int,
+    min_connection: timedelta,
+    max_connection: timedelta,
+    limit: int = ITINERARY_RESULTS_LIMIT,
+) -> tuple[list[Itinerary], bool]:
+    """
+    Journeys from source to destination whose first leg departs within the
+    window, and whether partial journeys had to be dropped. Flights are
+    loaded with one query per leg for all candidate paths. Past
+    ITINERARY_MAX_PARTIAL_JOURNEYS, the partial journeys arriving first
+    are kept, since results are ranked by arrival.
+    """
+    paths = find_route_paths(get_route_graph(), source, destination, max_legs)
+    truncated = False
+
+    if not paths:
+        return [], truncated
+
+    first_routes = {path[0] for path in paths}
+    flights = _load_flights(first_routes, departure_from, departure_to)
+
+    # (path, legs so far) for journeys that still need connections.
+    journeys = [
+        (path, [flight])
+        for path in paths
+        for flight in flights.get(path[0], ())
+    ]
+    completed = [legs for path, legs in journeys if len(path) == 1]
+    journeys = [(path, legs) for path, legs in journeys if len(path) > 1]
+
+    for leg in range(1, max_legs):
+        if not journeys:
+            break
+
+        if len(journeys) > ITINERARY_MAX_PARTIAL_JOURNEYS:
+            journeys = heapq.nsmallest(ITINERARY_MAX_PARTIAL_JOURNEYS, journeys, key=_journey_rank)
+            truncated = True
+
+        arrivals = [legs[-1].arrival_time for _path, legs in journeys]
+        flights = _load_flights(
+            {path[leg] for path, _legs in journeys},
+            min(arrivals) + min_connection,
+            max(arrivals) + max_connection,
+        )
+        departures = {
+            route_id: [flight.departure_time for flight in route_flights]
+            for route_id, route_flights in flights.items()
+        }
+
+        next_journeys = []
+
+        for path, legs in journeys:
+            route_flights = flights.get(path[leg], ())
+            earliest = legs[-1].arrival_time + min_connection
+            latest = legs[-1].arrival_time + max_connection
+            start = bisect_left(departures.get(path[leg], ()), earliest)
+
+            for flight in route_flights[start:]:
+                if flight.departure_time > latest:
+                    break
+
+                if len(path) == leg + 1:
+                    completed.append(legs + [flight])
+                else:
+                    next_journeys.append((path, legs + [flight]))
+
+        journeys = next_journeys
+
+    itineraries = [Itinerary(legs) for legs in completed]
+    itineraries.sort(key=lambda itinerary: (itinerary.arrival_time, itinerary.duration_minutes))
+
+    return itineraries[:limit], truncated
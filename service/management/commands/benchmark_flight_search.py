@@ -0,0 +1,193 @@
+import math
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+
+from service.filters import FlightFilterSet
+from service.models import Airport, Route, AirplaneType, Manufacturer, Airplane, Flight
+
+
+START_DATE = datetime(2030, 1, 1)
+
+
+class Command(BaseCommand):
+    """
+    Generates a growing flight table and times a one-day origin/destination
+    search through FlightFilterSet at every size. Everything is rolled back
+    unless --keep is given.
+    """
+
+    help = "Benchmark indexed flight search against a large generated dataset."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000, 1_000_000],
+            help="Flight table sizes to measure at.",
+        )
+        parser.add_argument("--airports", type=int, default=60)
+        parser.add_argument("--flights-per-day", type=int, default=3)
+        parser.add_argument("--repeat", type=int, default=30)
+        parser.add_argument("--keep", action="store_true", help="Keep generated data.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            routes = self.create_catalog(options["airports"])
+            results = self.measure(routes, options)
+
+            if not options["keep"]:
+                transaction.set_rollback(True)
+
+        self.report(results)
+
+    @staticmethod
+    def create_catalog(airports_count: int) -> list[tuple[int, int, int]]:
+        airports = Airport.objects.bulk_create(
+            Airport(name=f"Benchmark airport {index}", city=f"City {index}", open_year=2000)
+            for index in range(airports_count)
+        )
+        routes = Route.objects.bulk_create(
+            Route(source=source, destination=destination, distance=100)
+            for source in airports
+            for destination in airports
+            if source != destination
+        )
+        airplane_type = AirplaneType.objects.create(name="Benchmark type", code="BMK", purpose="Benchmark")
+        manufacturer = Manufacturer.objects.create(name="Benchmark manufacturer", country="None")
+        # One airplane per route, so generated flights never overlap on an airplane.
+        Airplane.objects.bulk_create(
+            Airplane(
+                name=f"Benchmark airplane {index}",
+                type=airplane_type,
+                manufacturer=manufacturer,
+                rows=30,
+                seats_in_row=6,
+                pilots_capacity=2,
+                year_of_manufacture=2020,
+                fuel_capacity_l=1000,
+                cargo_capacity_kg=1000,
+                max_speed_kmh=900,
+                max_distance_km=9000,
+            )
+            for index in range(len(routes))
+        )
+
+        return [(route.id, route.source_id, route.destination_id) for route in routes]
+
+    def measure(self, routes, options) -> list[tuple[int, float, str]]:
+        airplane_ids = list(
+            Airplane.objects.filter(name__startswith="Benchmark airplane ").order_by("id").values_list("id", flat=True)
+        )
+        route_ids = [route_id for route_id, _, _ in routes]
+        per_day = options["flights_per_day"]
+        flights_per_day_total = len(route_ids) * per_day
+        generated = 0
+        results = []
+
+        for size in sorted(options["sizes"]):
+            self.stdout.write(f"Generating flights up to {size}...")
+            self.generate_flights(route_ids, airplane_ids, per_day, generated, size)
+            generated = size
+
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Flight._meta.db_table}")
+
+            days = max(generated // flights_per_day_total, 1)
+            timings = []
+            plan = ""
+
+            for attempt in range(options["repeat"]):
+                _, source, destination = random.choice(routes)
+                day = (START_DATE + timedelta(days=random.randrange(days))).date()
+                queryset = FlightFilterSet(
+                    data={
+                        "source": source,
+                        "destination": destination,
+                        "departure_after": day,
+                        "departure_before": day,
+                    },
+                    queryset=Flight.objects.all(),
+                ).qs.values_list("id", flat=True)
+
+                started = time.perf_counter()
+                list(queryset)
+                timings.append((time.perf_counter() - started) * 1000)
+
+                if not plan:
+                    plan = queryset.explain()
+
+            results.append((size, statistics.median(timings), plan))
+
+        return results
+
+    @staticmethod
+    def generate_flights(route_ids, airplane_ids, per_day, start, end):
+        # The n-th flight flies route n % R on day n // (R * per_day), in slot
+        # n // R % per_day of that day, with the route's own airplane. Every
+        # route keeps the same number of flights per day while the table
+        # grows, and an airplane's flights never overlap.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {Flight._meta.db_table}
+                    (route_id, airplane_id, departure_time, arrival_time, tickets_sold, updated_at)
+                SELECT
+                    (%(routes)s::bigint[])[1 + n %% %(routes_count)s],
+                    (%(airplanes)s::bigint[])[1 + n %% %(routes_count)s],
+                    departure_time,
+                    departure_time + LEAST(interval '2 hours', interval '1 day' / %(per_day)s),
+                    0,
+                    now()
+                FROM generate_series(%(first)s, %(last)s) AS n,
+                LATERAL (
+                    SELECT
+                        %(start)s::timestamp
+                            + (n / (%(routes_count)s * %(per_day)s)) * interval '1 day'
+                            + (n / %(routes_count)s %% %(per_day)s) * interval '1 day' / %(per_day)s
+                        AS departure_time
+                ) AS slot
+                """,
+                {
+                    "routes": route_ids,
+                    "airplanes": airplane_ids,
+                    "routes_count": len(route_ids),
+                    "per_day": per_day,
+                    "start": START_DATE,
+                    "first": start,
+                    "last": end - 1,
+                },
+            )
+
+    def report(self, results):
+        base_size, base_time, _ = results[0]
+
+        self.stdout.write("")
+        self.stdout.write(f"{'flights':>12} {'median ms':>10} {'x time':>8} {'x size':>8}")
+
+        for size, median, _ in results:
+            self.stdout.write(
+                f"{size:>12} {median:>10.3f} {median / base_time:>8.2f} {size / base_size:>8.1f}"
+            )
+
+        last_size, last_time, last_plan = results[-1]
+
+        self.stdout.write("")
+        self.stdout.write(f"Plan at {last_size} flights:")
+        self.stdout.write(last_plan)
+
+        if last_size == base_size:
+            return
+
+        exponent = math.log(last_time / base_time) / math.log(last_size / base_size)
+        message = f"Search time grows as size^{exponent:.2f}"
+
+        if exponent < 1:
+            self.stdout.write(self.style.SUCCESS(f"{message}: sub-linear."))
+        else:
+            self.stdout.write(self.style.ERROR(f"{message}: not sub-linear."))
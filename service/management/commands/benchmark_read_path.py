@@ -0,0 +1,154 @@
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from service.models import Airport, Route, Flight, Order
+
+
+DATASETS = {
+    "flights": Flight,
+    "airports": Airport,
+    "routes": Route,
+    "orders": Order,
+}
+
+
+class Command(BaseCommand):
+    """
+    Fires the same list and retrieve requests at the sync endpoints of one
+    server (e.g. gunicorn with sync workers) and the async endpoints of
+    another (e.g. uvicorn) from many keep-alive connections, and reports
+    throughput and latency percentiles of both. Both servers must use the
+    database this command runs against; a benchmark user and order are
+    created in it and removed afterwards.
+    """
+
+    help = "Benchmark sync against async read endpoints of running servers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sync-url", default="http://127.0.0.1:8000", help="Server of the sync endpoints.")
+        parser.add_argument("--async-url", default="http://127.0.0.1:8001", help="Server of the async endpoints.")
+        parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+        parser.add_argument("--concurrency", type=int, default=200, help="Parallel connections.")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint and server.")
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument(
+            "--bust-cache",
+            action="store_true",
+            help="Make every request unique, so cached responses are never served.",
+        )
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create_user(username=f"benchmark-reader-{uuid.uuid4().hex[:8]}")
+        order = Order.objects.create(user=user)
+        token = str(RefreshToken.for_user(user).access_token)
+
+        try:
+            results = []
+
+            for dataset in options["datasets"]:
+                instance_id = order.id if dataset == "orders" else self.first_id(dataset)
+
+                for variant, base_url, prefix in (
+                    ("sync", options["sync_url"], ""),
+                    ("async", options["async_url"], "async-"),
+                ):
+                    paths = {"list": reverse(f"service:{prefix}{dataset}-list") + f"?size={options['page_size']}"}
+
+                    if instance_id is not None:
+                        paths["retrieve"] = reverse(f"service:{prefix}{dataset}-detail", args=[instance_id])
+
+                    for action, path in paths.items():
+                        self.stdout.write(f"{dataset} {action} ({variant})...")
+                        results.append((
+                            dataset,
+                            action,
+                            variant,
+                            self.run(base_url, path, token, options),
+                        ))
+        finally:
+            order.delete()
+            user.delete()
+
+        self.report(results, options)
+
+    @staticmethod
+    def first_id(dataset: str) -> int | None:
+        return DATASETS[dataset].objects.order_by("id").values_list("id", flat=True).first()
+
+    @staticmethod
+    def run(base_url: str, path: str, token: str, options) -> tuple[list[float], int, float]:
+        url = urlsplit(base_url)
+        concurrency = options["concurrency"]
+        headers = {"Authorization": f"Bearer {token}", "Connection": "keep-alive"}
+
+        if url.scheme != "http":
+            raise CommandError(f"Only http:// servers are supported, got {base_url}.")
+
+        def fetch(worker):
+            connection = HTTPConnection(url.hostname, url.port or 80, timeout=60)
+            latencies, errors = [], 0
+
+            try:
+                for attempt in range(worker, options["requests"], concurrency):
+                    request_path = path
+
+                    if options["bust_cache"]:
+                        request_path += f"{'&' if '?' in path else '?'}bust={worker}-{attempt}"
+
+                    started = time.perf_counter()
+
+                    try:
+                        connection.request("GET", request_path, headers=headers)
+                        response = connection.getresponse()
+                        response.read()
+                    except OSError:
+                        connection.close()
+                        errors += 1
+                        continue
+
+                    latencies.append(time.perf_counter() - started)
+
+                    if response.status != 200:
+                        errors += 1
+            finally:
+                connection.close()
+
+            return latencies, errors
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(fetch, range(concurrency)))
+
+        elapsed = time.perf_counter() - started
+        latencies = sorted(latency * 1000 for worker_latencies, _ in outcomes for latency in worker_latencies)
+
+        return latencies, sum(errors for _, errors in outcomes), elapsed
+
+    def report(self, results, options):
+        self.stdout.write("")
+        self.stdout.write(f"{options['concurrency']} connections, {options['requests']} requests per row")
+        self.stdout.write(
+            f"{'dataset':<10} {'action':<9} {'server':<6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}"
+        )
+
+        for dataset, action, variant, (latencies, errors, elapsed) in results:
+            if not latencies:
+                self.stdout.write(f"{dataset:<10} {action:<9} {variant:<6} {'-':>9} {'-':>9} {'-':>9} {errors:>7}")
+                continue
+
+            p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+
+            self.stdout.write(
+                f"{dataset:<10} {action:<9} {variant:<6} {len(latencies) / elapsed:>9.1f} "
+                f"{statistics.median(latencies):>9.2f} {p99:>9.2f} {errors:>7}"
+            )
@@ -0,0 +1,142 @@
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, connections
+
+from service.bookings import hold_seats
+from service.exceptions import SeatsAlreadyBooked
+from service.models import Airport, Route, AirplaneType, Manufacturer, Airplane, Flight, SeatHold
+
+
+class Command(BaseCommand):
+    """
+    Runs many parallel bookers that try to hold random seats of one flight
+    and reports throughput and conflict rate. Needs PostgreSQL with
+    max_connections above --workers. Generated data is removed afterwards.
+    """
+
+    help = "Benchmark concurrent seat holds against the configured database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bookers", type=int, default=500, help="Number of hold attempts.")
+        parser.add_argument("--workers", type=int, default=50, help="Parallel database connections.")
+        parser.add_argument("--rows", type=int, default=30)
+        parser.add_argument("--seats-in-row", type=int, default=6)
+        parser.add_argument("--group-size", type=int, default=2, help="Seats requested per attempt.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark needs PostgreSQL.")
+
+        flight, users = self.create_fixtures(options)
+
+        try:
+            results = self.run(flight, users, options)
+        finally:
+            self.cleanup(flight, users)
+
+        self.report(results, options)
+
+    @staticmethod
+    def create_fixtures(options):
+        source = Airport.objects.create(name="Benchmark hold source", city="Source", open_year=2000)
+        destination = Airport.objects.create(name="Benchmark hold destination", city="Destination", open_year=2000)
+        airplane = Airplane.objects.create(
+            name="Benchmark hold airplane",
+            type=AirplaneType.objects.create(name="Benchmark hold type", code="BMH", purpose="Benchmark"),
+            manufacturer=Manufacturer.objects.create(name="Benchmark hold manufacturer", country="None"),
+            rows=options["rows"],
+            seats_in_row=options["seats_in_row"],
+            pilots_capacity=2,
+            year_of_manufacture=2020,
+            fuel_capacity_l=1000,
+            cargo_capacity_kg=1000,
+            max_speed_kmh=900,
+            max_distance_km=9000,
+        )
+        flight = Flight.objects.create(
+            route=Route.objects.create(source=source, destination=destination, distance=100),
+            airplane=airplane,
+            departure_time="2030-01-01T10:00:00",
+            arrival_time="2030-01-01T12:00:00",
+        )
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(username=f"benchmark-booker-{index}")
+            for index in range(options["workers"])
+        )
+
+        return flight, users
+
+    @staticmethod
+    def run(flight, users, options):
+        rows, seats_in_row = options["rows"], options["seats_in_row"]
+        group_size = options["group_size"]
+        workers = options["workers"]
+
+        def book(worker):
+            user = users[worker]
+            outcomes = []
+
+            try:
+                for _attempt in range(worker, options["bookers"], workers):
+                    row = random.randint(1, rows)
+                    first = random.randint(1, max(seats_in_row - group_size + 1, 1))
+                    seats = [
+                        (row, seat)
+                        for seat in range(first, min(first + group_size, seats_in_row + 1))
+                    ]
+                    started = time.perf_counter()
+
+                    try:
+                        hold_seats(flight, user, seats)
+                        held = True
+                    except SeatsAlreadyBooked:
+                        held = False
+
+                    outcomes.append((held, time.perf_counter() - started))
+            finally:
+                connections.close_all()
+
+            return outcomes
+
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = [
+                outcome
+                for worker_outcomes in executor.map(book, range(workers))
+                for outcome in worker_outcomes
+            ]
+
+        return outcomes, time.perf_counter() - started
+
+    @staticmethod
+    def cleanup(flight, users):
+        airplane, route = flight.airplane, flight.route
+
+        SeatHold.objects.filter(flight=flight).delete()
+        flight.delete()
+        route.delete()
+        Airport.objects.filter(id__in=[route.source_id, route.destination_id]).delete()
+        airplane.delete()
+        airplane.type.delete()
+        airplane.manufacturer.delete()
+        get_user_model().objects.filter(id__in=[user.id for user in users]).delete()
+
+    def report(self, results, options):
+        outcomes, elapsed = results
+        held = sum(1 for success, _ in outcomes if success)
+        conflicts = len(outcomes) - held
+        latencies = sorted(latency * 1000 for _, latency in outcomes)
+        p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+
+        self.stdout.write(f"Attempts:      {len(outcomes)} ({options['workers']} workers)")
+        self.stdout.write(f"Held:          {held}")
+        self.stdout.write(f"Conflicts:     {conflicts} ({conflicts / len(outcomes):.1%})")
+        self.stdout.write(f"Throughput:    {len(outcomes) / elapsed:.1f} attempts/s")
+        self.stdout.write(f"Latency p50:   {statistics.median(latencies):.2f} ms")
+        self.stdout.write(f"Latency p99:   {p99:.2f} ms")
@@ -0,0 +1,28 @@
+from django.core.management import BaseCommand
+
+from service.caches import get_catalog_stats, reset_catalog_stats
+
+
+class Command(BaseCommand):
+    """
+    Django command that reports hit and miss counts of the catalog response
+    cache. With the locmem backend the counters are per process, so this
+    is only meaningful for the file and redis backends.
+    """
+
+    help = "Show catalog response cache hit and miss rates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after reporting.")
+
+    def handle(self, *args, **options):
+        stats = get_catalog_stats()
+        hit_rate = "n/a" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+
+        self.stdout.write(f"Hits:      {stats['hits']}")
+        self.stdout.write(f"Misses:    {stats['misses']}")
+        self.stdout.write(f"Hit rate:  {hit_rate}")
+
+        if options["reset"]:
+            reset_catalog_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,38 @@
+from datetime import date
+
+from django.core.management import BaseCommand, CommandError
+
+from service.exports import EXPORTS, EXPORT_FORMATS, export_rows
+
+
+class Command(BaseCommand):
+    """Django command that streams an export dataset to a file or stdout"""
+
+    help = "Export flights, tickets, orders, routes, airplanes or crew as NDJSON, CSV, Parquet or Arrow."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(EXPORTS))
+        parser.add_argument("--output", choices=list(EXPORT_FORMATS), default="ndjson")
+        parser.add_argument("--after", type=date.fromisoformat, help="From this date (inclusive).")
+        parser.add_argument("--before", type=date.fromisoformat, help="To this date (inclusive).")
+        parser.add_argument("--airport", type=int, help="Airport id the route starts or ends at.")
+        parser.add_argument("--file", help="Destination file, stdout by default.")
+
+    def handle(self, *args, **options):
+        columns, rows = export_rows(
+            options["dataset"],
+            after=options["after"],
+            before=options["before"],
+            airport=options["airport"],
+        )
+        _content_type, _extension, chunks, binary = EXPORT_FORMATS[options["output"]]
+
+        if binary and not options["file"]:
+            raise CommandError(f"--file is required for {options['output']} output.")
+
+        if options["file"]:
+            with open(options["file"], "wb" if binary else "w", newline=None if binary else "") as file:
+                file.writelines(chunks(options["dataset"], columns, rows))
+        else:
+            for chunk in chunks(options["dataset"], columns, rows):
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,53 @@
+from django.core.management import BaseCommand, CommandError
+
+from service.constants import IMPORT_BATCH_SIZE, IMPORT_MAX_REPORTED_ERRORS
+from service.imports import IMPORT_DATASETS, ScheduleImporter
+
+
+class Command(BaseCommand):
+    """
+    Django command that bulk loads a timetable from CSV, JSON or NDJSON
+    files, one per dataset. Everything is imported in one transaction:
+    a single invalid row imports nothing.
+    """
+
+    help = "Import airports, routes, airplanes and flights with crew assignments."
+
+    def add_arguments(self, parser):
+        for dataset in IMPORT_DATASETS:
+            parser.add_argument(f"--{dataset}", metavar="FILE", help=f"File of {dataset}.")
+
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without writing.")
+
+    def handle(self, *args, **options):
+        files = {dataset: options[dataset] for dataset in IMPORT_DATASETS if options[dataset]}
+
+        if not files:
+            raise CommandError(f"Give at least one of --{', --'.join(IMPORT_DATASETS)}.")
+
+        importer = ScheduleImporter(batch_size=options["batch_size"], dry_run=options["dry_run"])
+        stats = importer.run(files)
+
+        for dataset, dataset_stats in stats.items():
+            rate = dataset_stats["rows_per_second"]
+
+            self.stdout.write(
+                f"{dataset}: {dataset_stats['rows']} rows, {dataset_stats['valid']} valid, "
+                f"{dataset_stats['skipped']} skipped, {dataset_stats['invalid']} invalid "
+                f"in {dataset_stats['seconds']:.2f}s ({rate or 0:.0f} rows/s)"
+            )
+
+        if importer.errors:
+            for error in importer.errors[:IMPORT_MAX_REPORTED_ERRORS]:
+                self.stderr.write(error)
+
+            if len(importer.errors) > IMPORT_MAX_REPORTED_ERRORS:
+                self.stderr.write(f"... and {len(importer.errors) - IMPORT_MAX_REPORTED_ERRORS} more.")
+
+            raise CommandError(f"{len(importer.errors)} errors, nothing imported.")
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS("Dry run: all rows are valid, nothing imported."))
+        else:
+            self.stdout.write(self.style.SUCCESS("Schedule imported."))
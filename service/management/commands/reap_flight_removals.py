@@ -0,0 +1,14 @@
+from django.core.management import BaseCommand
+
+from service.boards import reap_flight_removals
+
+
+class Command(BaseCommand):
+    """Django command that deletes flight removals too old for board `since`"""
+
+    help = "Delete flight removals older than boards accept as since."
+
+    def handle(self, *args, **options):
+        deleted = reap_flight_removals()
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} flight removals."))
@@ -0,0 +1,17 @@
+from django.core.management import BaseCommand
+
+from service.bookings import reap_expired_seat_holds
+
+
+class Command(BaseCommand):
+    """Django command that deletes expired seat holds in batches"""
+
+    help = "Delete expired seat holds."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = reap_expired_seat_holds(options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired seat holds."))
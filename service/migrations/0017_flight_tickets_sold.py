@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:02
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_tickets_sold(apps, schema_editor):
+    Flight = apps.get_model("service", "Flight")
+    Ticket = apps.get_model("service", "Ticket")
+
+    sold = (
+        Ticket.objects
+            .filter(flight=OuterRef("pk"))
+            .order_by()
+            .values("flight")
+            .annotate(total=Count("id"))
+            .values("total")
+    )
+
+    Flight.objects.update(tickets_sold=Coalesce(Subquery(sold), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0016_alter_ticket_row_alter_ticket_seat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='tickets_sold',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_tickets_sold, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:15
+
+import django.core.validators
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0019_keyset_pagination_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeatHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('row', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('seat', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1)])),
+                ('token', models.UUIDField(default=uuid.uuid4)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('flight', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_holds', to='service.flight')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seat_holds', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Seat hold',
+                'verbose_name_plural': 'Seat holds',
+                'ordering': ['expires_at'],
+                'constraints': [models.UniqueConstraint(fields=('flight', 'row', 'seat'), name='unique_flight_seat_hold')],
+            },
+        ),
+    ]
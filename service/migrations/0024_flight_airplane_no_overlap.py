@@ -0,0 +1,78 @@
+# Generated by Django 5.2.8 on 2026-10-18 04:56
+
+import logging
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import service.models
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+FALLBACK_FLIGHT_DURATION = timedelta(hours=1)
+
+logger = logging.getLogger(__name__)
+
+
+def repair_flight_times(apps, schema_editor):
+    """
+    Make existing flights satisfy the constraints below: a flight arriving
+    before it departs gets the duration of the previous sound flight on its
+    route, or an hour, and a flight overlapping the previous flight of its
+    airplane is moved, duration kept, to depart when that one arrives.
+    """
+    Flight = apps.get_model("service", "Flight")
+    durations = {}
+    previous_arrivals = {}
+    repaired = []
+
+    for flight in Flight.objects.order_by("airplane_id", "departure_time", "id"):
+        departure_time, arrival_time = flight.departure_time, flight.arrival_time
+
+        if arrival_time > departure_time:
+            durations[flight.route_id] = arrival_time - departure_time
+        else:
+            arrival_time = departure_time + durations.get(flight.route_id, FALLBACK_FLIGHT_DURATION)
+
+        previous_arrival = previous_arrivals.get(flight.airplane_id)
+
+        if previous_arrival is not None and departure_time < previous_arrival:
+            arrival_time += previous_arrival - departure_time
+            departure_time = previous_arrival
+
+        previous_arrivals[flight.airplane_id] = arrival_time
+
+        if (departure_time, arrival_time) != (flight.departure_time, flight.arrival_time):
+            Flight.objects.filter(pk=flight.pk).update(
+                departure_time=departure_time,
+                arrival_time=arrival_time,
+                updated_at=timezone.now(),
+            )
+            repaired.append(flight.pk)
+
+    if repaired:
+        logger.warning("Moved flights to fit the airplane schedule: %s", ", ".join(map(str, repaired)))
+
+
+class Migration(migrations.Migration):
+    # The repair commits before the exclusion index is built: an index
+    # built in the same transaction also covers the replaced row versions.
+    atomic = False
+
+    dependencies = [
+        ('service', '0023_flight_updated_at_route_arrival_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(repair_flight_times, migrations.RunPython.noop, atomic=True),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=models.CheckConstraint(condition=models.Q(('arrival_time__gt', models.F('departure_time'))), name='flight_arrival_after_departure', violation_error_message='Arrival time must be after departure time.'),
+        ),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(expressions=[(service.models.AirplaneRange('airplane'), '='), (service.models.TsTzRange('departure_time', 'arrival_time', django.contrib.postgres.fields.ranges.RangeBoundary()), '&&')], name='flight_airplane_no_overlap', violation_error_message='The airplane is assigned to another flight at this time.'),
+        ),
+    ]
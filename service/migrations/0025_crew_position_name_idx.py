@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0024_flight_airplane_no_overlap'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crew',
+            index=models.Index(fields=['position', 'last_name', 'first_name', 'id'], name='crew_position_name_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 05:11
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0025_crew_position_name_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crew',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('first_name'), name='text_pattern_ops'), django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='text_pattern_ops'), name='crew_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='crew',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('last_name'), name='text_pattern_ops'), name='crew_last_name_prefix_idx'),
+        ),
+    ]
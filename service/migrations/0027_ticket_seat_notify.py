@@ -0,0 +1,44 @@
+from django.db import migrations
+
+
+# Every taken or released seat is announced on the service_seats channel
+# when its transaction commits; see service.seat_events.
+CREATE_TRIGGER = """
+CREATE FUNCTION service_ticket_notify_seat() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        PERFORM pg_notify('service_seats', json_build_object(
+            'flight', OLD.flight_id, 'row', OLD."row", 'seat', OLD.seat, 'taken', false
+        )::text);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM pg_notify('service_seats', json_build_object(
+            'flight', NEW.flight_id, 'row', NEW."row", 'seat', NEW.seat, 'taken', true
+        )::text);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER service_ticket_notify_seat
+    AFTER INSERT OR DELETE OR UPDATE OF flight_id, "row", seat ON service_ticket
+    FOR EACH ROW EXECUTE FUNCTION service_ticket_notify_seat();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS service_ticket_notify_seat ON service_ticket;
+DROP FUNCTION IF EXISTS service_ticket_notify_seat();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0026_crew_name_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
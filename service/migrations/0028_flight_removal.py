@@ -0,0 +1,68 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:10
+
+from django.db import migrations, models
+
+
+# The old placement of every deleted flight, or of a flight moved to another
+# route or time, is kept for boards fetched with `since`; see service.boards.
+CREATE_TRIGGER = """
+CREATE FUNCTION service_flight_record_removal() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO service_flightremoval (
+        flight_id, source_id, destination_id, departure_time, arrival_time, removed_at
+    )
+    SELECT OLD.id, route.source_id, route.destination_id, OLD.departure_time, OLD.arrival_time, clock_timestamp()
+    FROM service_route route
+    WHERE route.id = OLD.route_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER service_flight_record_deletion
+    AFTER DELETE ON service_flight
+    FOR EACH ROW EXECUTE FUNCTION service_flight_record_removal();
+
+CREATE TRIGGER service_flight_record_move
+    AFTER UPDATE OF route_id, departure_time, arrival_time ON service_flight
+    FOR EACH ROW
+    WHEN (
+        (OLD.route_id, OLD.departure_time, OLD.arrival_time)
+        IS DISTINCT FROM (NEW.route_id, NEW.departure_time, NEW.arrival_time)
+    )
+    EXECUTE FUNCTION service_flight_record_removal();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS service_flight_record_move ON service_flight;
+DROP TRIGGER IF EXISTS service_flight_record_deletion ON service_flight;
+DROP FUNCTION IF EXISTS service_flight_record_removal();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0027_ticket_seat_notify'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightRemoval',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('flight_id', models.BigIntegerField()),
+                ('source_id', models.BigIntegerField()),
+                ('destination_id', models.BigIntegerField()),
+                ('departure_time', models.DateTimeField()),
+                ('arrival_time', models.DateTimeField()),
+                ('removed_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Flight removal',
+                'verbose_name_plural': 'Flight removals',
+                'ordering': ['removed_at'],
+            },
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -1,8 +1,14 @@
+import uuid
+
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import BigIntegerRangeField, DateTimeRangeField, RangeBoundary, RangeOperators
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import UniqueConstraint, Q, F, CheckConstraint
+from django.db.models import UniqueConstraint, Q, F, CheckConstraint, Func
+from django.db.models.functions import Upper
 
 from .constants import MAX_PILOT_CAPACITY
 from .utils import (
@@ -32,6 +38,17 @@ class Airport(models.Model):
         ordering = ["-created_at"]
         verbose_name_plural = "Airports"
         verbose_name = "Airport"
+        indexes = [
+            # Serve icontains lookups (UPPER(...) LIKE UPPER(...)) and trigram search.
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="airport_name_trgm_idx"
+            ),
+            GinIndex(
+                OpClass(Upper("city"), name="gin_trgm_ops"),
+                name="airport_city_trgm_idx"
+            ),
+        ]
 
 
 class Route(models.Model):
@@ -153,7 +170,18 @@ class Crew(models.Model):
 
     class Meta:
         indexes = [
-            models.Index(fields=['first_name', 'last_name'])
+            models.Index(fields=['first_name', 'last_name']),
+            models.Index(fields=["position", "last_name", "first_name", "id"], name="crew_position_name_idx"),
+            # Case-insensitive prefix search, UPPER(...) LIKE 'PREFIX%', under any collation.
+            models.Index(
+                OpClass(Upper("first_name"), name="text_pattern_ops"),
+                OpClass(Upper("last_name"), name="text_pattern_ops"),
+                name="crew_name_prefix_idx",
+            ),
+            models.Index(
+                OpClass(Upper("last_name"), name="text_pattern_ops"),
+                name="crew_last_name_prefix_idx",
+            ),
         ]
 
     @property
@@ -185,6 +213,25 @@ class Crew(models.Model):
         self.validate_crew_position()
 
 
+class AirplaneRange(Func):
+    """One-value int8range of an airplane id, so it can share a GiST index with a time range."""
+    function = "INT8RANGE"
+    output_field = BigIntegerRangeField()
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, expression, RangeBoundary(inclusive_upper=True), **extra)
+
+
+class TsTzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+def flight_period(departure_time, arrival_time) -> TsTzRange:
+    """[departure_time, arrival_time) as a range."""
+    return TsTzRange(departure_time, arrival_time, RangeBoundary())
+
+
 class Flight(models.Model):
     route = models.ForeignKey(
         Route,
@@ -199,14 +246,84 @@ class Flight(models.Model):
     departure_time = models.DateTimeField()
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, related_name="flights")
+    tickets_sold = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.route} - {self.airplane}"
 
+    @property
+    def seats_available(self):
+        return max(self.airplane.passenger_seats_total - self.tickets_sold, 0)
+
+    @staticmethod
+    def change_tickets_sold(flight_id: int, amount: int):
+        Flight.objects.filter(pk=flight_id).update(
+            tickets_sold=F("tickets_sold") + amount
+        )
+
     class Meta:
         verbose_name_plural = "Flights"
         verbose_name = "Flight"
         ordering = ["departure_time"]
+        indexes = [
+            models.Index(
+                fields=["route", "departure_time"],
+                name="flight_route_departure_idx"
+            ),
+            models.Index(
+                fields=["route", "arrival_time"],
+                name="flight_route_arrival_idx"
+            ),
+            models.Index(
+                fields=["departure_time", "id"],
+                name="flight_departure_keyset_idx"
+            ),
+            models.Index(
+                fields=["airplane", "departure_time", "id"],
+                name="flight_airplane_departure_idx"
+            ),
+        ]
+        constraints = [
+            CheckConstraint(
+                check=Q(arrival_time__gt=F("departure_time")),
+                name="flight_arrival_after_departure",
+                violation_error_message="Arrival time must be after departure time.",
+            ),
+            # Backed by a GiST index, so an overlap check is an index probe
+            # however long the airplane's history is.
+            ExclusionConstraint(
+                name="flight_airplane_no_overlap",
+                index_type="gist",
+                expressions=[
+                    (AirplaneRange("airplane"), RangeOperators.EQUAL),
+                    (flight_period("departure_time", "arrival_time"), RangeOperators.OVERLAPS),
+                ],
+                violation_error_message="The airplane is assigned to another flight at this time.",
+            ),
+        ]
+
+
+class FlightRemoval(models.Model):
+    """
+    Where a flight was before it was deleted or moved to another route or
+    time, recorded by a database trigger so that boards fetched with
+    `since` can report it. Plain ids, so records outlive the rows.
+    """
+    flight_id = models.BigIntegerField()
+    source_id = models.BigIntegerField()
+    destination_id = models.BigIntegerField()
+    departure_time = models.DateTimeField()
+    arrival_time = models.DateTimeField()
+    removed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Flight {self.flight_id} removed at {self.removed_at}"
+
+    class Meta:
+        verbose_name_plural = "Flight removals"
+        verbose_name = "Flight removal"
+        ordering = ["removed_at"]
 
 
 class Order(models.Model):
@@ -220,6 +337,12 @@ class Order(models.Model):
         verbose_name_plural = "Orders"
         verbose_name = "Order"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "id"],
+                name="order_user_keyset_idx"
+            )
+        ]
 
 
 class Ticket(models.Model):
@@ -266,3 +389,24 @@ class Ticket(models.Model):
     def clean(self):
         super().clean()
         self.validate_seat_number(self.row, self.seat, self.flight.airplane)
+
+
+class SeatHold(models.Model):
+    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name="seat_holds")
+    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="seat_holds")
+    row = models.PositiveSmallIntegerField(validators=[MinValueValidator(1)])
+    seat = models.PositiveSmallIntegerField(validators=[MinValueValidator(1)])
+    token = models.UUIDField(default=uuid.uuid4)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Hold {self.row}-{self.seat} for {self.flight}"
+
+    class Meta:
+        verbose_name_plural = "Seat holds"
+        verbose_name = "Seat hold"
+        ordering = ["expires_at"]
+        constraints = [
+            UniqueConstraint(fields=["flight", "row", "seat"], name="unique_flight_seat_hold")
+        ]
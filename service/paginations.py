@@ -1,6 +1,302 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class DefaultListPagination(PageNumberPagination):
     page_size = 5
     page_size_query_param = "size"
     page_query_param = "page"
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() with the count and the page fetched through the async ORM."""
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+
+        return [instance async for instance in self.page.object_list]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination ordered by the view's `keyset_ordering`,
+    or the model's Meta.ordering followed by "id". The first page is requested
+    with ?pagination=keyset, following pages with the returned ?cursor=.
+    Requests without either fall back to `fallback_class`, or are not
+    paginated at all when it is None.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = "size"
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    mode = "keyset"
+    count_query_param = "count"
+    approximate_count = "approximate"
+    fallback_class = None
+    invalid_cursor_message = "Invalid cursor."
+
+    fallback = None
+
+    def is_requested(self, request) -> bool:
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == self.mode
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            if self.fallback_class is None:
+                return None
+
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        queryset = self.order_queryset(queryset, request, view)
+
+        self.count = None
+        if self.is_count_requested(request):
+            self.count = self.get_approximate_count(queryset)
+
+        return self.get_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            if self.fallback_class is None:
+                return None
+
+            self.fallback = self.fallback_class()
+            return await self.fallback.apaginate_queryset(queryset, request, view)
+
+        queryset = self.order_queryset(queryset, request, view)
+
+        self.count = None
+        if self.is_count_requested(request):
+            self.count = await self.aget_approximate_count(queryset)
+
+        return self.get_page([instance async for instance in self.get_page_queryset(queryset, request)])
+
+    def order_queryset(self, queryset, request, view):
+        self.request = request
+        self.ordering = self.get_ordering(queryset, view)
+        self.page_size = self.get_page_size(request)
+
+        return queryset.order_by(*self.ordering)
+
+    def is_count_requested(self, request) -> bool:
+        return request.query_params.get(self.count_query_param) == self.approximate_count
+
+    def get_page_queryset(self, queryset, request):
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position))
+
+        return queryset[:self.page_size + 1]
+
+    def get_page(self, results: list) -> list:
+        self.next_position = None
+
+        if len(results) > self.page_size:
+            results = results[:self.page_size]
+            self.next_position = self.get_position(results[-1])
+
+        return results
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+
+        response = {"next": self.get_next_link()}
+
+        if self.count is not None:
+            response["approximate_count"] = self.count
+
+        response["results"] = data
+
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "approximate_count": {"type": "integer"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Set to '{self.mode}' to request the first keyset page.",
+                "schema": {"type": "string", "enum": [self.mode]},
+            },
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor of the next keyset page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    f"Set to '{self.approximate_count}' to include a total "
+                    f"estimated from database statistics."
+                ),
+                "schema": {"type": "string", "enum": [self.approximate_count]},
+            },
+        ]
+
+        if self.fallback_class is not None:
+            parameters += self.fallback_class().get_schema_operation_parameters(view)
+        else:
+            parameters.append({
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results per page.",
+                "schema": {"type": "integer"},
+            })
+
+        return parameters
+
+    def get_ordering(self, queryset, view) -> list[str]:
+        ordering = list(
+            getattr(view, "keyset_ordering", None)
+            or queryset.model._meta.ordering
+        )
+
+        if not {"id", "-id", "pk", "-pk"} & set(ordering):
+            ordering.append("id")
+
+        return ordering
+
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if size <= 0:
+            return self.page_size
+
+        return min(size, self.max_page_size)
+
+    def get_position(self, instance) -> list:
+        position = []
+
+        for field in self.ordering:
+            field = instance._meta.get_field(field.lstrip("-"))
+            position.append(field.value_to_string(instance))
+
+        return position
+
+    def get_keyset_filter(self, position) -> Q:
+        # (a, b) > (x, y)  ==  a > x OR (a = x AND b > y), per field direction.
+        keyset_filter = Q()
+        equal = Q()
+
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+
+            keyset_filter |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        return keyset_filter
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if not encoded:
+            return None
+
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        values = []
+
+        for field, value in zip(self.ordering, position):
+            field = model._meta.get_field(field.lstrip("-"))
+
+            try:
+                value = field.to_python(value)
+                field.run_validators(value)
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+
+            values.append(value)
+
+        return values
+
+    def encode_cursor(self, position) -> str:
+        return base64.urlsafe_b64encode(json.dumps(position).encode("ascii")).decode("ascii")
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+
+        url = remove_query_param(self.request.build_absolute_uri(), self.mode_query_param)
+
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position)
+        )
+
+    @staticmethod
+    def get_approximate_count(queryset) -> int | None:
+        if connections[queryset.db].vendor != "postgresql":
+            return None
+
+        plan = json.loads(queryset.explain(format="json"))
+        return plan[0]["Plan"]["Plan Rows"]
+
+    @staticmethod
+    async def aget_approximate_count(queryset) -> int | None:
+        if connections[queryset.db].vendor != "postgresql":
+            return None
+
+        plan = json.loads(await queryset.aexplain(format="json"))
+        return plan[0]["Plan"]["Plan Rows"]
+
+
+class KeysetListPagination(KeysetPagination):
+    fallback_class = DefaultListPagination
@@ -0,0 +1,199 @@
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value, Window
+from django.db.models.functions import Lead
+
+from .exceptions import ScheduleConflict
+from .models import Airplane, Flight, AirplaneRange, flight_period
+from .signals import catalog_changed
+
+
+def expand_schedule(
+    start_date: date,
+    end_date: date,
+    weekdays,
+    departure_times,
+    duration: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    """(departure, arrival) of every flight of the rule, in departure order."""
+    slots = []
+    day = start_date
+    weekdays = set(weekdays)
+
+    while day <= end_date:
+        if day.isoweekday() in weekdays:
+            for departure_time in sorted(set(departure_times)):
+                departure = datetime.combine(day, departure_time)
+                slots.append((departure, departure + duration))
+
+        day += timedelta(days=1)
+
+    return slots
+
+
+def overlapping_flights(airplane_id: int, departure: datetime, arrival: datetime):
+    """
+    Flights of the airplane overlapping [departure, arrival). The filter
+    repeats the expressions of flight_airplane_no_overlap, so it is
+    answered from that constraint's GiST index.
+    """
+    return (
+        Flight.objects
+            .alias(
+                airplane_range=AirplaneRange("airplane"),
+                period=flight_period("departure_time", "arrival_time"),
+            )
+            .filter(
+                airplane_range=AirplaneRange(Value(airplane_id)),
+                period__overlap=flight_period(Value(departure), Value(arrival)),
+            )
+    )
+
+
+def airplane_conflicts(airplane: Airplane, slots) -> list[dict]:
+    """
+    Slots overlapping an existing flight of the airplane. The airplane's
+    flights around the schedule are read once and matched by bisection.
+    """
+    if not slots:
+        return []
+
+    first = slots[0][0]
+    last = max(arrival for _departure, arrival in slots)
+    existing = list(
+        overlapping_flights(airplane.pk, first, last)
+            .order_by("departure_time", "id")
+            .values_list("id", "departure_time", "arrival_time")
+    )
+
+    if not existing:
+        return []
+
+    departures = [departure for _id, departure, _arrival in existing]
+    longest = max(arrival - departure for _id, departure, arrival in existing)
+    conflicts = []
+
+    for departure, arrival in slots:
+        # Flights overlapping the slot depart before it arrives and at most
+        # `longest` before it departs.
+        end = bisect_left(departures, arrival)
+        start = bisect_left(departures, departure - longest, hi=end)
+
+        for flight_id, flight_departure, flight_arrival in existing[start:end]:
+            if flight_arrival > departure:
+                conflicts.append({
+                    "departure_time": departure,
+                    "arrival_time": arrival,
+                    "flight": flight_id,
+                })
+
+    return conflicts
+
+
+def create_schedule(route, airplane: Airplane, crew, slots, skip_conflicts: bool = False) -> dict:
+    """
+    Insert a flight for every slot, with its crew, in two bulk inserts.
+    The airplane row is locked, so concurrent schedules for one airplane
+    are checked for conflicts one after another. Conflicting slots fail
+    the whole schedule, or are left out with skip_conflicts.
+
+    Single flights are saved without the lock, so one may take a slot
+    between the check and the insert. The insert then breaks
+    flight_airplane_no_overlap and the conflicts are checked again.
+    """
+    with transaction.atomic():
+        # Concurrent schedules for the airplane queue on its row lock here, so
+        # each checks conflicts only after the previous one has committed.
+        Airplane.objects.select_for_update().get(pk=airplane.pk)
+
+        conflicts = airplane_conflicts(airplane, slots)
+
+        while True:
+            if conflicts and not skip_conflicts:
+                raise ScheduleConflict(conflicts)
+
+            taken = {conflict["departure_time"] for conflict in conflicts}
+
+            try:
+                with transaction.atomic():
+                    flights = Flight.objects.bulk_create(
+                        Flight(route=route, airplane=airplane, departure_time=departure, arrival_time=arrival)
+                        for departure, arrival in slots
+                        if departure not in taken
+                    )
+
+                break
+            except IntegrityError as error:
+                name = getattr(getattr(error.__cause__, "diag", None), "constraint_name", None)
+                rechecked = airplane_conflicts(airplane, slots)
+
+                # Retry only while new conflicts turn up, so the loop ends.
+                if name != "flight_airplane_no_overlap" or len(rechecked) <= len(conflicts):
+                    raise
+
+                conflicts = rechecked
+
+        Flight.crew.through.objects.bulk_create(
+            Flight.crew.through(flight_id=flight.id, crew_id=crew_person.id)
+            for flight in flights
+            for crew_person in crew
+        )
+
+        # bulk_create() sends no signals.
+        catalog_changed(Flight)
+
+    return {"flights": flights, "conflicts": conflicts}
+
+
+def _idle_gap(start: datetime, end: datetime) -> dict:
+    return {"start": start, "end": end, "hours": (end - start) / timedelta(hours=1)}
+
+
+def fleet_utilization(start: datetime, end: datetime, min_gap: timedelta) -> list[dict]:
+    """
+    Busy hours and idle gaps of at least min_gap of every airplane between
+    start and end. Each flight's successor comes from LEAD() over the
+    airplane's flights, so the whole fleet is read in one query.
+    """
+    flights = (
+        Flight.objects
+            .filter(departure_time__lt=end, arrival_time__gt=start)
+            .annotate(next_departure=Window(
+                Lead("departure_time"),
+                partition_by=F("airplane"),
+                order_by=[F("departure_time").asc(), F("id").asc()],
+            ))
+            .order_by("airplane", "departure_time", "id")
+            .values_list("airplane", "departure_time", "arrival_time", "next_departure")
+    )
+    report = {
+        airplane_id: {"id": airplane_id, "name": name, "flights": 0, "busy": timedelta(), "idle_gaps": []}
+        for airplane_id, name in Airplane.objects.order_by("id").values_list("id", "name")
+    }
+
+    for airplane_id, departure, arrival, next_departure in flights:
+        airplane = report[airplane_id]
+
+        if airplane["flights"] == 0 and departure - start >= min_gap:
+            airplane["idle_gaps"].append(_idle_gap(start, departure))
+
+        airplane["flights"] += 1
+        airplane["busy"] += min(arrival, end) - max(departure, start)
+        idle_until = min(next_departure or end, end)
+
+        if arrival < end and idle_until - arrival >= min_gap:
+            airplane["idle_gaps"].append(_idle_gap(arrival, idle_until))
+
+    window = end - start
+
+    for airplane in report.values():
+        if airplane["flights"] == 0 and window >= min_gap:
+            airplane["idle_gaps"].append(_idle_gap(start, end))
+
+        busy = airplane.pop("busy")
+        airplane["busy_hours"] = busy / timedelta(hours=1)
+        airplane["utilization"] = busy / window
+
+    return list(report.values())
@@ -0,0 +1,69 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Greatest, Upper
+
+from .caches import get_catalog_cache, get_catalog_versions, record_catalog_lookup
+from .constants import (
+    AIRPORT_SEARCH_DEFAULT_LIMIT,
+    AIRPORT_SEARCH_CACHED_PREFIX_LENGTH,
+    AIRPORT_SEARCH_CACHE_TIMEOUT,
+)
+from .models import Airport
+
+
+def normalize_search_query(query: str) -> str:
+    return " ".join(query.split()).upper()
+
+
+def _search_airports(query: str, limit: int) -> list[dict]:
+    # Upper(name) and Upper(city) match the expressions of the trigram GIN
+    # indexes, so both the LIKE and the similarity (%) conditions use them.
+    return list(
+        Airport.objects
+            .alias(name_upper=Upper("name"), city_upper=Upper("city"))
+            .filter(
+                Q(name_upper__contains=query)
+                | Q(city_upper__contains=query)
+                | Q(name_upper__trigram_similar=query)
+                | Q(city_upper__trigram_similar=query)
+            )
+            .annotate(
+                prefix=Case(
+                    When(Q(name_upper__startswith=query) | Q(city_upper__startswith=query), then=Value(1.0)),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                ),
+                similarity=Greatest(
+                    TrigramSimilarity("name_upper", query),
+                    TrigramSimilarity("city_upper", query),
+                ),
+            )
+            .order_by("-prefix", "-similarity", "name")
+            .values("id", "name", "city", "similarity")[:limit]
+    )
+
+
+def search_airports(query: str, limit: int = AIRPORT_SEARCH_DEFAULT_LIMIT) -> list[dict]:
+    """
+    Airports whose name or city contains, or is similar to, the query:
+    prefix matches first, then by trigram similarity. Results for short
+    queries (the first keystrokes of a typeahead) are cached until an
+    airport changes.
+    """
+    query = normalize_search_query(query)
+
+    if len(query) > AIRPORT_SEARCH_CACHED_PREFIX_LENGTH:
+        return _search_airports(query, limit)
+
+    cache = get_catalog_cache()
+    version, = get_catalog_versions([Airport])
+    key = f"service:airport-search:{version}:{limit}:{query}"
+    results = cache.get(key)
+
+    record_catalog_lookup(hit=results is not None)
+
+    if results is None:
+        results = _search_airports(query, limit)
+        cache.set(key, results, AIRPORT_SEARCH_CACHE_TIMEOUT)
+
+    return results
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from collections import defaultdict
+
+import psycopg
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from rest_framework.renderers import BaseRenderer
+
+from .constants import SEAT_EVENTS_HEARTBEAT_SECONDS, SEAT_EVENTS_QUEUE_SIZE, SEAT_EVENTS_RETRY_MS
+
+
+# Notified by the service_ticket_notify_seat trigger, see migration 0027.
+SEAT_EVENTS_CHANNEL = "service_seats"
+
+
+def get_listen_conninfo(alias: str = "default") -> str:
+    settings_dict = connections[alias].settings_dict
+
+    return psycopg.conninfo.make_conninfo(
+        dbname=settings_dict["NAME"],
+        user=settings_dict["USER"] or None,
+        password=settings_dict["PASSWORD"] or None,
+        host=settings_dict["HOST"] or None,
+        port=settings_dict["PORT"] or None,
+    )
+
+
+def sse_frame(event: str, data, retry: int | None = None) -> str:
+    frame = f"retry: {retry}\n" if retry is not None else ""
+
+    return f"{frame}event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Lets EventSource clients (Accept: text/event-stream) through content
+    negotiation. Streams bypass renderers; only error details are rendered.
+    """
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode(self.charset)
+
+
+class SeatEventHub:
+    """
+    Fans seat notifications out to the event streams of this process.
+    A single LISTEN connection serves all of them: it is opened with the
+    first subscriber and closed with the last one. Subscribers get
+    {"row", "seat", "taken"} deltas of their flight, or None when they
+    must start over: their queue overflowed or the listener failed.
+    """
+
+    def __init__(self):
+        self.subscribers = defaultdict(set)
+        self.listener = None
+        self.ready = None
+
+    async def subscribe(self, flight_id: int) -> asyncio.Queue:
+        """A queue of the flight's deltas, once the listener receives them."""
+        loop = asyncio.get_running_loop()
+
+        if self.listener is None or self.listener.done() or self.listener.get_loop() is not loop:
+            self.subscribers.clear()
+            self.ready = loop.create_future()
+            self.listener = loop.create_task(self.listen(self.ready))
+
+        queue = asyncio.Queue(maxsize=SEAT_EVENTS_QUEUE_SIZE)
+        self.subscribers[flight_id].add(queue)
+        await asyncio.shield(self.ready)
+
+        return queue
+
+    def unsubscribe(self, flight_id: int, queue: asyncio.Queue) -> None:
+        queues = self.subscribers.get(flight_id)
+
+        if queues is not None:
+            queues.discard(queue)
+
+            if not queues:
+                del self.subscribers[flight_id]
+
+        if not self.subscribers and self.listener is not None:
+            self.listener.cancel()
+            self.listener = None
+
+    def publish(self, payload: str) -> None:
+        event = json.loads(payload)
+
+        for queue in list(self.subscribers.get(event.pop("flight"), ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.restart(queue)
+
+    @staticmethod
+    def restart(queue: asyncio.Queue) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+
+        queue.put_nowait(None)
+
+    async def listen(self, ready: asyncio.Future) -> None:
+        try:
+            async with await psycopg.AsyncConnection.connect(get_listen_conninfo(), autocommit=True) as connection:
+                await connection.execute(f"LISTEN {SEAT_EVENTS_CHANNEL}")
+                ready.set_result(True)
+
+                async for notify in connection.notifies():
+                    self.publish(notify.payload)
+        except (psycopg.Error, OSError):
+            pass
+        finally:
+            if not ready.done():
+                ready.set_result(False)
+
+            # Streams of a failed listener are told to reconnect; a replaced
+            # or cancelled one has no subscribers left.
+            if self.listener is asyncio.current_task():
+                for queues in self.subscribers.values():
+                    for queue in queues:
+                        self.restart(queue)
+
+                self.subscribers.clear()
+                self.listener = None
+
+
+seat_event_hub = SeatEventHub()
+
+
+async def seat_event_stream(flight_id: int, snapshot):
+    """
+    Server-sent events of a flight: a "snapshot" of its seat map from the
+    async `snapshot` callable, then a "seat" event per taken or released
+    seat, with keep-alive comments in between. Ends with a "reset" event
+    when the client has to reconnect and start over.
+    """
+    queue = await seat_event_hub.subscribe(flight_id)
+
+    try:
+        # Subscribed first, so no change after the snapshot is missed.
+        yield sse_frame("snapshot", await snapshot(), retry=SEAT_EVENTS_RETRY_MS)
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), SEAT_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if event is None:
+                yield sse_frame("reset", {})
+                return
+
+            yield sse_frame("seat", event)
+    finally:
+        seat_event_hub.unsubscribe(flight_id, queue)
@@ -0,0 +1,202 @@
+import time
+
+from django.core.cache import cache
+
+from .constants import SEAT_MAP_CACHE_TIMEOUT
+
+
+def get_seat_map_version_key(flight_id: int) -> str:
+    return f"service:seat-map:version:{flight_id}"
+
+
+def get_seat_map_cache_key(flight_id: int, version: int) -> str:
+    return f"service:seat-map:{flight_id}:{version}"
+
+
+def get_seat_map_version(flight_id: int) -> int:
+    key = get_seat_map_version_key(flight_id)
+    version = cache.get(key)
+
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+
+    return version
+
+
+class SeatMap:
+    """
+    Occupied seats of a flight packed into a bitset, one bit per seat,
+    in row-major order.
+    """
+
+    def __init__(self, rows: int, seats_in_row: int, bits: bytes | None = None):
+        self.rows = rows or 0
+        self.seats_in_row = seats_in_row or 0
+
+        size = (self.seats_total + 7) // 8
+        self.bits = bytearray(bits) if bits is not None else bytearray(size)
+
+    @classmethod
+    def from_seats(cls, rows: int, seats_in_row: int, seats) -> "SeatMap":
+        seat_map = cls(rows, seats_in_row)
+
+        for row, seat in seats:
+            seat_map.occupy(row, seat)
+
+        return seat_map
+
+    @property
+    def seats_total(self) -> int:
+        return self.rows * self.seats_in_row
+
+    @property
+    def occupied_count(self) -> int:
+        return int.from_bytes(self.bits, "little").bit_count()
+
+    @property
+    def free_count(self) -> int:
+        return self.seats_total - self.occupied_count
+
+    def contains(self, row: int, seat: int) -> bool:
+        return 1 <= row <= self.rows and 1 <= seat <= self.seats_in_row
+
+    def _position(self, row: int, seat: int) -> tuple[int, int]:
+        index = (row - 1) * self.seats_in_row + (seat - 1)
+        return index >> 3, 1 << (index & 7)
+
+    def is_occupied(self, row: int, seat: int) -> bool:
+        if not self.contains(row, seat):
+            return False
+
+        byte, mask = self._position(row, seat)
+        return bool(self.bits[byte] & mask)
+
+    def occupy(self, row: int, seat: int) -> None:
+        if self.contains(row, seat):
+            byte, mask = self._position(row, seat)
+            self.bits[byte] |= mask
+
+    def release(self, row: int, seat: int) -> None:
+        if self.contains(row, seat):
+            byte, mask = self._position(row, seat)
+            self.bits[byte] &= ~mask
+
+    def free_runs(self, row: int) -> list[tuple[int, int]]:
+        """(first seat, length) of every run of adjacent free seats in a row."""
+        runs = []
+        start = None
+
+        for seat in range(1, self.seats_in_row + 2):
+            free = seat <= self.seats_in_row and not self.is_occupied(row, seat)
+
+            if free and start is None:
+                start = seat
+            elif not free and start is not None:
+                runs.append((start, seat - start))
+                start = None
+
+        return runs
+
+    def find_group(self, count: int) -> list[tuple[int, int]] | None:
+        """
+        Seats for a group travelling together: the tightest run of adjacent
+        free seats in one row, otherwise free seats from the smallest block
+        of consecutive rows. None when the flight has too few free seats.
+        """
+        if count <= 0 or count > self.free_count:
+            return None
+
+        best = None
+
+        for row in range(1, self.rows + 1):
+            for start, length in self.free_runs(row):
+                if length >= count and (best is None or length < best[2]):
+                    best = (row, start, length)
+
+        if best is not None:
+            row, start, _length = best
+            return [(row, seat) for seat in range(start, start + count)]
+
+        free_in_row = [
+            sum(length for _start, length in self.free_runs(row))
+            for row in range(1, self.rows + 1)
+        ]
+        first, last, total = 0, 0, 0
+        window = None
+
+        # Smallest window of consecutive rows holding enough free seats.
+        while last < self.rows:
+            total += free_in_row[last]
+
+            while total - free_in_row[first] >= count:
+                total -= free_in_row[first]
+                first += 1
+
+            if total >= count and (window is None or last - first < window[1] - window[0]):
+                window = (first, last)
+
+            last += 1
+
+        seats = []
+
+        for row in range(window[0] + 1, window[1] + 2):
+            for start, length in self.free_runs(row):
+                seats.extend((row, seat) for seat in range(start, start + length))
+
+        return seats[:count]
+
+    def row_layout(self, row: int) -> dict:
+        free, occupied = [], []
+
+        for seat in range(1, self.seats_in_row + 1):
+            (occupied if self.is_occupied(row, seat) else free).append(seat)
+
+        return {"row": row, "free": free, "occupied": occupied}
+
+    def layout(self) -> list[dict]:
+        return [self.row_layout(row) for row in range(1, self.rows + 1)]
+
+
+def build_seat_map(flight) -> SeatMap:
+    airplane = flight.airplane
+
+    return SeatMap.from_seats(
+        airplane.rows,
+        airplane.seats_in_row,
+        flight.tickets.values_list("row", "seat")
+    )
+
+
+def get_seat_map(flight) -> SeatMap:
+    """
+    The flight's seat map, cached under its current version. The version
+    is read before the tickets, so a map built while a booking commits is
+    stored under a version that the booking then replaces.
+    """
+    airplane = flight.airplane
+    key = get_seat_map_cache_key(flight.pk, get_seat_map_version(flight.pk))
+    cached = cache.get(key)
+
+    if cached is not None:
+        rows, seats_in_row, bits = cached
+
+        if (rows, seats_in_row) == (airplane.rows or 0, airplane.seats_in_row or 0):
+            return SeatMap(rows, seats_in_row, bits)
+
+    seat_map = build_seat_map(flight)
+    cache.set(
+        key,
+        (seat_map.rows, seat_map.seats_in_row, bytes(seat_map.bits)),
+        SEAT_MAP_CACHE_TIMEOUT
+    )
+
+    return seat_map
+
+
+def invalidate_seat_maps(flight_ids) -> None:
+    """
+    Move the flights' seat maps to a new version, so maps cached under the
+    old one are never read again and simply expire. Run after commit.
+    """
+    cache.set_many({get_seat_map_version_key(flight_id): time.time_ns() for flight_id in flight_ids}, None)
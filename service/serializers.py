@@ -1,8 +1,48 @@
-from django.db import transaction
+from collections import Counter
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from service.choices import CrewTypeChoices
-from service.models import Airport, Route, Manufacturer, Airplane, Crew, Flight, Order, Ticket
+from service.choices import CrewTypeChoices, CREW_POSITION_CHOICES_LIST
+from service.constants import (
+    ITINERARY_MAX_LEGS,
+    ITINERARY_DEFAULT_MAX_LEGS,
+    ITINERARY_DEFAULT_MIN_CONNECTION_MINUTES,
+    ITINERARY_DEFAULT_MAX_CONNECTION_MINUTES,
+    ITINERARY_MAX_CONNECTION_MINUTES,
+    ITINERARY_MAX_WINDOW_DAYS,
+    GROUP_BOOKING_MAX_PASSENGERS,
+    GROUP_BOOKING_ATTEMPTS,
+    MANUFACTURER_AIRPLANES_DEFAULT_LIMIT,
+    MANUFACTURER_AIRPLANES_MAX_LIMIT,
+    AIRPLANE_FLIGHTS_DEFAULT_WINDOW_DAYS,
+    AIRPLANE_FLIGHTS_MAX_WINDOW_DAYS,
+    AIRPLANE_FLIGHTS_WINDOW_LIMIT,
+    AIRPORT_SEARCH_DEFAULT_LIMIT,
+    AIRPORT_SEARCH_MAX_LIMIT,
+    BOARD_DEFAULT_PAST_HOURS,
+    BOARD_DEFAULT_WINDOW_HOURS,
+    BOARD_MAX_WINDOW_HOURS,
+    BOARD_SINCE_MAX_HOURS,
+    SCHEDULE_MAX_DAYS,
+    SCHEDULE_MAX_FLIGHTS,
+    UTILIZATION_DEFAULT_WINDOW_DAYS,
+    UTILIZATION_MAX_WINDOW_DAYS,
+    UTILIZATION_DEFAULT_MIN_GAP_HOURS,
+    CREW_SCHEDULE_DEFAULT_WINDOW_DAYS,
+    CREW_SCHEDULE_MAX_WINDOW_DAYS,
+)
+from service.bookings import tickets_booked, confirm_seat_holds, seats_filter, held_seats
+from service.crews import roster_errors, validate_crew_composition
+from service.exceptions import SeatsAlreadyBooked, NotEnoughSeats
+from service.exports import EXPORT_FORMATS
+from service.models import Airport, Route, Manufacturer, Airplane, Crew, Flight, Order, Ticket, SeatHold
+from service.schedules import expand_schedule, create_schedule
+from service.seat_maps import SeatMap, get_seat_map, invalidate_seat_maps
 
 
 # Airport
@@ -18,6 +58,101 @@ class AirportImageSerializer(serializers.ModelSerializer):
         fields = ("image", )
 
 
+class AirportSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=AIRPORT_SEARCH_MAX_LIMIT,
+        default=AIRPORT_SEARCH_DEFAULT_LIMIT
+    )
+
+
+class AirportSearchResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    city = serializers.CharField()
+    similarity = serializers.FloatField()
+
+
+class BoardQuerySerializer(serializers.Serializer):
+    after = serializers.DateTimeField(required=False, help_text="Window start, an hour ago by default.")
+    before = serializers.DateTimeField(required=False, help_text="Window end, 12 hours after its start by default.")
+    since = serializers.DateTimeField(
+        required=False,
+        help_text=(
+            f"Only flights changed after this moment, at most {BOARD_SINCE_MAX_HOURS} hours ago, "
+            "and the ids of the ones that left the window."
+        ),
+    )
+
+    def validate(self, data):
+        after = data.get("after") or timezone.now() - timedelta(hours=BOARD_DEFAULT_PAST_HOURS)
+        before = data.get("before") or after + timedelta(hours=BOARD_DEFAULT_WINDOW_HOURS)
+
+        if after >= before:
+            raise serializers.ValidationError("after must be earlier than before.")
+
+        if before - after > timedelta(hours=BOARD_MAX_WINDOW_HOURS):
+            raise serializers.ValidationError(f"The window must not exceed {BOARD_MAX_WINDOW_HOURS} hours.")
+
+        since = data.get("since")
+
+        if since is not None and since < timezone.now() - timedelta(hours=BOARD_SINCE_MAX_HOURS):
+            raise serializers.ValidationError(
+                f"since must be within the last {BOARD_SINCE_MAX_HOURS} hours; fetch the full board instead."
+            )
+
+        return {**data, "after": after, "before": before}
+
+
+class BoardAirportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Airport
+        fields = ("id", "name", "city")
+
+
+class BoardAirplaneSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Airplane
+        fields = ("id", "name")
+
+
+class DepartureBoardSerializer(serializers.ModelSerializer):
+    destination = BoardAirportSerializer(source="route.destination", read_only=True)
+    airplane = BoardAirplaneSerializer(read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = ("id", "departure_time", "arrival_time", "destination", "airplane", "updated_at")
+
+
+class ArrivalBoardSerializer(serializers.ModelSerializer):
+    origin = BoardAirportSerializer(source="route.source", read_only=True)
+    airplane = BoardAirplaneSerializer(read_only=True)
+
+    class Meta:
+        model = Flight
+        fields = ("id", "departure_time", "arrival_time", "origin", "airplane", "updated_at")
+
+
+class DeparturesSerializer(serializers.Serializer):
+    generated_at = serializers.DateTimeField(help_text="Pass as `since` to get only later changes.")
+    flights = DepartureBoardSerializer(many=True)
+    removed = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="With `since`, ids of flights deleted or moved out of the window since then.",
+    )
+
+
+class ArrivalsSerializer(serializers.Serializer):
+    generated_at = serializers.DateTimeField(help_text="Pass as `since` to get only later changes.")
+    flights = ArrivalBoardSerializer(many=True)
+    removed = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="With `since`, ids of flights deleted or moved out of the window since then.",
+    )
+
+
 # Route
 class RouteRetrieveSerializer(serializers.ModelSerializer):
     source = AirportSerializer()
@@ -57,7 +192,7 @@ class ManufacturerSerializer(serializers.ModelSerializer):
 
 
 class ManufacturerListSerializer(ManufacturerSerializer):
-    airplanes_count = serializers.IntegerField(source="airplanes.count")
+    airplanes_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Manufacturer
@@ -76,12 +211,37 @@ class ManufacturerAirplaneSerializer(serializers.ModelSerializer):
         fields = ("id", "name", "type", "pilots_capacity", "passenger_seats_total", "personal_capacity", "year_of_manufacture", "image")
 
 
+class ManufacturerAirplanesPageSerializer(serializers.Serializer):
+    airplanes_limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MANUFACTURER_AIRPLANES_MAX_LIMIT,
+        default=MANUFACTURER_AIRPLANES_DEFAULT_LIMIT
+    )
+    airplanes_offset = serializers.IntegerField(min_value=0, default=0)
+
+
 class ManufacturerRetrieveSerializer(ManufacturerSerializer):
-    airplanes = ManufacturerAirplaneSerializer(many=True, read_only=True)
+    airplanes = serializers.SerializerMethodField()
+    airplanes_count = serializers.SerializerMethodField()
+
+    @extend_schema_field(ManufacturerAirplaneSerializer(many=True))
+    def get_airplanes(self, obj):
+        # The view prefetches one page into `airplanes_page`.
+        airplanes = getattr(obj, "airplanes_page", None)
+
+        if airplanes is None:
+            airplanes = obj.airplanes.select_related("type").order_by("id")[:MANUFACTURER_AIRPLANES_DEFAULT_LIMIT]
+
+        return ManufacturerAirplaneSerializer(airplanes, many=True, context=self.context).data
+
+    @staticmethod
+    def get_airplanes_count(obj) -> int:
+        count = getattr(obj, "airplanes_count", None)
+        return obj.airplanes.count() if count is None else count
 
     class Meta(ManufacturerSerializer.Meta):
-        fields = ManufacturerSerializer.Meta.fields + ("created_at", "updated_at", "airplanes")
-        read_only_fields = ManufacturerSerializer.Meta.read_only_fields + ("created_at", "updated_at", "airplanes")
+        fields = ManufacturerSerializer.Meta.fields + ("created_at", "updated_at", "airplanes_count", "airplanes")
+        read_only_fields = ManufacturerSerializer.Meta.read_only_fields + ("created_at", "updated_at")
 
 
 # Airplane
@@ -108,12 +268,17 @@ class AirplaneSerializer(serializers.ModelSerializer):
 class AirplaneListSerializer(AirplaneSerializer):
     manufacturer = serializers.SlugRelatedField(slug_field="name", read_only=True)
     type = serializers.SerializerMethodField()
-    flights = serializers.IntegerField(source="flights.count")
+    flights = serializers.SerializerMethodField()
 
     @staticmethod
     def get_type(obj):
         return f"{obj.type.name} ({obj.type.code})"
 
+    @staticmethod
+    def get_flights(obj) -> int:
+        count = getattr(obj, "flights_count", None)
+        return obj.flights.count() if count is None else count
+
     class Meta(AirplaneSerializer.Meta):
         fields = (
             "id",
@@ -140,17 +305,103 @@ class AirplaneFlightsSerializer(serializers.ModelSerializer):
         fields = ("id", "route", "departure_time", "arrival_time")
 
 
+class AirplaneFlightsWindowSerializer(serializers.Serializer):
+    flights_window = serializers.IntegerField(
+        min_value=0,
+        max_value=AIRPLANE_FLIGHTS_MAX_WINDOW_DAYS,
+        default=AIRPLANE_FLIGHTS_DEFAULT_WINDOW_DAYS,
+        help_text="Days before and after now to embed flights for."
+    )
+
+
+class FleetUtilizationQuerySerializer(serializers.Serializer):
+    after = serializers.DateTimeField(required=False, help_text="Window start, now by default.")
+    before = serializers.DateTimeField(
+        required=False,
+        help_text=f"Window end, {UTILIZATION_DEFAULT_WINDOW_DAYS} days after its start by default."
+    )
+    min_gap_hours = serializers.FloatField(
+        min_value=0,
+        default=UTILIZATION_DEFAULT_MIN_GAP_HOURS,
+        help_text="Shortest idle gap to list."
+    )
+
+    def validate(self, data):
+        after = data.get("after") or timezone.now()
+        before = data.get("before") or after + timedelta(days=UTILIZATION_DEFAULT_WINDOW_DAYS)
+
+        if after >= before:
+            raise serializers.ValidationError("after must be earlier than before.")
+
+        if before - after > timedelta(days=UTILIZATION_MAX_WINDOW_DAYS):
+            raise serializers.ValidationError(f"The window must not exceed {UTILIZATION_MAX_WINDOW_DAYS} days.")
+
+        return {**data, "after": after, "before": before}
+
+
+class IdleGapSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+    hours = serializers.FloatField()
+
+
+class AirplaneUtilizationSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    flights = serializers.IntegerField()
+    busy_hours = serializers.FloatField()
+    utilization = serializers.FloatField(help_text="Share of the window spent flying, 0 to 1.")
+    idle_gaps = IdleGapSerializer(many=True)
+
+
+class FleetUtilizationSerializer(serializers.Serializer):
+    after = serializers.DateTimeField()
+    before = serializers.DateTimeField()
+    airplanes = AirplaneUtilizationSerializer(many=True)
+
+
+def airplane_flights_window(days: int = AIRPLANE_FLIGHTS_DEFAULT_WINDOW_DAYS):
+    """Flights departing within `days` before or after now, earliest first."""
+    now = timezone.now()
+
+    return (
+        Flight.objects
+            .filter(
+                departure_time__gte=now - timedelta(days=days),
+                departure_time__lte=now + timedelta(days=days),
+            )
+            .select_related("route__source", "route__destination")
+            .order_by("departure_time", "id")
+    )
+
+
 class AirplaneRetrieveSerializer(AirplaneSerializer):
     manufacturer = ManufacturerSerializer()
     type = serializers.SerializerMethodField()
-    flights = AirplaneFlightsSerializer(many=True, read_only=True)
+    flights = serializers.SerializerMethodField()
+    flights_count = serializers.SerializerMethodField()
 
     @staticmethod
     def get_type(obj):
         return f"{obj.type.name} ({obj.type.code})"
 
+    @extend_schema_field(AirplaneFlightsSerializer(many=True))
+    def get_flights(self, obj):
+        # The view prefetches the window into `flights_window`; the rest is
+        # served by /airplanes/{id}/flights/.
+        flights = getattr(obj, "flights_window", None)
+
+        if flights is None:
+            flights = airplane_flights_window().filter(airplane=obj)[:AIRPLANE_FLIGHTS_WINDOW_LIMIT]
+
+        return AirplaneFlightsSerializer(flights, many=True, context=self.context).data
+
+    @staticmethod
+    def get_flights_count(obj) -> int:
+        return AirplaneListSerializer.get_flights(obj)
+
     class Meta(AirplaneSerializer.Meta):
-        fields = AirplaneListSerializer.Meta.fields + ("passenger_seats_total", "flights", "rows", "seats_in_row")
+        fields = AirplaneListSerializer.Meta.fields + ("passenger_seats_total", "flights_count", "rows", "seats_in_row")
 
 
 # Flight
@@ -204,32 +455,187 @@ class FlightSerializer(serializers.ModelSerializer):
         airplane = data.get("airplane")
 
         if crew is not None and airplane is not None:
-            flight_crew = [crew_person for crew_person in crew if crew_person.crew_type == CrewTypeChoices.FLIGHT_CREW]
-            cabin_crew = [crew_person for crew_person in crew if crew_person.crew_type == CrewTypeChoices.CABIN_CREW]
+            try:
+                validate_crew_composition(airplane, crew)
+            except DjangoValidationError as error:
+                raise serializers.ValidationError(error.messages)
+
+        self.validate_schedule(data)
+        self.validate_roster(data)
+
+        return data
 
-            if len(cabin_crew) > airplane.personal_capacity:
-                raise serializers.ValidationError(f"The number of cabin crew exceeds the airline's personal capacity.")
+    def validate_schedule(self, data):
+        """Arrival after departure and no overlap with the airplane's other flights, see Flight constraints."""
+        flight = Flight(pk=getattr(self.instance, "pk", None))
 
-            if len(flight_crew) > airplane.pilots_capacity:
-                raise serializers.ValidationError(f"The number of flight crew exceeds the airline's pilot capacity.")
+        for field in ("airplane", "departure_time", "arrival_time"):
+            setattr(flight, field, data.get(field, getattr(self.instance, field, None)))
 
-            if len(cabin_crew) < airplane.personal_capacity:
-                raise serializers.ValidationError(f"The number of airline personal capacity must be at least { airplane.personal_capacity}.")
+        if flight.airplane is None or flight.departure_time is None or flight.arrival_time is None:
+            return
+
+        try:
+            flight.validate_constraints()
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
+    def validate_roster(self, data):
+        """Crew must not be on overlapping flights or over duty limits, see crews.roster_duty."""
+        crew = data.get("crew")
+        departure_time = data.get("departure_time", getattr(self.instance, "departure_time", None))
+        arrival_time = data.get("arrival_time", getattr(self.instance, "arrival_time", None))
 
-            if len(flight_crew) < airplane.pilots_capacity:
-                raise serializers.ValidationError(f"The number of airline pilots capacity must be at least {airplane.pilots_capacity}.")
+        if crew is None and self.instance is not None:
+            crew = self.instance.crew.all()
+
+        if not crew or departure_time is None or arrival_time is None:
+            return
+
+        errors = roster_errors(
+            [crew_person.id for crew_person in crew],
+            [(departure_time, arrival_time)],
+            exclude_flight=getattr(self.instance, "pk", None)
+        )
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as error:
+            # Another flight took the airplane between validation and insert.
+            name = getattr(getattr(error.__cause__, "diag", None), "constraint_name", None)
+            constraint = next((constraint for constraint in Flight._meta.constraints if constraint.name == name), None)
+
+            if constraint is None:
+                raise
+
+            raise serializers.ValidationError([constraint.get_violation_error_message()])
+
+
+class FlightScheduleSerializer(serializers.Serializer):
+    route = serializers.PrimaryKeyRelatedField(queryset=Route.objects.all())
+    airplane = serializers.PrimaryKeyRelatedField(queryset=Airplane.objects.all())
+    crew = serializers.PrimaryKeyRelatedField(queryset=Crew.objects.all(), many=True)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField(help_text="Last day of the schedule (inclusive).")
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=7),
+        min_length=1,
+        help_text="ISO days of the week, 1 is Monday."
+    )
+    departure_times = serializers.ListField(child=serializers.TimeField(), min_length=1)
+    duration = serializers.DurationField(min_value=timedelta(minutes=1))
+    skip_conflicts = serializers.BooleanField(
+        default=False,
+        help_text="Leave out flights overlapping existing ones instead of failing."
+    )
+
+    def validate(self, data):
+        if data["end_date"] < data["start_date"]:
+            raise serializers.ValidationError({"end_date": "Must not be before start_date."})
+
+        if (data["end_date"] - data["start_date"]).days >= SCHEDULE_MAX_DAYS:
+            raise serializers.ValidationError({"end_date": f"A schedule spans at most {SCHEDULE_MAX_DAYS} days."})
+
+        # Crew composition depends on the airplane only, so it is checked once for all flights.
+        try:
+            validate_crew_composition(data["airplane"], data["crew"])
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
+        slots = expand_schedule(
+            data["start_date"],
+            data["end_date"],
+            data["weekdays"],
+            data["departure_times"],
+            data["duration"],
+        )
+
+        if not slots:
+            raise serializers.ValidationError("The schedule has no flights.")
+
+        if len(slots) > SCHEDULE_MAX_FLIGHTS:
+            raise serializers.ValidationError(f"A schedule has at most {SCHEDULE_MAX_FLIGHTS} flights.")
+
+        for (_departure, arrival), (next_departure, _next_arrival) in zip(slots, slots[1:]):
+            if next_departure < arrival:
+                raise serializers.ValidationError(
+                    f"The flight departing at {next_departure:%Y-%m-%d %H:%M} overlaps the previous one."
+                )
+
+        errors = roster_errors([crew_person.id for crew_person in data["crew"]], slots)
+
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        data["slots"] = slots
 
         return data
 
+    def create(self, validated_data):
+        return create_schedule(
+            validated_data["route"],
+            validated_data["airplane"],
+            validated_data["crew"],
+            validated_data["slots"],
+            skip_conflicts=validated_data["skip_conflicts"],
+        )
+
+
+class ScheduledFlightSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Flight
+        fields = ("id", "departure_time", "arrival_time")
+
+
+class ScheduleConflictSerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    flight = serializers.IntegerField(help_text="Existing flight of the airplane.")
+
+
+class FlightScheduleResultSerializer(serializers.Serializer):
+    flights = ScheduledFlightSerializer(many=True)
+    conflicts = ScheduleConflictSerializer(many=True)
+
 
 class FlightReadSerializer(serializers.ModelSerializer):
     crew = FlightCrewSerializer(many=True, read_only=True)
     airplane = FlightAirplaneSerializer(read_only=True)
     route = RouteRetrieveSerializer(read_only=True)
+    seats_available = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Flight
-        fields = ("id", "route", "airplane", "crew", "departure_time", "arrival_time")
+        fields = (
+            "id",
+            "route",
+            "airplane",
+            "crew",
+            "departure_time",
+            "arrival_time",
+            "tickets_sold",
+            "seats_available",
+        )
+
+
+class SeatMapRowSerializer(serializers.Serializer):
+    row = serializers.IntegerField()
+    free = serializers.ListField(child=serializers.IntegerField())
+    occupied = serializers.ListField(child=serializers.IntegerField())
+
+
+class FlightSeatMapSerializer(serializers.Serializer):
+    rows = serializers.IntegerField()
+    seats_in_row = serializers.IntegerField()
+    seats_total = serializers.IntegerField()
+    seats_free = serializers.IntegerField(source="free_count")
+    seats_occupied = serializers.IntegerField(source="occupied_count")
+    layout = SeatMapRowSerializer(many=True)
 
 
 class TicketFlightSerializer(serializers.ModelSerializer):
@@ -245,10 +651,175 @@ class TicketFlightSerializer(serializers.ModelSerializer):
         fields = ("id", "route", "airplane", "departure_time", "arrival_time")
 
 
+class AvailableCrewQuerySerializer(serializers.Serializer):
+    position = serializers.ChoiceField(choices=CREW_POSITION_CHOICES_LIST, required=False)
+    crew_type = serializers.ChoiceField(choices=CrewTypeChoices.choices, required=False)
+
+
+class AvailableCrewSerializer(FlightCrewSerializer):
+    duty_hours_7_days = serializers.SerializerMethodField()
+    duty_hours_28_days = serializers.SerializerMethodField()
+
+    class Meta(FlightCrewSerializer.Meta):
+        fields = FlightCrewSerializer.Meta.fields + ("duty_hours_7_days", "duty_hours_28_days")
+
+    @staticmethod
+    def get_duty_hours_7_days(obj) -> float:
+        return obj.duty_7_days / timedelta(hours=1)
+
+    @staticmethod
+    def get_duty_hours_28_days(obj) -> float:
+        return obj.duty_28_days / timedelta(hours=1)
+
+
+# Crew
+class CrewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Crew
+        fields = ("id", "first_name", "last_name", "crew_type", "position")
+
+    def validate(self, data):
+        crew = Crew(**{
+            "crew_type": getattr(self.instance, "crew_type", None),
+            "position": getattr(self.instance, "position", None),
+            **data,
+        })
+
+        try:
+            crew.validate_crew_position()
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.messages)
+
+        return data
+
+
+class CrewScheduleQuerySerializer(serializers.Serializer):
+    after = serializers.DateTimeField(required=False, help_text="Window start, now by default.")
+    before = serializers.DateTimeField(
+        required=False,
+        help_text=f"Window end, {CREW_SCHEDULE_DEFAULT_WINDOW_DAYS} days after its start by default."
+    )
+
+    def validate(self, data):
+        after = data.get("after") or timezone.now()
+        before = data.get("before") or after + timedelta(days=CREW_SCHEDULE_DEFAULT_WINDOW_DAYS)
+
+        if after >= before:
+            raise serializers.ValidationError("after must be earlier than before.")
+
+        if before - after > timedelta(days=CREW_SCHEDULE_MAX_WINDOW_DAYS):
+            raise serializers.ValidationError(f"The window must not exceed {CREW_SCHEDULE_MAX_WINDOW_DAYS} days.")
+
+        return {"after": after, "before": before}
+
+
+# Seat hold
+class SeatSerializer(serializers.Serializer):
+    row = serializers.IntegerField(min_value=1)
+    seat = serializers.IntegerField(min_value=1)
+
+
+class SeatHoldRequestSerializer(serializers.Serializer):
+    seats = SeatSerializer(many=True, allow_empty=False)
+
+    def validate_seats(self, seats):
+        airplane = self.context["flight"].airplane
+        requested = Counter((seat["row"], seat["seat"]) for seat in seats)
+
+        for row, seat in requested:
+            Ticket.validate_seat_number(row=row, seat=seat, airplane=airplane)
+
+        duplicates = [seat for seat, count in requested.items() if count > 1]
+
+        if duplicates:
+            raise serializers.ValidationError([
+                f"Seat {row}-{seat} is requested more than once." for row, seat in duplicates
+            ])
+
+        return seats
+
+
+class SeatHoldSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatHold
+        fields = ("id", "flight", "row", "seat", "expires_at")
+
+
+# Itinerary
+class ItinerarySearchSerializer(serializers.Serializer):
+    source = serializers.PrimaryKeyRelatedField(queryset=Airport.objects.all())
+    destination = serializers.PrimaryKeyRelatedField(queryset=Airport.objects.all())
+    departure_after = serializers.DateField()
+    departure_before = serializers.DateField()
+    max_legs = serializers.IntegerField(
+        min_value=1,
+        max_value=ITINERARY_MAX_LEGS,
+        default=ITINERARY_DEFAULT_MAX_LEGS
+    )
+    min_connection = serializers.IntegerField(
+        min_value=0,
+        default=ITINERARY_DEFAULT_MIN_CONNECTION_MINUTES,
+        help_text="Minimum connection time in minutes."
+    )
+    max_connection = serializers.IntegerField(
+        min_value=1,
+        max_value=ITINERARY_MAX_CONNECTION_MINUTES,
+        default=ITINERARY_DEFAULT_MAX_CONNECTION_MINUTES,
+        help_text="Maximum connection time in minutes."
+    )
+
+    def validate(self, data):
+        if data["source"] == data["destination"]:
+            raise serializers.ValidationError("Source and destination cannot be the same.")
+
+        if data["departure_after"] > data["departure_before"]:
+            raise serializers.ValidationError("departure_after must not be later than departure_before.")
+
+        if (data["departure_before"] - data["departure_after"]).days >= ITINERARY_MAX_WINDOW_DAYS:
+            raise serializers.ValidationError(f"The departure window spans at most {ITINERARY_MAX_WINDOW_DAYS} days.")
+
+        if data["min_connection"] > data["max_connection"]:
+            raise serializers.ValidationError("min_connection must not exceed max_connection.")
+
+        return data
+
+
+class ItinerarySerializer(serializers.Serializer):
+    departure_time = serializers.DateTimeField()
+    arrival_time = serializers.DateTimeField()
+    duration_minutes = serializers.IntegerField()
+    distance = serializers.IntegerField()
+    legs = TicketFlightSerializer(many=True)
+
+
+class TicketFlightField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves flights from the batch the parent OrderSerializer loaded into
+    the context, so tickets don't query their flight and airplane one by one.
+    """
+
+    def to_internal_value(self, data):
+        flights = self.context.get("flights")
+
+        if flights is None:
+            return super().to_internal_value(data)
+
+        try:
+            return flights[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
 class TicketSerializer(serializers.ModelSerializer):
+    flight = TicketFlightField(queryset=Flight.objects.select_related("airplane"))
+
     class Meta:
         model = Ticket
         fields = ("id", "row", "seat", "flight")
+        # Seat uniqueness is left to the database and reported as 409 in bulk.
+        validators = []
 
     def validate(self, data):
         Ticket.validate_seat_number(
@@ -275,24 +846,139 @@ class OrderSerializer(serializers.ModelSerializer):
         fields = ("id", "user", "created_at", "tickets")
         read_only_fields = ("id", "user", "created_at")
 
+    def to_internal_value(self, data):
+        self.context["flights"] = self.prefetch_flights(data)
+        return super().to_internal_value(data)
+
+    @staticmethod
+    def prefetch_flights(data) -> dict[int, Flight]:
+        tickets = data.get("tickets") if hasattr(data, "get") else None
+        flight_ids = set()
+
+        for ticket in tickets if isinstance(tickets, list) else []:
+            try:
+                flight_ids.add(int(ticket["flight"]))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        return Flight.objects.select_related("airplane").in_bulk(flight_ids)
+
+    def validate_tickets(self, tickets):
+        seats = Counter((ticket["flight"].id, ticket["row"], ticket["seat"]) for ticket in tickets)
+        duplicates = [seat for seat, count in seats.items() if count > 1]
+
+        if duplicates:
+            raise serializers.ValidationError([
+                f"Seat {row}-{seat} on flight {flight} is requested more than once."
+                for flight, row, seat in duplicates
+            ])
+
+        return tickets
+
+    @staticmethod
+    def get_booked_seats(tickets) -> list[dict]:
+        return list(
+            Ticket.objects
+                .filter(seats_filter(tickets))
+                .order_by("flight", "row", "seat")
+                .values("flight", "row", "seat")
+        )
+
     def create(self, validated_data):
         with transaction.atomic():
             tickets = validated_data.pop("tickets")
 
             if tickets:
                 order = Order.objects.create(**validated_data)
+                tickets = [Ticket(order=order, **ticket) for ticket in tickets]
+
+                confirm_seat_holds(order.user, tickets)
+
+                try:
+                    with transaction.atomic():
+                        Ticket.objects.bulk_create(tickets)
+                except IntegrityError as error:
+                    name = getattr(getattr(error.__cause__, "diag", None), "constraint_name", None)
+
+                    if name != "unique_flight_ticket":
+                        raise
 
-                for ticket in tickets:
-                    Ticket.objects.create(order=order, **ticket)
+                    raise SeatsAlreadyBooked(self.get_booked_seats(tickets))
+
+                tickets_booked(tickets)
 
                 return order
 
             return None
 
 
+class GroupOrderSerializer(serializers.Serializer):
+    flight = serializers.PrimaryKeyRelatedField(queryset=Flight.objects.select_related("airplane"))
+    passengers = serializers.IntegerField(min_value=1, max_value=GROUP_BOOKING_MAX_PASSENGERS)
+
+    def create(self, validated_data):
+        """
+        Pick seats together from the flight's seat map and book them as a
+        regular order. A stale cached map only costs a retry: it is moved
+        to a new version and rebuilt from tickets, for later bookers too.
+        """
+        flight = validated_data["flight"]
+        user = validated_data["user"]
+        seat_map = get_seat_map(flight)
+
+        for attempt in range(GROUP_BOOKING_ATTEMPTS):
+            occupancy = SeatMap(seat_map.rows, seat_map.seats_in_row, seat_map.bits)
+
+            for row, seat in held_seats(flight, user):
+                occupancy.occupy(row, seat)
+
+            seats = occupancy.find_group(validated_data["passengers"])
+
+            if seats is None:
+                raise NotEnoughSeats()
+
+            order_serializer = OrderSerializer(
+                data={
+                    "tickets": [
+                        {"row": row, "seat": seat, "flight": flight.id} for row, seat in seats
+                    ]
+                },
+                context=self.context
+            )
+            order_serializer.is_valid(raise_exception=True)
+
+            try:
+                return order_serializer.save(user=user)
+            except SeatsAlreadyBooked:
+                if attempt == GROUP_BOOKING_ATTEMPTS - 1:
+                    raise
+
+                # The conflicting booking has committed, so the new map sees it.
+                invalidate_seat_maps([flight.id])
+                seat_map = get_seat_map(flight)
+
+
 class OrderReadSerializer(serializers.ModelSerializer):
     tickets = TicketRetrieveSerializer(many=True, allow_empty=True)
 
     class Meta:
         model = Order
         fields = ("id", "user", "tickets", "created_at")
+
+
+# Export
+class ExportQuerySerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="ndjson")
+    after = serializers.DateField(required=False, help_text="From this date (inclusive).")
+    before = serializers.DateField(required=False, help_text="To this date (inclusive).")
+    airport = serializers.PrimaryKeyRelatedField(
+        queryset=Airport.objects.all(),
+        required=False,
+        help_text="Only rows whose route starts or ends at this airport."
+    )
+
+    def validate(self, data):
+        if "after" in data and "before" in data and data["after"] > data["before"]:
+            raise serializers.ValidationError("after must not be later than before.")
+
+        return data
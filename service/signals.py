@@ -0,0 +1,62 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from app.databases import pin_to_primary
+
+from .bookings import tickets_booked, tickets_released
+from .caches import bump_catalog_version
+from .itineraries import invalidate_route_graph
+from .models import Airport, Route, Manufacturer, AirplaneType, Airplane, Crew, Flight, Order, Ticket
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_booked(sender, instance, created, **kwargs):
+    if created:
+        tickets_booked([instance])
+
+
+@receiver(post_save, sender=Order)
+def order_created(sender, instance, created, **kwargs):
+    if created:
+        pin_to_primary(instance.user_id)
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_released(sender, instance, **kwargs):
+    tickets_released([instance])
+
+
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+def route_changed(sender, **kwargs):
+    invalidate_route_graph()
+    transaction.on_commit(invalidate_route_graph)
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=Route)
+@receiver(post_delete, sender=Route)
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+@receiver(post_save, sender=AirplaneType)
+@receiver(post_delete, sender=AirplaneType)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+@receiver(post_save, sender=Crew)
+@receiver(post_delete, sender=Crew)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def catalog_changed(sender, **kwargs):
+    # Bumped again after commit, so responses cached from data read before
+    # the transaction became visible are dropped as well.
+    bump_catalog_version(sender)
+    transaction.on_commit(lambda: bump_catalog_version(sender))
+
+
+@receiver(m2m_changed, sender=Flight.crew.through)
+def flight_crew_changed(sender, **kwargs):
+    catalog_changed(Flight)
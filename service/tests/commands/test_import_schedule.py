@@ -0,0 +1,130 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command, CommandError
+
+from ..factories import AirportFactory, AirplaneTypeFactory, ManufacturerFactory, CrewFactory
+from ...choices import CrewTypeChoices
+from ...imports import ScheduleImporter
+from ...models import Airport, Route, Airplane, Flight
+
+
+@pytest.mark.django_db
+class TestImportSchedule:
+    def write_files(self, tmp_path, flights=None):
+        existing = AirportFactory(name="Existing", city="Old city", open_year=1990)
+        airplane_type = AirplaneTypeFactory(code="A32")
+        manufacturer = ManufacturerFactory(name="Airbus")
+        self.crew = CrewFactory.create_batch(2, crew_type=CrewTypeChoices.FLIGHT_CREW)
+
+        airports = tmp_path / "airports.csv"
+        airports.write_text(
+            "name,city,open_year\n"
+            "Existing,New city,1991\n"
+            "Imported,Somewhere,2001\n"
+        )
+        routes = tmp_path / "routes.ndjson"
+        routes.write_text(
+            json.dumps({"source": "Existing", "destination": "Imported", "distance": 500}) + "\n"
+        )
+        airplanes = tmp_path / "airplanes.json"
+        airplanes.write_text(json.dumps([{
+            "name": "Imported airplane",
+            "type": airplane_type.code,
+            "manufacturer": manufacturer.name,
+            "rows": 20,
+            "seats_in_row": 6,
+            "pilots_capacity": 2,
+            "year_of_manufacture": 2015,
+            "fuel_capacity_l": 20000,
+            "cargo_capacity_kg": 5000,
+            "max_speed_kmh": 850,
+            "max_distance_km": 6000,
+        }]))
+        if flights is None:
+            flights = [
+                f"Existing,Imported,Imported airplane,2030-01-01T10:00,2030-01-01T12:00,"
+                f"{self.crew[0].id};{self.crew[1].id}\n",
+                "Existing,Imported,Imported airplane,2030-01-02T10:00,2030-01-02T12:00,\n",
+            ]
+
+        flights_file = tmp_path / "flights.csv"
+        flights_file.write_text("source,destination,airplane,departure_time,arrival_time,crew\n" + "".join(flights))
+
+        return existing, [
+            "--airports", str(airports),
+            "--routes", str(routes),
+            "--airplanes", str(airplanes),
+            "--flights", str(flights_file),
+        ]
+
+    def test_schedule_should_be_imported(self, tmp_path):
+        existing, args = self.write_files(tmp_path)
+        stdout = io.StringIO()
+
+        call_command("import_schedule", *args, "--batch-size", "1", stdout=stdout)
+
+        existing.refresh_from_db()
+        route = Route.objects.get(source=existing, destination__name="Imported")
+        flights = list(Flight.objects.filter(route=route).order_by("departure_time"))
+
+        assert existing.city == "New city"
+        assert Airport.objects.count() == 2
+        assert route.distance == 500
+        assert Airplane.objects.filter(name="Imported airplane").count() == 1
+        assert len(flights) == 2
+        assert {crew.id for crew in flights[0].crew.all()} == {crew.id for crew in self.crew}
+        assert not flights[1].crew.exists()
+        assert "flights: 2 rows, 2 valid" in stdout.getvalue()
+
+    def test_dry_run_should_not_write(self, tmp_path):
+        _existing, args = self.write_files(tmp_path)
+
+        call_command("import_schedule", *args, "--dry-run", stdout=io.StringIO())
+
+        assert not Route.objects.exists()
+        assert not Flight.objects.exists()
+        assert Airport.objects.get(name="Existing").city == "Old city"
+
+    def test_invalid_rows_should_import_nothing(self, tmp_path):
+        _existing, args = self.write_files(tmp_path, flights=[
+            "Existing,Imported,Imported airplane,2030-01-01T12:00,2030-01-01T10:00,\n",
+            "Existing,Imported,Unknown airplane,2030-01-01T10:00,2030-01-01T12:00,\n",
+        ])
+        stderr = io.StringIO()
+
+        with pytest.raises(CommandError, match="2 errors"):
+            call_command("import_schedule", *args, stdout=io.StringIO(), stderr=stderr)
+
+        assert "flights.csv:2: arrival_time" in stderr.getvalue()
+        assert "flights.csv:3: airplane: Unknown airplane" in stderr.getvalue()
+        assert not Airport.objects.filter(name="Imported").exists()
+
+    def test_overlapping_flights_should_be_reported(self, tmp_path):
+        _existing, args = self.write_files(tmp_path, flights=[
+            "Existing,Imported,Imported airplane,2030-01-01T10:00,2030-01-01T12:00,\n",
+            "Existing,Imported,Imported airplane,2030-01-01T11:00,2030-01-01T13:00,\n",
+            "Existing,Imported,Imported airplane,2030-01-01T12:00,2030-01-01T14:00,\n",
+        ])
+        stderr = io.StringIO()
+
+        with pytest.raises(CommandError, match="1 errors"):
+            call_command("import_schedule", *args, "--dry-run", stdout=io.StringIO(), stderr=stderr)
+
+        assert "flights.csv:3: airplane: The airplane is assigned to another flight" in stderr.getvalue()
+
+    def test_overlap_found_on_write_should_be_reported(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(ScheduleImporter, "reserve_airplane", lambda *args: None)
+        _existing, args = self.write_files(tmp_path, flights=[
+            "Existing,Imported,Imported airplane,2030-01-01T10:00,2030-01-01T12:00,\n",
+            "Existing,Imported,Imported airplane,2030-01-01T11:00,2030-01-01T13:00,\n",
+        ])
+        stderr = io.StringIO()
+
+        with pytest.raises(CommandError, match="1 errors"):
+            call_command("import_schedule", *args, stdout=io.StringIO(), stderr=stderr)
+
+        assert "flights.csv:2-3: " in stderr.getvalue()
+        assert "flight_airplane_no_overlap" in stderr.getvalue()
+        assert not Flight.objects.exists()
@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Database changes are rolled back between tests without sending signals.
+    for cache in caches.all():
+        cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    # Uploaded test images must not end up in the project's media directory.
+    settings.MEDIA_ROOT = tmp_path
@@ -1,5 +1,6 @@
 import factory
 import random
+from datetime import datetime, timedelta
 from django.contrib.auth import get_user_model
 
 from ..constants import MAX_PILOT_CAPACITY
@@ -115,11 +116,20 @@ class FlightFactory(factory.django.DjangoModelFactory):
     route = factory.SubFactory(RouteFactory)
     airplane = factory.SubFactory(AirplaneFactory)
     departure_time = factory.Faker("date_time")
-    arrival_time = factory.Faker("date_time")
+    arrival_time = factory.LazyAttribute(
+        lambda flight: (
+            datetime.fromisoformat(str(flight.departure_time))
+            + timedelta(minutes=random.randint(30, 12 * 60))
+        )
+    )
 
     @factory.post_generation
     def crew(self, create, extracted, **kwargs):
-        if not create or extracted is not None:
+        if not create:
+            return
+
+        if extracted is not None:
+            self.crew.set(extracted)
             return
 
         for index in range(self.airplane.pilots_capacity):
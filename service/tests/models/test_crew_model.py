@@ -1,8 +1,10 @@
 import pytest
 from django.core.exceptions import ValidationError
 
-from ..factories import CrewFactory
+from ..factories import CrewFactory, AirplaneFactory, FlightFactory
 from ...choices import CabinCrewPositionChoices, FlightCrewPositionChoices, CrewTypeChoices
+from ...crews import validate_crew_composition, flights_crew_composition_errors
+from ...models import Crew, Flight
 
 
 @pytest.mark.django_db
@@ -76,3 +78,28 @@ class TestCrewModel:
         assert crew.last_name == "Doe"
         assert crew.crew_type == CrewTypeChoices.FLIGHT_CREW
         assert crew.position == FlightCrewPositionChoices.CAPTAIN
+
+
+    def test_crew_composition_should_be_counted_in_one_query(self, django_assert_num_queries):
+        airplane = AirplaneFactory(pilots_capacity=2, personal_capacity=1)
+        pilots = CrewFactory.create_batch(2, crew_type=CrewTypeChoices.FLIGHT_CREW)
+        attendant = CrewFactory(crew_type=CrewTypeChoices.CABIN_CREW)
+
+        with django_assert_num_queries(1):
+            validate_crew_composition(airplane, Crew.objects.filter(id__in=[pilots[0].id, pilots[1].id, attendant.id]))
+
+        with django_assert_num_queries(0):
+            with pytest.raises(ValidationError, match="personal capacity must be at least 1"):
+                validate_crew_composition(airplane, pilots)
+
+
+    def test_crew_composition_of_many_flights_should_be_checked_in_one_query(self, django_assert_num_queries):
+        airplane = AirplaneFactory(pilots_capacity=1, personal_capacity=1)
+        complete = FlightFactory(airplane=airplane)
+        incomplete = FlightFactory(airplane=airplane, crew=[CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW)])
+        flights = list(Flight.objects.select_related("airplane").filter(id__in=[complete.id, incomplete.id]))
+
+        with django_assert_num_queries(1):
+            errors = flights_crew_composition_errors(flights)
+
+        assert errors == {incomplete.id: "The number of airline personal capacity must be at least 1."}
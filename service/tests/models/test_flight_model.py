@@ -1,6 +1,8 @@
 import pytest
+from django.db import IntegrityError
 
 from service.choices import CrewTypeChoices
+from service.schedules import overlapping_flights
 from ..factories import (
     FlightFactory,
     AirplaneFactory,
@@ -66,3 +68,26 @@ class TestFlightModel:
         assert str(flight) == ("Airport Berlin (2000) - Airport Paris (2001) (10km.) "
                                "- Flight airplane - AAA")
 
+
+    def test_airplane_should_not_fly_overlapping_flights(self):
+        airplane = AirplaneFactory()
+        flight = FlightFactory(
+            airplane=airplane,
+            departure_time="2030-01-01T10:00:00",
+            arrival_time="2030-01-01T12:00:00",
+        )
+        FlightFactory(
+            airplane=airplane,
+            departure_time="2030-01-01T12:00:00",
+            arrival_time="2030-01-01T14:00:00",
+        )
+        FlightFactory(departure_time="2030-01-01T11:00:00", arrival_time="2030-01-01T13:00:00")
+
+        assert list(overlapping_flights(airplane.id, "2030-01-01T09:00:00", "2030-01-01T10:30:00")) == [flight]
+
+        with pytest.raises(IntegrityError):
+            FlightFactory(
+                airplane=airplane,
+                departure_time="2030-01-01T11:00:00",
+                arrival_time="2030-01-01T13:00:00",
+            )
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.utils import timezone
+
+from service.bookings import hold_seats, reap_expired_seat_holds
+from service.exceptions import SeatsAlreadyBooked
+from service.models import SeatHold
+from ..factories import FlightFactory, AirplaneFactory, UserFactory
+
+
+@pytest.mark.django_db
+class TestSeatHoldModel:
+    def test_expired_holds_should_be_reaped_in_batches(self):
+        flight = FlightFactory(airplane=AirplaneFactory(rows=5, seats_in_row=5))
+        user = UserFactory()
+        expired = timezone.now() - timedelta(minutes=1)
+
+        SeatHold.objects.bulk_create(
+            SeatHold(flight=flight, user=user, row=1, seat=seat, expires_at=expired)
+            for seat in range(1, 6)
+        )
+        live_hold = SeatHold.objects.create(
+            flight=flight,
+            user=user,
+            row=2,
+            seat=1,
+            expires_at=timezone.now() + timedelta(minutes=1)
+        )
+
+        assert reap_expired_seat_holds(batch_size=2) == 5
+        assert list(SeatHold.objects.all()) == [live_hold]
+
+
+    def test_expired_hold_should_not_block_other_users(self):
+        flight = FlightFactory(airplane=AirplaneFactory(rows=5, seats_in_row=5))
+        SeatHold.objects.create(
+            flight=flight,
+            user=UserFactory(),
+            row=1,
+            seat=1,
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        user = UserFactory()
+
+        holds = hold_seats(flight, user, [(1, 1)])
+
+        assert [(hold.user, hold.row, hold.seat) for hold in holds] == [(user, 1, 1)]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_bookers_should_never_share_a_seat():
+    flight = FlightFactory(airplane=AirplaneFactory(rows=1, seats_in_row=2))
+    users = [UserFactory(username=f"booker-{index}") for index in range(16)]
+
+    def book(user):
+        try:
+            hold_seats(flight, user, [(1, 1), (1, 2)])
+            return True
+        except SeatsAlreadyBooked:
+            return False
+        finally:
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(book, users))
+
+    assert outcomes.count(True) == 1
+    assert SeatHold.objects.filter(flight=flight).count() == 2
+    assert SeatHold.objects.values("user").distinct().count() == 1
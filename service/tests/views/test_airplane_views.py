@@ -1,12 +1,14 @@
-import pytest
+from datetime import timedelta
 
+import pytest
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse_lazy
 from rest_framework.test import APIClient
 
 from service.models import Airplane
 
-from ..factories import UserFactory, ManufacturerFactory, AirplaneTypeFactory, AirplaneFactory
+from ..factories import UserFactory, ManufacturerFactory, AirplaneTypeFactory, AirplaneFactory, FlightFactory
 from ..utils import get_test_image
 from ...serializers import AirplaneRetrieveSerializer, AirplaneListSerializer
 
@@ -52,6 +54,30 @@ class TestPrivateAirplaneViews:
         assert response.data == serializer.data
 
 
+    def test_fleet_utilization_should_list_idle_gaps(self):
+        self.client.force_authenticate(UserFactory(admin=True))
+        busy, idle = AirplaneFactory(), AirplaneFactory()
+        FlightFactory(airplane=busy, departure_time="2030-01-01T02:00:00", arrival_time="2030-01-01T06:00:00")
+        FlightFactory(airplane=busy, departure_time="2030-01-01T06:30:00", arrival_time="2030-01-01T10:00:00")
+        FlightFactory(airplane=busy, departure_time="2030-01-01T20:00:00", arrival_time="2030-01-02T02:00:00")
+
+        response = self.client.get(
+            reverse_lazy("service:airplanes-utilization"),
+            {"after": "2030-01-01T00:00:00", "before": "2030-01-02T00:00:00", "min_gap_hours": 1}
+        )
+        airplanes = {airplane["id"]: airplane for airplane in response.data["airplanes"]}
+
+        assert response.status_code == status.HTTP_200_OK
+        assert airplanes[busy.id]["flights"] == 3
+        assert airplanes[busy.id]["busy_hours"] == 11.5
+        assert [(gap["start"], gap["end"]) for gap in airplanes[busy.id]["idle_gaps"]] == [
+            ("2030-01-01T00:00:00", "2030-01-01T02:00:00"),
+            ("2030-01-01T10:00:00", "2030-01-01T20:00:00"),
+        ]
+        assert airplanes[idle.id]["utilization"] == 0
+        assert airplanes[idle.id]["idle_gaps"][0]["hours"] == 24
+
+
 @pytest.mark.django_db
 class TestPublicAirplaneViews:
     def setup_method(self):
@@ -129,6 +155,67 @@ class TestPublicAirplaneViews:
         assert response.data == [serializer.data[1]]
 
 
+    def test_airplane_detail_should_embed_flights_window_only(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        airplane = AirplaneFactory()
+        now = timezone.now()
+        flights = [
+            FlightFactory(
+                airplane=airplane,
+                departure_time=now + timedelta(days=days),
+                arrival_time=now + timedelta(days=days, hours=2),
+            )
+            for days in (-30, -1, 2, 30)
+        ]
+        url = reverse_lazy("service:airplanes-detail", args=[airplane.id])
+
+        response = self.client.get(url)
+        wide_response = self.client.get(url, {"flights_window": 31})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["flights_count"] == 4
+        assert [flight["id"] for flight in response.data["flights"]] == [flights[1].id, flights[2].id]
+        assert [flight["id"] for flight in wide_response.data["flights"]] == [flight.id for flight in flights]
+
+    def test_airplane_detail_should_not_be_cached(self):
+        self.client.force_authenticate(UserFactory())
+        url = reverse_lazy("service:airplanes-detail", args=[AirplaneFactory().id])
+
+        response = self.client.get(url)
+        repeated_response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Cache" not in repeated_response
+        assert "ETag" not in repeated_response
+
+    def test_airplane_flights_should_be_paginated(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        airplane = AirplaneFactory()
+        now = timezone.now()
+        flights = [
+            FlightFactory(
+                airplane=airplane,
+                departure_time=now - timedelta(days=days),
+                arrival_time=now - timedelta(days=days, hours=-2),
+            )
+            for days in range(400, 0, -100)
+        ]
+        url = reverse_lazy("service:airplanes-flights", args=[airplane.id])
+
+        response = self.client.get(url, {"pagination": "keyset", "size": 3})
+        next_response = self.client.get(response.data["next"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            flight["id"] for flight in response.data["results"] + next_response.data["results"]
+        ] == [flight.id for flight in flights]
+        assert next_response.data["next"] is None
+
+
     def test_airplane_should_not_be_created(self):
         user = UserFactory()
         self.client.force_authenticate(user)
@@ -1,14 +1,18 @@
-import pytest
+from datetime import timedelta
 
+import pytest
+from django.db.models import F
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.reverse import reverse_lazy
 from rest_framework.test import APIClient, APIRequestFactory
 
-from service.models import Airport
+from service.caches import get_catalog_stats
+from service.models import Airport, Flight
 
 from ..utils import get_test_image
 from ...serializers import AirportSerializer
-from ..factories import AirportFactory, UserFactory
+from ..factories import AirportFactory, UserFactory, RouteFactory, FlightFactory
 
 
 AIRPORT_LIST_URL = reverse_lazy("service:airports-list")
@@ -89,6 +93,70 @@ class TestPrivateAirportListView:
         assert response.data == [airport_serializer.data[1], airport_serializer.data[2]]
 
 
+    def test_airport_list_should_support_keyset_pagination(self):
+        user = UserFactory(admin=True)
+        self.client.force_authenticate(user)
+
+        airports = AirportFactory.create_batch(3)
+        expected_ids = [
+            airport.id for airport in sorted(airports, key=lambda i: (-i.created_at.timestamp(), i.id))
+        ]
+
+        response = self.client.get(AIRPORT_LIST_URL, {"pagination": "keyset", "size": 2})
+        next_response = self.client.get(response.data["next"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert next_response.data["next"] is None
+        assert [
+            airport["id"] for airport in response.data["results"] + next_response.data["results"]
+        ] == expected_ids
+
+
+    def test_airport_list_should_be_cached_until_airports_change(self):
+        user = UserFactory(admin=True)
+        self.client.force_authenticate(user)
+
+        airport = AirportFactory()
+
+        first_response = self.client.get(AIRPORT_LIST_URL)
+        cached_response = self.client.get(AIRPORT_LIST_URL)
+
+        airport.city = "Hawkins"
+        airport.save()
+
+        changed_response = self.client.get(AIRPORT_LIST_URL)
+
+        assert first_response["X-Cache"] == "MISS"
+        assert cached_response["X-Cache"] == "HIT"
+        assert cached_response.data == first_response.data
+        assert changed_response["X-Cache"] == "MISS"
+        assert changed_response.data[0]["city"] == "Hawkins"
+        assert get_catalog_stats() == {"hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+
+    def test_airport_search_should_rank_prefix_matches_first(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        berlin = AirportFactory(name="Brandenburg", city="Berlin")
+        bern = AirportFactory(name="Bern-Belp", city="Bern")
+        hamburg = AirportFactory(name="Hamburg Airport", city="Hamburg")
+        AirportFactory(name="Charles de Gaulle", city="Paris")
+
+        url = reverse_lazy("service:airports-search")
+
+        response = self.client.get(url, {"q": "ber"})
+        cached_response = self.client.get(url, {"q": " BER "})
+        typo_response = self.client.get(url, {"q": "berln"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {airport["id"] for airport in response.data[:2]} == {berlin.id, bern.id}
+        assert hamburg.id not in [airport["id"] for airport in response.data[:2]]
+        assert cached_response.data == response.data
+        assert get_catalog_stats()["hits"] == 1
+        assert typo_response.data[0]["id"] == berlin.id
+
+
     def test_airport_post(self):
         user = UserFactory(admin=True)
         self.client.force_authenticate(user)
@@ -210,3 +278,101 @@ class TestPublicAirportDetailView:
         response = self.client.post(url, {"image": image_file}, format="multipart")
 
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+    def test_airport_boards_should_list_flights_in_window(self):
+        self.client.force_authenticate(UserFactory())
+
+        airport, other = AirportFactory.create_batch(2)
+        outbound = RouteFactory(source=airport, destination=other)
+        inbound = RouteFactory(source=other, destination=airport)
+        now = timezone.now()
+
+        def flight(route, hours):
+            return FlightFactory(
+                route=route,
+                departure_time=now + timedelta(hours=hours),
+                arrival_time=now + timedelta(hours=hours + 2),
+            )
+
+        later = flight(outbound, 3)
+        sooner = flight(outbound, 1)
+        flight(outbound, 30)
+        arrival = flight(inbound, 0)
+
+        departures = self.client.get(reverse_lazy("service:airports-departures", args=[airport.id]))
+        arrivals = self.client.get(reverse_lazy("service:airports-arrivals", args=[airport.id]))
+
+        assert departures.status_code == status.HTTP_200_OK
+        assert departures["Cache-Control"] == "max-age=5"
+        assert [item["id"] for item in departures.data["flights"]] == [sooner.id, later.id]
+        assert departures.data["flights"][0]["destination"]["id"] == other.id
+        assert [item["id"] for item in arrivals.data["flights"]] == [arrival.id]
+        assert arrivals.data["flights"][0]["origin"]["id"] == other.id
+
+    def test_airport_departures_should_return_changed_flights_since(self):
+        self.client.force_authenticate(UserFactory())
+
+        airport = AirportFactory()
+        now = timezone.now()
+        route = RouteFactory(source=airport)
+        unchanged, changed = [
+            FlightFactory(
+                route=route,
+                departure_time=now + timedelta(hours=hours),
+                arrival_time=now + timedelta(hours=hours + 2),
+            )
+            for hours in (1, 2)
+        ]
+        url = reverse_lazy("service:airports-departures", args=[airport.id])
+
+        since = self.client.get(url).data["generated_at"]
+        changed.arrival_time += timedelta(minutes=30)
+        changed.save()
+
+        response = self.client.get(url, {"since": since})
+
+        assert [item["id"] for item in response.data["flights"]] == [changed.id]
+        assert unchanged.id not in [item["id"] for item in response.data["flights"]]
+        assert response.data["removed"] == []
+
+    def test_airport_departures_since_should_return_removed_flights(self):
+        self.client.force_authenticate(UserFactory())
+
+        airport = AirportFactory()
+        now = timezone.now()
+        route = RouteFactory(source=airport)
+        deleted, moved_out, moved_within = [
+            FlightFactory(
+                route=route,
+                departure_time=now + timedelta(hours=hours),
+                arrival_time=now + timedelta(hours=hours + 2),
+            )
+            for hours in (1, 2, 3)
+        ]
+        url = reverse_lazy("service:airports-departures", args=[airport.id])
+
+        since = self.client.get(url).data["generated_at"]
+        deleted_id = deleted.id
+        deleted.delete()
+        Flight.objects.filter(pk=moved_out.pk).update(
+            departure_time=F("departure_time") + timedelta(days=2),
+            arrival_time=F("arrival_time") + timedelta(days=2),
+        )
+        moved_within.departure_time += timedelta(minutes=30)
+        moved_within.save()
+
+        response = self.client.get(url, {"since": since})
+
+        assert [item["id"] for item in response.data["flights"]] == [moved_within.id]
+        assert response.data["removed"] == sorted([deleted_id, moved_out.id])
+
+    def test_airport_departures_should_reject_old_since(self):
+        self.client.force_authenticate(UserFactory())
+
+        airport = AirportFactory()
+        url = reverse_lazy("service:airports-departures", args=[airport.id])
+
+        response = self.client.get(url, {"since": timezone.now() - timedelta(days=2)})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,68 @@
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse_lazy
+from rest_framework.test import APIClient
+
+from service.models import Airport
+
+from ..factories import UserFactory, RouteFactory, FlightFactory, OrderFactory, TicketFactory
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    def setup_method(self):
+        self.client = APIClient()
+
+    def test_async_flights_should_match_sync_flights(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        flights = [FlightFactory() for _ in range(3)]
+
+        for params in ({}, {"pagination": "keyset", "size": 2}, {"page": 2, "size": 2}):
+            response = self.client.get(reverse_lazy("service:async-flights-list"), params)
+            sync_response = self.client.get(reverse_lazy("service:flights-list"), params)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.data["results"] == sync_response.data["results"]
+
+        response = self.client.get(reverse_lazy("service:async-flights-detail", args=[flights[0].id]))
+        sync_response = self.client.get(reverse_lazy("service:flights-detail", args=[flights[0].id]))
+        missing_response = self.client.get(reverse_lazy("service:async-flights-detail", args=[0]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == sync_response.data
+        assert missing_response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_async_catalog_should_be_read_only_and_conditional(self):
+        user = UserFactory(admin=True)
+        self.client.force_authenticate(user)
+
+        route = RouteFactory()
+        url = reverse_lazy("service:async-routes-detail", args=[route.id])
+
+        response = self.client.get(url)
+        cached_response = self.client.get(url)
+        not_modified_response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        create_response = self.client.post(reverse_lazy("service:async-airports-list"), {"name": "Airport"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == route.id
+        assert (response["X-Cache"], cached_response["X-Cache"]) == ("MISS", "HIT")
+        assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert create_response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+        assert Airport.objects.filter(name="Airport").count() == 0
+
+    def test_async_orders_should_belong_to_user(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        order = TicketFactory(order=OrderFactory(user=user)).order
+        other_order = TicketFactory().order
+
+        response = self.client.get(reverse_lazy("service:async-orders-list"))
+        other_response = self.client.get(reverse_lazy("service:async-orders-detail", args=[other_order.id]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [order_data["id"] for order_data in response.data["results"]] == [order.id]
+        assert other_response.status_code == status.HTTP_404_NOT_FOUND
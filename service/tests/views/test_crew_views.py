@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse_lazy
+from rest_framework.test import APIClient
+
+from service.choices import CrewTypeChoices, FlightCrewPositionChoices, CabinCrewPositionChoices
+from service.models import Crew
+
+from ..factories import UserFactory, CrewFactory, FlightFactory
+
+
+CREW_VIEW_URL = reverse_lazy("service:crew-list")
+
+@pytest.mark.django_db
+class TestCrewViews:
+    def setup_method(self):
+        self.client = APIClient()
+
+    def test_crew_should_be_paginated_by_name(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        crew = [
+            CrewFactory(first_name=first_name, last_name=last_name)
+            for first_name, last_name in (("Mia", "Stone"), ("Adam", "Wolf"), ("Adam", "Baker"), ("Zoe", "Hart"))
+        ]
+
+        response = self.client.get(CREW_VIEW_URL, {"pagination": "keyset", "size": 3})
+        next_response = self.client.get(response.data["next"])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            crew_person["id"] for crew_person in response.data["results"] + next_response.data["results"]
+        ] == [crew[2].id, crew[1].id, crew[0].id, crew[3].id]
+        assert next_response.data["next"] is None
+
+    def test_crew_should_be_searched_and_filtered(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        john = CrewFactory(
+            first_name="John",
+            last_name="Smith",
+            crew_type=CrewTypeChoices.FLIGHT_CREW,
+            position=FlightCrewPositionChoices.CAPTAIN,
+        )
+        jones = CrewFactory(
+            first_name="Anna",
+            last_name="Jones",
+            crew_type=CrewTypeChoices.CABIN_CREW,
+            position=CabinCrewPositionChoices.FLIGHT_ATTENDANT,
+        )
+        brown = CrewFactory(first_name="John", last_name="Brown", crew_type=CrewTypeChoices.CABIN_CREW)
+
+        def search(**params):
+            response = self.client.get(CREW_VIEW_URL, {"pagination": "keyset", **params})
+            return {crew_person["id"] for crew_person in response.data["results"]}
+
+        assert len(search(search="jo")) == 3
+        assert search(search="john sm") == {john.id}
+        assert search(search="jo", crew_type=CrewTypeChoices.CABIN_CREW) == {jones.id, brown.id}
+        assert search(search="jo", position=FlightCrewPositionChoices.CAPTAIN) == {john.id}
+
+    def test_crew_should_be_created_by_admin_only(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        crew_data = {
+            "first_name": "John",
+            "last_name": "Smith",
+            "crew_type": CrewTypeChoices.FLIGHT_CREW,
+            "position": FlightCrewPositionChoices.CAPTAIN,
+        }
+
+        response = self.client.post(CREW_VIEW_URL, crew_data)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        self.client.force_authenticate(UserFactory(admin=True))
+
+        invalid_response = self.client.post(
+            CREW_VIEW_URL,
+            {**crew_data, "position": CabinCrewPositionChoices.FLIGHT_ATTENDANT}
+        )
+        response = self.client.post(CREW_VIEW_URL, crew_data)
+
+        assert invalid_response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Crew.objects.filter(first_name="John", last_name="Smith").count() == 1
+
+    def test_crew_schedule_should_list_flights_within_window(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        crew_person = CrewFactory()
+        now = timezone.now()
+        flights = [
+            FlightFactory(
+                crew=[crew_person],
+                departure_time=now + timedelta(days=days),
+                arrival_time=now + timedelta(days=days, hours=2),
+            )
+            for days in (40, 1, 10, -5)
+        ]
+        FlightFactory(departure_time=now + timedelta(days=2), arrival_time=now + timedelta(days=2, hours=2))
+        url = reverse_lazy("service:crew-schedule", args=[crew_person.id])
+
+        response = self.client.get(url)
+        wide_response = self.client.get(url, {"after": now - timedelta(days=10), "before": now + timedelta(days=50)})
+        invalid_response = self.client.get(url, {"after": now, "before": now - timedelta(days=1)})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [flight["id"] for flight in response.data] == [flights[1].id, flights[2].id]
+        assert [flight["id"] for flight in wide_response.data] == [
+            flights[3].id, flights[1].id, flights[2].id, flights[0].id
+        ]
+        assert invalid_response.status_code == status.HTTP_400_BAD_REQUEST
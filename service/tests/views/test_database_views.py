@@ -0,0 +1,102 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.conf import settings as django_settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse_lazy
+from rest_framework.test import APIClient
+
+from app.databases import ReplicaRouter, get_read_replica, is_pinned_to_primary, reads_from
+from service import caches
+from service.caches import get_catalog_versions
+from service.models import Airport, Order
+
+from ..factories import UserFactory, AirportFactory, FlightFactory
+
+
+@pytest.mark.django_db
+class TestDatabaseViews:
+    def setup_method(self):
+        self.client = APIClient()
+
+    def test_reads_should_go_to_replica_unless_recently_changed_or_pinned(self, settings):
+        settings.DATABASE_REPLICAS = ["replica_1"]
+        user = UserFactory()
+        pinned_user = UserFactory()
+        Order.objects.create(user=pinned_user)
+        router = ReplicaRouter()
+
+        assert get_read_replica(user, time.time() - 60) == "replica_1"
+        assert get_read_replica(user, time.time()) is None
+        assert get_read_replica(pinned_user, time.time() - 60) is None
+
+        with reads_from("replica_1"):
+            assert router.db_for_read(Airport) == "replica_1"
+            assert router.db_for_write(Airport) == "default"
+
+        assert router.db_for_read(Airport) == "default"
+        assert not router.allow_migrate("replica_1", "service")
+
+    def test_replica_should_be_picked_by_exact_change_time(self, monkeypatch):
+        self.client.force_authenticate(UserFactory())
+        AirportFactory()
+        changes = []
+        monkeypatch.setattr(caches, "get_read_replica", lambda user, changed_at: changes.append(changed_at))
+
+        self.client.get(reverse_lazy("service:airports-list"))
+
+        assert changes == [get_catalog_versions([Airport])[0] / 10 ** 9]
+
+    def test_order_should_pin_user_to_primary(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+        flight = FlightFactory()
+
+        response = self.client.post(
+            reverse_lazy("service:orders-list"),
+            data={"tickets": [{"row": 1, "seat": 1, "flight": flight.id}]},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert is_pinned_to_primary(user)
+
+    def test_database_pools_should_be_staff_only(self):
+        url = reverse_lazy("service:database-pools-list")
+
+        self.client.force_authenticate(UserFactory())
+        user_response = self.client.get(url)
+
+        self.client.force_authenticate(UserFactory(admin=True))
+        response = self.client.get(url)
+
+        assert user_response.status_code == status.HTTP_403_FORBIDDEN
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data) == set(django_settings.DATABASES)
+
+
+@pytest.mark.skipif(not django_settings.DATABASE_REPLICAS, reason="POSTGRES_REPLICA_HOSTS is not set.")
+@pytest.mark.django_db(transaction=True, databases="__all__")
+class TestReplicaReads:
+    def test_list_should_be_read_from_replica(self, settings):
+        settings.DATABASE_REPLICA_LAG = timedelta(0)
+        client = APIClient()
+        client.force_authenticate(UserFactory())
+        airport = AirportFactory()
+        replica = connections[django_settings.DATABASE_REPLICAS[0]]
+
+        for _ in range(50):
+            if Airport.objects.using(replica.alias).filter(pk=airport.pk).exists():
+                break
+
+            time.sleep(0.1)
+
+        with CaptureQueriesContext(replica) as replica_queries:
+            response = client.get(reverse_lazy("service:airports-list"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [airport_data["id"] for airport_data in response.data] == [airport.id]
+        assert replica_queries
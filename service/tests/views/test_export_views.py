@@ -0,0 +1,157 @@
+import csv
+import io
+import json
+
+import pyarrow
+import pyarrow.ipc
+import pyarrow.parquet
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command, CommandError
+from rest_framework import status
+from rest_framework.reverse import reverse_lazy
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from ..factories import UserFactory, AirportFactory, RouteFactory, FlightFactory, TicketFactory, CrewFactory
+
+
+FLIGHTS_EXPORT_URL = reverse_lazy("service:exports-flights")
+TICKETS_EXPORT_URL = reverse_lazy("service:exports-tickets")
+ORDERS_EXPORT_URL = reverse_lazy("service:exports-orders")
+CREW_EXPORT_URL = reverse_lazy("service:exports-crew")
+
+
+@pytest.mark.django_db
+class TestExportViews:
+    def setup_method(self):
+        self.client = APIClient()
+
+    def create_flights(self):
+        airport = AirportFactory()
+        inside = FlightFactory(
+            route=RouteFactory(source=airport),
+            departure_time="2030-05-01T10:00:00",
+            arrival_time="2030-05-01T12:00:00",
+        )
+        FlightFactory(
+            route=RouteFactory(source=airport),
+            departure_time="2030-05-03T10:00:00",
+            arrival_time="2030-05-03T12:00:00",
+        )
+        FlightFactory(departure_time="2030-05-01T10:00:00", arrival_time="2030-05-01T12:00:00")
+
+        return airport, inside
+
+    def test_flights_should_be_exported_as_ndjson(self):
+        self.client.force_authenticate(UserFactory(admin=True))
+        airport, flight = self.create_flights()
+
+        response = self.client.get(
+            FLIGHTS_EXPORT_URL,
+            {"airport": airport.id, "after": "2030-05-01", "before": "2030-05-02"}
+        )
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert [row["id"] for row in rows] == [flight.id]
+        assert rows[0]["source"] == airport.name
+        assert rows[0]["departure_time"] == "2030-05-01T10:00:00"
+
+    def test_export_should_stream_asynchronously_under_asgi(self):
+        admin = UserFactory(admin=True)
+        airport, flight = self.create_flights()
+        token = RefreshToken.for_user(admin).access_token
+
+        async def export():
+            response = await AsyncClient().get(
+                FLIGHTS_EXPORT_URL,
+                {"airport": airport.id, "after": "2030-05-01", "before": "2030-05-02"},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+            return response, b"".join([chunk async for chunk in response.streaming_content])
+
+        response, content = async_to_sync(export)()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        assert [json.loads(line)["id"] for line in content.decode().splitlines()] == [flight.id]
+
+    def test_tickets_should_be_exported_as_csv(self):
+        self.client.force_authenticate(UserFactory(admin=True))
+        airport, flight = self.create_flights()
+        ticket = TicketFactory(flight=flight)
+        TicketFactory()
+
+        response = self.client.get(TICKETS_EXPORT_URL, {"airport": airport.id, "output": "csv"})
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Disposition"] == 'attachment; filename="tickets.csv"'
+        assert [(row["id"], row["order"], row["flight"]) for row in rows] == [
+            (str(ticket.id), str(ticket.order_id), str(flight.id))
+        ]
+
+    def test_orders_export_should_be_staff_only(self):
+        self.client.force_authenticate(UserFactory())
+
+        response = self.client.get(ORDERS_EXPORT_URL)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_export_command_should_write_orders(self):
+        airport, flight = self.create_flights()
+        ticket = TicketFactory(flight=flight)
+        TicketFactory(order=ticket.order, flight=flight)
+        TicketFactory()
+        stdout = io.StringIO()
+
+        call_command("export_data", "orders", "--airport", str(airport.id), stdout=stdout)
+
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        assert [(row["id"], row["user"], row["tickets"]) for row in rows] == [
+            (ticket.order_id, ticket.order.user_id, 2)
+        ]
+
+    def test_flights_should_be_exported_as_parquet(self):
+        self.client.force_authenticate(UserFactory(admin=True))
+        airport, flight = self.create_flights()
+
+        response = self.client.get(FLIGHTS_EXPORT_URL, {"airport": airport.id, "output": "parquet"})
+        table = pyarrow.parquet.read_table(io.BytesIO(b"".join(response.streaming_content)))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Disposition"] == 'attachment; filename="flights.parquet"'
+        assert table.num_rows == 2
+        assert table.schema.field("departure_time").type == pyarrow.timestamp("us")
+        assert pyarrow.types.is_dictionary(table.schema.field("source").type)
+        assert table.column("source").to_pylist() == [airport.name, airport.name]
+        assert table.column("id").to_pylist()[0] == flight.id
+
+    def test_crew_should_be_exported_as_arrow_with_dictionary_columns(self):
+        self.client.force_authenticate(UserFactory(admin=True))
+        crew = CrewFactory.create_batch(3)
+
+        response = self.client.get(CREW_EXPORT_URL, {"output": "arrow"})
+        table = pyarrow.ipc.open_stream(b"".join(response.streaming_content)).read_all()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/vnd.apache.arrow.stream"
+        assert pyarrow.types.is_dictionary(table.schema.field("crew_type").type)
+        assert pyarrow.types.is_dictionary(table.schema.field("position").type)
+        assert table.column("position").to_pylist() == [member.position for member in crew]
+
+    def test_export_command_should_require_file_for_binary_output(self, tmp_path):
+        CrewFactory()
+
+        with pytest.raises(CommandError):
+            call_command("export_data", "crew", "--output", "parquet")
+
+        path = tmp_path / "crew.parquet"
+        call_command("export_data", "crew", "--output", "parquet", "--file", str(path))
+
+        assert pyarrow.parquet.read_table(path).num_rows == 1
@@ -1,8 +1,17 @@
+import asyncio
+import json
+
 import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.reverse import reverse_lazy
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from ..factories import (
     UserFactory,
@@ -10,11 +19,15 @@ from ..factories import (
     AirplaneFactory,
     CrewFactory,
     RouteFactory,
+    TicketFactory,
+    AirportFactory,
 )
 from ...serializers import FlightReadSerializer
 
+from service import itineraries, schedules
 from service.choices import CrewTypeChoices
-from service.models import Flight
+from service.models import Flight, Ticket, SeatHold
+from service.seat_maps import build_seat_map, get_seat_map_cache_key, get_seat_map_version
 
 FLIGHT_VIEW_LIST_URL = reverse_lazy("service:flights-list")
 
@@ -188,3 +201,563 @@ class TestPublicFlightViews:
         assert len(response.data["results"]) == 5
 
 
+    def test_flight_seat_map_should_show_free_and_occupied_seats(self):
+        airplane = AirplaneFactory(rows=2, seats_in_row=3)
+        flight = FlightFactory(airplane=airplane)
+
+        TicketFactory(flight=flight, row=1, seat=2)
+        TicketFactory(flight=flight, row=2, seat=3)
+
+        url = reverse_lazy("service:flights-seat-map", args=[flight.id])
+        response = self.client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["seats_total"] == 6
+        assert response.data["seats_free"] == 4
+        assert response.data["seats_occupied"] == 2
+        assert response.data["layout"] == [
+            {"row": 1, "free": [1, 3], "occupied": [2]},
+            {"row": 2, "free": [1, 2], "occupied": [3]},
+        ]
+
+
+    def test_flight_seat_map_should_follow_ticket_changes(self, django_capture_on_commit_callbacks):
+        airplane = AirplaneFactory(rows=2, seats_in_row=2)
+        flight = FlightFactory(airplane=airplane)
+        url = reverse_lazy("service:flights-seat-map", args=[flight.id])
+
+        self.client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ticket = TicketFactory(flight=flight, row=2, seat=1)
+
+        response = self.client.get(url)
+
+        assert response.data["layout"][1] == {"row": 2, "free": [2], "occupied": [1]}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Ticket.objects.filter(id=ticket.id).delete()
+
+        response = self.client.get(url)
+
+        assert response.data["seats_occupied"] == 0
+
+
+    def test_flight_seat_map_built_before_booking_commit_should_not_be_served(self, django_capture_on_commit_callbacks):
+        flight = FlightFactory(airplane=AirplaneFactory(rows=2, seats_in_row=2))
+        url = reverse_lazy("service:flights-seat-map", args=[flight.id])
+
+        # A reader racing the booking: version read and map built before the commit, stored after it.
+        version = get_seat_map_version(flight.id)
+        stale_map = build_seat_map(flight)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TicketFactory(flight=flight, row=1, seat=1)
+
+        cache.set(
+            get_seat_map_cache_key(flight.id, version),
+            (stale_map.rows, stale_map.seats_in_row, bytes(stale_map.bits)),
+        )
+        response = self.client.get(url)
+
+        assert response.data["seats_occupied"] == 1
+
+
+    def test_flight_list_should_be_filtered_by_min_seats(self):
+        flight_1 = FlightFactory(airplane=AirplaneFactory(rows=2, seats_in_row=2))
+        flight_2 = FlightFactory(airplane=AirplaneFactory(rows=10, seats_in_row=2))
+
+        TicketFactory(flight=flight_1, row=1, seat=1)
+        TicketFactory(flight=flight_2, row=1, seat=1)
+
+        response = self.client.get(FLIGHT_VIEW_LIST_URL, {"min_seats": 4})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [flight["id"] for flight in response.data["results"]] == [flight_2.id]
+        assert response.data["results"][0]["tickets_sold"] == 1
+        assert response.data["results"][0]["seats_available"] == 19
+
+
+    def test_flight_list_should_be_filtered_by_route_and_departure_date(self):
+        berlin = AirportFactory(city="Berlin")
+        paris = AirportFactory(city="Paris")
+        route = RouteFactory(source=berlin, destination=paris)
+
+        flight = FlightFactory(
+            route=route,
+            departure_time="2030-05-01T10:00:00",
+            arrival_time="2030-05-01T12:00:00",
+        )
+        FlightFactory(
+            route=route,
+            departure_time="2030-05-02T10:00:00",
+            arrival_time="2030-05-02T12:00:00",
+        )
+        FlightFactory(
+            route=RouteFactory(source=paris, destination=berlin),
+            departure_time="2030-05-01T10:00:00",
+            arrival_time="2030-05-01T12:00:00",
+        )
+
+        response = self.client.get(
+            FLIGHT_VIEW_LIST_URL,
+            {
+                "source_city": "berlin",
+                "destination": paris.id,
+                "departure_after": "2030-05-01",
+                "departure_before": "2030-05-01",
+            }
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["id"] for result in response.data["results"]] == [flight.id]
+
+
+    def test_flight_itineraries_should_connect_flights(self):
+        airport_a, airport_b, airport_c = AirportFactory.create_batch(3)
+
+        direct = FlightFactory(
+            route=RouteFactory(source=airport_a, destination=airport_c, distance=500),
+            departure_time="2030-05-01T08:00:00",
+            arrival_time="2030-05-01T13:00:00",
+        )
+        first_leg = FlightFactory(
+            route=RouteFactory(source=airport_a, destination=airport_b, distance=100),
+            departure_time="2030-05-01T08:00:00",
+            arrival_time="2030-05-01T09:00:00",
+        )
+        route_b_c = RouteFactory(source=airport_b, destination=airport_c, distance=200)
+        FlightFactory(
+            route=route_b_c,
+            departure_time="2030-05-01T09:10:00",
+            arrival_time="2030-05-01T10:00:00",
+        )
+        second_leg = FlightFactory(
+            route=route_b_c,
+            departure_time="2030-05-01T10:00:00",
+            arrival_time="2030-05-01T11:00:00",
+        )
+
+        url = reverse_lazy("service:flights-itineraries")
+        response = self.client.get(
+            url,
+            {
+                "source": airport_a.id,
+                "destination": airport_c.id,
+                "departure_after": "2030-05-01",
+                "departure_before": "2030-05-01",
+                "min_connection": 30,
+            }
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            [leg["id"] for leg in itinerary["legs"]] for itinerary in response.data
+        ] == [[first_leg.id, second_leg.id], [direct.id]]
+        assert response.data[0]["distance"] == 300
+        assert response.data[0]["duration_minutes"] == 180
+        assert response["X-Itineraries-Truncated"] == "false"
+
+
+    def test_flight_itineraries_should_limit_departure_window(self):
+        airport_a, airport_b = AirportFactory.create_batch(2)
+
+        response = self.client.get(
+            reverse_lazy("service:flights-itineraries"),
+            {
+                "source": airport_a.id,
+                "destination": airport_b.id,
+                "departure_after": "2030-05-01",
+                "departure_before": "2032-05-01",
+            }
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+    def test_flight_itineraries_should_keep_partial_journeys_arriving_first(self, monkeypatch):
+        monkeypatch.setattr(itineraries, "ITINERARY_MAX_PARTIAL_JOURNEYS", 1)
+        airport_a, airport_b, airport_c = AirportFactory.create_batch(3)
+        route_a_b = RouteFactory(source=airport_a, destination=airport_b)
+        FlightFactory(
+            route=route_a_b,
+            departure_time="2030-05-01T07:00:00",
+            arrival_time="2030-05-01T10:00:00",
+        )
+        first_leg = FlightFactory(
+            route=route_a_b,
+            departure_time="2030-05-01T08:00:00",
+            arrival_time="2030-05-01T09:00:00",
+        )
+        second_leg = FlightFactory(
+            route=RouteFactory(source=airport_b, destination=airport_c),
+            departure_time="2030-05-01T10:00:00",
+            arrival_time="2030-05-01T11:00:00",
+        )
+
+        response = self.client.get(
+            reverse_lazy("service:flights-itineraries"),
+            {
+                "source": airport_a.id,
+                "destination": airport_c.id,
+                "departure_after": "2030-05-01",
+                "departure_before": "2030-05-01",
+                "min_connection": 30,
+            }
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [
+            [leg["id"] for leg in itinerary["legs"]] for itinerary in response.data
+        ] == [[first_leg.id, second_leg.id]]
+        assert response["X-Itineraries-Truncated"] == "true"
+
+
+    def test_flight_detail_should_answer_conditional_requests(self, django_capture_on_commit_callbacks):
+        flight = FlightFactory(airplane=AirplaneFactory(rows=2, seats_in_row=2))
+        url = reverse_lazy("service:flights-detail", args=[flight.id])
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        not_modified_response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            TicketFactory(flight=flight, row=1, seat=1)
+
+        changed_response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "Last-Modified" in response
+        assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert changed_response.status_code == status.HTTP_200_OK
+        assert changed_response["ETag"] != etag
+        assert changed_response.data["tickets_sold"] == 1
+
+
+    def test_flight_view_should_support_keyset_pagination(self):
+        FlightFactory.create_batch(7, departure_time="2030-05-01T10:00:00")
+        expected_ids = list(Flight.objects.order_by("departure_time", "id").values_list("id", flat=True))
+
+        response = self.client.get(
+            FLIGHT_VIEW_LIST_URL,
+            {"pagination": "keyset", "size": 3, "count": "approximate"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "approximate_count" in response.data
+        assert "count" not in response.data
+
+        ids = [flight["id"] for flight in response.data["results"]]
+
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            ids += [flight["id"] for flight in response.data["results"]]
+
+        assert ids == expected_ids
+
+
+    def test_flight_view_should_reject_invalid_cursor(self):
+        response = self.client.get(FLIGHT_VIEW_LIST_URL, {"cursor": "invalid"})
+        mistyped_response = self.client.get(FLIGHT_VIEW_LIST_URL, {"cursor": "WyJ4IiwgMV0="})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert mistyped_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+    def test_flight_seats_should_be_held_for_one_user_only(self):
+        flight = FlightFactory(airplane=AirplaneFactory(rows=5, seats_in_row=4))
+        url = reverse_lazy("service:flights-holds", args=[flight.id])
+        seats = {"seats": [{"row": 1, "seat": 1}, {"row": 1, "seat": 2}]}
+
+        response = self.client.post(url, seats, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert [(hold["row"], hold["seat"]) for hold in response.data] == [(1, 1), (1, 2)]
+
+        self.client.force_authenticate(UserFactory())
+        response = self.client.post(
+            url,
+            {"seats": [{"row": 1, "seat": 2}, {"row": 1, "seat": 3}]},
+            format="json"
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["seats"] == [{"flight": flight.id, "row": 1, "seat": 2}]
+        assert SeatHold.objects.filter(flight=flight).count() == 2
+
+
+    def test_flight_seat_holds_should_be_released(self):
+        flight = FlightFactory(airplane=AirplaneFactory(rows=5, seats_in_row=4))
+        url = reverse_lazy("service:flights-holds", args=[flight.id])
+
+        self.client.post(url, {"seats": [{"row": 2, "seat": 2}]}, format="json")
+        response = self.client.delete(url)
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not SeatHold.objects.exists()
+
+
+    def test_flight_schedule_should_create_recurring_flights(self):
+        airplane = AirplaneFactory(pilots_capacity=1, personal_capacity=1)
+        crew = [
+            CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW),
+            CrewFactory(crew_type=CrewTypeChoices.CABIN_CREW),
+        ]
+        existing = FlightFactory(
+            airplane=airplane,
+            departure_time="2030-01-02T09:00:00",
+            arrival_time="2030-01-02T11:00:00",
+        )
+        schedule = {
+            "route": RouteFactory().pk,
+            "airplane": airplane.pk,
+            "crew": [crew_person.pk for crew_person in crew],
+            "start_date": "2030-01-01",
+            "end_date": "2030-01-07",
+            "weekdays": [2, 3, 4],
+            "departure_times": ["10:00", "18:00"],
+            "duration": "01:30:00",
+        }
+        url = reverse_lazy("service:flights-schedule")
+
+        response = self.client.post(url, schedule, format="json")
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert [conflict["flight"] for conflict in response.data["conflicts"]] == [existing.id]
+        assert Flight.objects.count() == 1
+
+        response = self.client.post(url, {**schedule, "skip_conflicts": True}, format="json")
+        flights = Flight.objects.exclude(id=existing.id).order_by("departure_time")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data["flights"]) == 5
+        assert len(response.data["conflicts"]) == 1
+        assert [str(flight.departure_time) for flight in flights[:2]] == [
+            "2030-01-01 10:00:00",
+            "2030-01-01 18:00:00",
+        ]
+        assert set(flights[0].crew.values_list("id", flat=True)) == {crew_person.id for crew_person in crew}
+
+
+    @pytest.mark.parametrize("skip_conflicts, status_code, created", [
+        (False, status.HTTP_409_CONFLICT, 0),
+        (True, status.HTTP_201_CREATED, 1),
+    ])
+    def test_flight_schedule_should_report_flight_saved_after_check(self, monkeypatch, skip_conflicts, status_code, created):
+        airplane = AirplaneFactory(pilots_capacity=1, personal_capacity=0)
+        existing = FlightFactory(
+            airplane=airplane,
+            departure_time="2030-01-01T10:30:00",
+            arrival_time="2030-01-01T11:00:00",
+        )
+        checks = []
+        check_conflicts = schedules.airplane_conflicts
+
+        # The first check runs before `existing` is saved by a concurrent request.
+        def airplane_conflicts(airplane, slots):
+            checks.append(slots)
+
+            return check_conflicts(airplane, slots) if len(checks) > 1 else []
+
+        monkeypatch.setattr(schedules, "airplane_conflicts", airplane_conflicts)
+        schedule = {
+            "route": RouteFactory().pk,
+            "airplane": airplane.pk,
+            "crew": [CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW).pk],
+            "start_date": "2030-01-01",
+            "end_date": "2030-01-02",
+            "weekdays": list(range(1, 8)),
+            "departure_times": ["10:00"],
+            "duration": "01:00:00",
+            "skip_conflicts": skip_conflicts,
+        }
+
+        response = self.client.post(reverse_lazy("service:flights-schedule"), schedule, format="json")
+
+        assert response.status_code == status_code
+        assert [conflict["flight"] for conflict in response.data["conflicts"]] == [existing.id]
+        assert Flight.objects.exclude(id=existing.id).count() == created
+
+
+    def test_flight_schedule_should_validate_crew_once(self):
+        airplane = AirplaneFactory(pilots_capacity=2, personal_capacity=0)
+        schedule = {
+            "route": RouteFactory().pk,
+            "airplane": airplane.pk,
+            "crew": [CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW).pk],
+            "start_date": "2030-01-01",
+            "end_date": "2030-01-31",
+            "weekdays": [1],
+            "departure_times": ["10:00"],
+            "duration": "01:00:00",
+        }
+
+        response = self.client.post(reverse_lazy("service:flights-schedule"), schedule, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Flight.objects.exists()
+
+
+    def test_flight_should_not_overlap_flights_of_the_airplane(self):
+        airplane = AirplaneFactory(pilots_capacity=1, personal_capacity=0)
+        FlightFactory(
+            airplane=airplane,
+            departure_time="2030-01-01T10:00:00",
+            arrival_time="2030-01-01T12:00:00",
+        )
+        flight_data = {
+            "route": RouteFactory().pk,
+            "airplane": airplane.pk,
+            "crew": [CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW).pk],
+            "departure_time": "2030-01-01T11:30:00",
+            "arrival_time": "2030-01-01T13:00:00",
+        }
+
+        response = self.client.post(FLIGHT_VIEW_LIST_URL, flight_data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["non_field_errors"] == ["The airplane is assigned to another flight at this time."]
+
+        response = self.client.post(FLIGHT_VIEW_LIST_URL, {**flight_data, "departure_time": "2030-01-01T12:00:00"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+    def test_flight_crew_should_not_be_rostered_on_overlapping_flights(self):
+        airplane = AirplaneFactory(pilots_capacity=1, personal_capacity=0)
+        captain = CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW)
+        busy = FlightFactory(
+            departure_time="2030-01-01T10:00:00",
+            arrival_time="2030-01-01T12:00:00",
+            crew=[captain],
+        )
+        flight_data = {
+            "route": RouteFactory().pk,
+            "airplane": airplane.pk,
+            "crew": [captain.pk],
+            "departure_time": "2030-01-01T11:00:00",
+            "arrival_time": "2030-01-01T13:00:00",
+        }
+
+        response = self.client.post(FLIGHT_VIEW_LIST_URL, flight_data)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["non_field_errors"] == [
+            f"Crew member {captain.id} is rostered on overlapping flights: {busy.id}."
+        ]
+
+
+    def test_flight_crew_should_respect_duty_limits(self):
+        airplane = AirplaneFactory(pilots_capacity=1, personal_capacity=0)
+        captain = CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW)
+
+        for day in range(1, 6):
+            FlightFactory(
+                departure_time=f"2030-01-0{day}T00:00:00",
+                arrival_time=f"2030-01-0{day}T12:00:00",
+                crew=[captain],
+            )
+
+        response = self.client.post(FLIGHT_VIEW_LIST_URL, {
+            "route": RouteFactory().pk,
+            "airplane": airplane.pk,
+            "crew": [captain.pk],
+            "departure_time": "2030-01-06T00:00:00",
+            "arrival_time": "2030-01-06T01:00:00",
+        })
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "within 7 days, more than 60" in response.data["non_field_errors"][0]
+
+
+    def test_flight_available_crew_should_exclude_busy_crew(self):
+        flight = FlightFactory(
+            departure_time="2030-01-01T10:00:00",
+            arrival_time="2030-01-01T12:00:00",
+            crew=[],
+        )
+        free = CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW, position="captain")
+        busy = CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW, position="captain")
+        CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW, position="navigator")
+        FlightFactory(departure_time="2030-01-01T11:00:00", arrival_time="2030-01-01T14:00:00", crew=[busy])
+        url = reverse_lazy("service:flights-available-crew", args=[flight.id])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"position": "captain"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [crew["id"] for crew in response.data] == [free.id]
+        assert response.data[0]["duty_hours_7_days"] == 0
+        assert len([query for query in queries if "service_crew" in query["sql"]]) == 1
+
+    def test_flight_available_crew_should_count_duty_after_departure(self):
+        flight = FlightFactory(
+            departure_time="2030-01-01T10:00:00",
+            arrival_time="2030-01-01T12:00:00",
+            crew=[],
+        )
+        rested = CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW, position="captain")
+        overworked = CrewFactory(crew_type=CrewTypeChoices.FLIGHT_CREW, position="captain")
+        FlightFactory(departure_time="2030-01-03T00:00:00", arrival_time="2030-01-03T10:00:00", crew=[rested])
+        FlightFactory(departure_time="2030-01-03T00:00:00", arrival_time="2030-01-05T11:00:00", crew=[overworked])
+        url = reverse_lazy("service:flights-available-crew", args=[flight.id])
+
+        response = self.client.get(url, {"position": "captain"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [crew["id"] for crew in response.data] == [rested.id]
+        assert response.data[0]["duty_hours_7_days"] == 10
+
+
+@pytest.mark.django_db(transaction=True)
+class TestFlightSeatEvents:
+    def test_seat_events_should_stream_snapshot_and_seat_changes(self):
+        user = UserFactory()
+        flight = FlightFactory()
+        token = RefreshToken.for_user(user).access_token
+        url = reverse_lazy("service:flights-seat-events", args=[flight.id])
+        # A cached map that missed a booking must not become the snapshot.
+        stale_map = build_seat_map(flight)
+        booked = TicketFactory(flight=flight)
+        cache.set(
+            get_seat_map_cache_key(flight.id, get_seat_map_version(flight.id)),
+            (stale_map.rows, stale_map.seats_in_row, bytes(stale_map.bits)),
+        )
+
+        async def read_events():
+            response = await AsyncClient().get(
+                url,
+                headers={"Authorization": f"Bearer {token}", "Accept": "text/event-stream"},
+            )
+            stream = aiter(response.streaming_content)
+
+            try:
+                snapshot = (await anext(stream)).decode()
+                ticket = await sync_to_async(TicketFactory)(flight=flight)
+                taken = (await asyncio.wait_for(anext(stream), 5)).decode()
+                await sync_to_async(ticket.delete)()
+                released = (await asyncio.wait_for(anext(stream), 5)).decode()
+            finally:
+                await stream.aclose()
+
+            return response, snapshot, ticket, taken, released
+
+        response, snapshot, ticket, taken, released = async_to_sync(read_events)()
+        seat = {"row": ticket.row, "seat": ticket.seat}
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/event-stream"
+        assert snapshot.startswith("retry: ") and "event: snapshot\n" in snapshot
+        assert '"seats_occupied": 1' in snapshot
+        assert seat != {"row": booked.row, "seat": booked.seat}
+        assert taken == f"event: seat\ndata: {json.dumps({**seat, 'taken': True})}\n\n"
+        assert released == f"event: seat\ndata: {json.dumps({**seat, 'taken': False})}\n\n"
+
+    def test_seat_events_should_need_asgi_server(self):
+        client = APIClient()
+        client.force_authenticate(UserFactory())
+
+        response = client.get(reverse_lazy("service:flights-seat-events", args=[FlightFactory().id]))
+
+        assert response.status_code == status.HTTP_501_NOT_IMPLEMENTED
@@ -4,7 +4,7 @@ from rest_framework.reverse import reverse_lazy
 
 from rest_framework.test import APIClient
 
-from ..factories import UserFactory
+from ..factories import UserFactory, ManufacturerFactory, AirplaneFactory
 
 from service.views import ManufacturerRetrieveSerializer
 from ...models import Manufacturer
@@ -33,6 +33,37 @@ class TestPrivateManufacturerViews:
         assert serializer.data["airplanes"] == []
 
 
+    def test_manufacturer_list_should_count_airplanes_in_sql(self, django_assert_num_queries):
+        user = UserFactory(admin=True)
+        self.client.force_authenticate(user)
+
+        manufacturer = ManufacturerFactory()
+        AirplaneFactory.create_batch(3, manufacturer=manufacturer)
+
+        with django_assert_num_queries(1):
+            response = self.client.get(MANUFACTURER_VIEW_URL)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["airplanes_count"] for item in response.data] == [3]
+
+    def test_manufacturer_detail_should_page_airplanes(self):
+        user = UserFactory(admin=True)
+        self.client.force_authenticate(user)
+
+        manufacturer = ManufacturerFactory()
+        airplanes = AirplaneFactory.create_batch(5, manufacturer=manufacturer)
+        url = reverse_lazy("service:manufacturers-detail", args=[manufacturer.id])
+
+        response = self.client.get(url, {"airplanes_limit": 2, "airplanes_offset": 1})
+        invalid_response = self.client.get(url, {"airplanes_limit": 0})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["airplanes_count"] == 5
+        assert [airplane["id"] for airplane in response.data["airplanes"]] == [
+            airplane.id for airplane in airplanes[1:3]
+        ]
+        assert invalid_response.status_code == status.HTTP_400_BAD_REQUEST
+
 @pytest.mark.django_db
 class TestPublicManufacturerViews:
     def setup_method(self):
@@ -1,12 +1,15 @@
 import pytest
+from django.core.cache import cache
+from django.db import IntegrityError
 from rest_framework import status
 from rest_framework.reverse import reverse_lazy
 from rest_framework.test import APIClient
 
-from service.models import Ticket, Order
+from service.models import Ticket, Order, SeatHold
+from service.seat_maps import build_seat_map, get_seat_map_cache_key, get_seat_map_version
 from service.serializers import OrderReadSerializer
 
-from ..factories import UserFactory, FlightFactory, AirplaneFactory
+from ..factories import UserFactory, FlightFactory, AirplaneFactory, TicketFactory
 
 
 ORDER_LIST_VIEW_URL = reverse_lazy("service:orders-list")
@@ -139,3 +142,197 @@ class TestPublicOrderViews:
         assert ticket.seat == 5
         assert ticket.flight.id == flight.id
         assert ticket.order.id == created_order_id
+
+    def test_order_should_maintain_flight_tickets_sold(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        airplane = AirplaneFactory(rows=10, seats_in_row=6)
+        flight = FlightFactory(airplane=airplane)
+
+        order_data = {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": flight.id},
+                {"row": 1, "seat": 2, "flight": flight.id},
+            ]
+        }
+
+        response = self.client.post(ORDER_LIST_VIEW_URL, data=order_data, format='json')
+        flight.refresh_from_db()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert flight.tickets_sold == 2
+        assert flight.seats_available == 58
+
+        url = reverse_lazy("service:orders-detail", args=[response.data["id"]])
+        response = self.client.delete(url)
+        flight.refresh_from_db()
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert flight.tickets_sold == 0
+
+    def test_order_should_reject_duplicated_seats(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        flight = FlightFactory(airplane=AirplaneFactory(rows=10, seats_in_row=6))
+
+        order_data = {
+            "tickets": [
+                {"row": 1, "seat": 1, "flight": flight.id},
+                {"row": 1, "seat": 1, "flight": flight.id},
+            ]
+        }
+
+        response = self.client.post(ORDER_LIST_VIEW_URL, data=order_data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["tickets"] == [f"Seat 1-1 on flight {flight.id} is requested more than once."]
+        assert not Order.objects.exists()
+
+    def test_order_should_report_already_booked_seats(self):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        flight = FlightFactory(airplane=AirplaneFactory(rows=10, seats_in_row=6))
+        TicketFactory(flight=flight, row=2, seat=3)
+
+        order_data = {
+            "tickets": [
+                {"row": 2, "seat": 2, "flight": flight.id},
+                {"row": 2, "seat": 3, "flight": flight.id},
+            ]
+        }
+
+        response = self.client.post(ORDER_LIST_VIEW_URL, data=order_data, format='json')
+        flight.refresh_from_db()
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["seats"] == [{"flight": flight.id, "row": 2, "seat": 3}]
+        assert Order.objects.count() == 1
+        assert flight.tickets_sold == 1
+
+    def test_order_should_not_report_other_integrity_errors_as_booked_seats(self, monkeypatch):
+        self.client.force_authenticate(UserFactory())
+        flight = FlightFactory()
+
+        def bulk_create(tickets):
+            raise IntegrityError("insert or update on table violates foreign key constraint")
+
+        monkeypatch.setattr(Ticket.objects, "bulk_create", bulk_create)
+
+        with pytest.raises(IntegrityError):
+            self.client.post(
+                ORDER_LIST_VIEW_URL,
+                data={"tickets": [{"row": 1, "seat": 1, "flight": flight.id}]},
+                format='json'
+            )
+
+    def test_group_order_should_not_query_per_ticket(self, django_assert_max_num_queries):
+        user = UserFactory()
+        self.client.force_authenticate(user)
+
+        flight = FlightFactory(airplane=AirplaneFactory(rows=10, seats_in_row=9))
+
+        order_data = {
+            "tickets": [
+                {"row": 1, "seat": seat, "flight": flight.id} for seat in range(1, 10)
+            ]
+        }
+
+        with django_assert_max_num_queries(14):
+            response = self.client.post(ORDER_LIST_VIEW_URL, data=order_data, format='json')
+
+        flight.refresh_from_db()
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Ticket.objects.filter(flight=flight).count() == 9
+        assert flight.tickets_sold == 9
+
+    def test_order_should_confirm_own_seat_holds_only(self):
+        holder = UserFactory()
+        flight = FlightFactory(airplane=AirplaneFactory(rows=10, seats_in_row=6))
+        holds_url = reverse_lazy("service:flights-holds", args=[flight.id])
+        order_data = {"tickets": [{"row": 3, "seat": 3, "flight": flight.id}]}
+
+        self.client.force_authenticate(holder)
+        self.client.post(holds_url, {"seats": [{"row": 3, "seat": 3}]}, format="json")
+
+        self.client.force_authenticate(UserFactory())
+        response = self.client.post(ORDER_LIST_VIEW_URL, data=order_data, format='json')
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["seats"] == [{"flight": flight.id, "row": 3, "seat": 3}]
+
+        self.client.force_authenticate(holder)
+        response = self.client.post(ORDER_LIST_VIEW_URL, data=order_data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not SeatHold.objects.exists()
+
+    def test_group_order_should_seat_passengers_together(self):
+        self.client.force_authenticate(UserFactory())
+
+        flight = FlightFactory(airplane=AirplaneFactory(rows=3, seats_in_row=4))
+        TicketFactory(flight=flight, row=1, seat=2)
+        TicketFactory(flight=flight, row=2, seat=1)
+
+        response = self.client.post(
+            reverse_lazy("service:orders-group"),
+            data={"flight": flight.id, "passengers": 3},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(
+            (ticket["row"], ticket["seat"]) for ticket in response.data["tickets"]
+        ) == [(2, 2), (2, 3), (2, 4)]
+
+    def test_group_order_should_refresh_stale_cached_seat_map(self):
+        self.client.force_authenticate(UserFactory())
+
+        flight = FlightFactory(airplane=AirplaneFactory(rows=2, seats_in_row=2))
+        stale_map = build_seat_map(flight)
+        cache.set(
+            get_seat_map_cache_key(flight.id, get_seat_map_version(flight.id)),
+            (stale_map.rows, stale_map.seats_in_row, bytes(stale_map.bits)),
+        )
+        TicketFactory(flight=flight, row=1, seat=1)
+
+        response = self.client.post(
+            reverse_lazy("service:orders-group"),
+            data={"flight": flight.id, "passengers": 2},
+            format='json'
+        )
+        rows, seats_in_row, bits = cache.get(get_seat_map_cache_key(flight.id, get_seat_map_version(flight.id)))
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(
+            (ticket["row"], ticket["seat"]) for ticket in response.data["tickets"]
+        ) == [(2, 1), (2, 2)]
+        assert bits != bytes(stale_map.bits)
+
+    def test_group_order_should_fall_back_to_adjacent_rows(self):
+        holder = UserFactory()
+        flight = FlightFactory(airplane=AirplaneFactory(rows=3, seats_in_row=2))
+        TicketFactory(flight=flight, row=1, seat=1)
+        group_url = reverse_lazy("service:orders-group")
+
+        self.client.force_authenticate(holder)
+        self.client.post(
+            reverse_lazy("service:flights-holds", args=[flight.id]),
+            {"seats": [{"row": 3, "seat": 2}]},
+            format="json"
+        )
+
+        self.client.force_authenticate(UserFactory())
+        response = self.client.post(group_url, data={"flight": flight.id, "passengers": 3}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(
+            (ticket["row"], ticket["seat"]) for ticket in response.data["tickets"]
+        ) == [(1, 2), (2, 1), (2, 2)]
+
+        response = self.client.post(group_url, data={"flight": flight.id, "passengers": 2}, format='json')
+
+        assert response.status_code == status.HTTP_409_CONFLICT
@@ -1,7 +1,18 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from service.views import AirportViewSet, RouteViewSet, ManufacturerViewSet, AirplaneViewSet, FlightViewSet, OrdersViewSet
+from service.async_views import AsyncAirportViewSet, AsyncRouteViewSet, AsyncFlightViewSet, AsyncOrdersViewSet
+from service.views import (
+    AirportViewSet,
+    RouteViewSet,
+    ManufacturerViewSet,
+    AirplaneViewSet,
+    CrewViewSet,
+    FlightViewSet,
+    OrdersViewSet,
+    ExportViewSet,
+    DatabasePoolViewSet,
+)
 
 app_name = "service"
 
@@ -10,8 +21,15 @@ router.register("airports", AirportViewSet, basename="airports")
 router.register("routes", RouteViewSet, basename="routes")
 router.register("manufacturers", ManufacturerViewSet, basename="manufacturers")
 router.register("airplanes", AirplaneViewSet, basename="airplanes")
+router.register("crew", CrewViewSet, basename="crew")
 router.register("flights", FlightViewSet, basename="flights")
 router.register("orders", OrdersViewSet, basename="orders")
+router.register("exports", ExportViewSet, basename="exports")
+router.register("database-pools", DatabasePoolViewSet, basename="database-pools")
+router.register("async/airports", AsyncAirportViewSet, basename="async-airports")
+router.register("async/routes", AsyncRouteViewSet, basename="async-routes")
+router.register("async/flights", AsyncFlightViewSet, basename="async-flights")
+router.register("async/orders", AsyncOrdersViewSet, basename="async-orders")
 
 urlpatterns = [
     path("", include(router.urls))
@@ -43,3 +43,18 @@ def generate_unique_letters_code(iterations: int = 3):
         letters[(iterations // 26) % 26] +
         letters[iterations % 26]
     )
+
+
+def batches(rows, size: int):
+    """Lists of up to `size` consecutive items of the `rows` iterable."""
+    batch = []
+
+    for row in rows:
+        batch.append(row)
+
+        if len(batch) == size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
@@ -1,32 +1,80 @@
-from django.db.models import Prefetch
+import hashlib
+from datetime import datetime, time, timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Prefetch
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter, OpenApiExample
+from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiParameter, OpenApiExample, OpenApiResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAdminUser, IsAuthenticatedOrReadOnly
+from rest_framework.renderers import JSONRenderer
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework import mixins
 
-from service.models import Airport, Route, Manufacturer, Airplane, Flight, Order
+from app.databases import get_pool_stats
+
+from service.models import Airport, Route, Manufacturer, AirplaneType, Airplane, Crew, Flight, Order, Ticket
 from service.serializers import (
     AirportSerializer,
     AirportImageSerializer,
+    AirportSearchSerializer,
+    AirportSearchResultSerializer,
+    BoardQuerySerializer,
+    DeparturesSerializer,
+    ArrivalsSerializer,
     RouteSerializer,
     RouteListSerializer,
     RouteRetrieveSerializer,
     ManufacturerSerializer,
     ManufacturerListSerializer,
     ManufacturerRetrieveSerializer,
+    ManufacturerAirplanesPageSerializer,
     AirplaneSerializer,
     AirplaneListSerializer,
     AirplaneRetrieveSerializer,
+    AirplaneFlightsSerializer,
+    AirplaneFlightsWindowSerializer,
+    FleetUtilizationQuerySerializer,
+    FleetUtilizationSerializer,
+    airplane_flights_window,
+    CrewSerializer,
+    CrewScheduleQuerySerializer,
     FlightSerializer,
     FlightReadSerializer,
+    FlightSeatMapSerializer,
+    FlightScheduleSerializer,
+    FlightScheduleResultSerializer,
+    AvailableCrewQuerySerializer,
+    AvailableCrewSerializer,
+    TicketFlightSerializer,
+    SeatHoldRequestSerializer,
+    SeatHoldSerializer,
+    ItinerarySearchSerializer,
+    ItinerarySerializer,
     OrderSerializer,
     OrderReadSerializer,
+    GroupOrderSerializer,
+    ExportQuerySerializer,
 )
-from .filters import AirplaneFilterSet, AirportFilterSet
-from .paginations import DefaultListPagination
+from .filters import AirplaneFilterSet, AirportFilterSet, CrewFilterSet, FlightFilterSet
+from .paginations import KeysetPagination, KeysetListPagination
+from .boards import DEPARTURES, ARRIVALS, get_board, get_board_removals
+from .bookings import hold_seats, release_seat_holds
+from .constants import AIRPLANE_FLIGHTS_WINDOW_LIMIT, BOARD_CACHE_TIMEOUT, BOARD_RESULTS_LIMIT
+from .caches import CachedResponseMixin, ConditionalResponseMixin, get_catalog_versions
+from .crews import eligible_crew
+from .exports import EXPORT_FORMATS, export_rows, iterate_in_thread
+from .itineraries import search_itineraries
+from .schedules import fleet_utilization
+from .search import search_airports
+from .seat_events import EventStreamRenderer, seat_event_stream
+from .seat_maps import build_seat_map, get_seat_map
 
 
 @extend_schema_view(
@@ -115,9 +163,11 @@ from .paginations import DefaultListPagination
         request=None
     )
 )
-class AirportViewSet(viewsets.ModelViewSet):
+class AirportViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     serializer_class = AirportSerializer
     filterset_class = AirportFilterSet
+    pagination_class = KeysetPagination
+    cache_dependencies = (Airport,)
 
     def get_queryset(self):
         query = Airport.objects
@@ -146,6 +196,96 @@ class AirportViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        summary="Search airports",
+        description=(
+            "Typeahead search over airport names and cities. Prefix matches "
+            "come first, then results ranked by trigram similarity."
+        ),
+        tags=["Airports"],
+        request=None,
+        parameters=[AirportSearchSerializer],
+        responses={200: AirportSearchResultSerializer(many=True)}
+    )
+    @action(
+        methods=["GET"],
+        url_path="search",
+        detail=False,
+    )
+    def search(self, request):
+        search = AirportSearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+
+        airports = search_airports(search.validated_data["q"], search.validated_data["limit"])
+        serializer = AirportSearchResultSerializer(airports, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    def board(self, request, pk, direction, serializer_class):
+        query = BoardQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        versions = ".".join(str(version) for version in get_catalog_versions([Flight, Route, Airport, Airplane]))
+        params = hashlib.md5(repr(sorted(request.query_params.lists())).encode()).hexdigest()
+        key = f"service:board:{pk}:{direction}:{versions}:{params}"
+        data = cache.get(key)
+
+        if data is None:
+            airport = self.get_object()
+            after, before, since = (query.validated_data.get(name) for name in ("after", "before", "since"))
+            board = {
+                "generated_at": timezone.now(),
+                "flights": get_board(airport.id, direction, after, before, since, BOARD_RESULTS_LIMIT),
+                "removed": (
+                    get_board_removals(airport.id, direction, after, before, since) if since is not None else []
+                ),
+            }
+            data = serializer_class(board).data
+            cache.set(key, data, BOARD_CACHE_TIMEOUT)
+
+        response = Response(data, status=status.HTTP_200_OK)
+        patch_cache_control(response, max_age=BOARD_CACHE_TIMEOUT)
+
+        return response
+
+    @extend_schema(
+        summary="Departures board",
+        description=(
+            "Flights leaving the airport within a time window, by departure time. With "
+            "`since`, only flights changed after it and the ids of the ones removed."
+        ),
+        tags=["Airports"],
+        request=None,
+        parameters=[BoardQuerySerializer],
+        responses={200: DeparturesSerializer}
+    )
+    @action(
+        methods=["GET"],
+        url_path="departures",
+        detail=True,
+    )
+    def departures(self, request, pk=None):
+        return self.board(request, pk, DEPARTURES, DeparturesSerializer)
+
+    @extend_schema(
+        summary="Arrivals board",
+        description=(
+            "Flights reaching the airport within a time window, by arrival time. With "
+            "`since`, only flights changed after it and the ids of the ones removed."
+        ),
+        tags=["Airports"],
+        request=None,
+        parameters=[BoardQuerySerializer],
+        responses={200: ArrivalsSerializer}
+    )
+    @action(
+        methods=["GET"],
+        url_path="arrivals",
+        detail=True,
+    )
+    def arrivals(self, request, pk=None):
+        return self.board(request, pk, ARRIVALS, ArrivalsSerializer)
+
     def get_serializer_class(self):
         if self.action == 'upload_image':
             return AirportImageSerializer
@@ -194,7 +334,10 @@ class AirportViewSet(viewsets.ModelViewSet):
         request=None
     )
 )
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    pagination_class = KeysetPagination
+    cache_dependencies = (Route, Airport)
+
     def get_serializer_class(self):
         if self.action == 'list':
             return RouteListSerializer
@@ -249,8 +392,22 @@ class RouteViewSet(viewsets.ModelViewSet):
     retrieve=extend_schema(
         summary="Manufacturer details",
         tags=["Manufacturers"],
-        description="Get details of a manufacturer.",
+        description="Get details of a manufacturer with one page of its airplanes.",
         request=None,
+        parameters=[
+            OpenApiParameter(
+                name="airplanes_limit",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Number of airplanes to include (default 20, max 100).",
+            ),
+            OpenApiParameter(
+                name="airplanes_offset",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Number of airplanes to skip.",
+            ),
+        ]
     ),
     update=extend_schema(
         summary="Update manufacturer",
@@ -268,18 +425,39 @@ class RouteViewSet(viewsets.ModelViewSet):
     )
 )
 class ManufacturerViewSet(
+    CachedResponseMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
     mixins.UpdateModelMixin,
     viewsets.GenericViewSet
 ):
-    queryset = Manufacturer.objects.all().prefetch_related(
-        Prefetch(
-            'airplanes',
-            queryset=Airplane.objects.select_related('type')
-        )
-    )
+    pagination_class = KeysetPagination
+    cache_dependencies = (Manufacturer, Airplane, AirplaneType)
+    queryset = Manufacturer.objects.all()
+
+    def get_queryset(self):
+        match self.action:
+            case "list":
+                return self.queryset.annotate(airplanes_count=Count("airplanes"))
+            case "retrieve":
+                page = ManufacturerAirplanesPageSerializer(data=self.request.query_params)
+                page.is_valid(raise_exception=True)
+
+                offset = page.validated_data["airplanes_offset"]
+                limit = page.validated_data["airplanes_limit"]
+
+                return (
+                    self.queryset
+                        .annotate(airplanes_count=Count("airplanes"))
+                        .prefetch_related(Prefetch(
+                            "airplanes",
+                            queryset=Airplane.objects.select_related("type").order_by("id")[offset:offset + limit],
+                            to_attr="airplanes_page"
+                        ))
+                )
+
+        return self.queryset
 
     def get_serializer_class(self):
         match self.action:
@@ -403,19 +581,38 @@ class ManufacturerViewSet(
         request=None,
     )
 )
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     model = Airplane
     filterset_class = AirplaneFilterSet
+    pagination_class = KeysetPagination
+    cache_dependencies = (Airplane, AirplaneType, Manufacturer, Flight, Route, Airport)
+    # The flights window embedded in retrieve moves with the clock, not with
+    # model versions, so it is neither cached nor answered with 304.
+    conditional_actions = ("list",)
 
     def get_queryset(self):
-        return (
-            Airplane.objects
-                .select_related('manufacturer', 'type')
-                .prefetch_related(Prefetch(
-                    'flights',
-                    queryset=Flight.objects.prefetch_related("route__source", "route__destination"))
+        queryset = Airplane.objects.select_related('manufacturer', 'type')
+
+        match self.action:
+            case "list":
+                return queryset.annotate(flights_count=Count("flights"))
+            case "retrieve":
+                window = AirplaneFlightsWindowSerializer(data=self.request.query_params)
+                window.is_valid(raise_exception=True)
+
+                return (
+                    queryset
+                        .annotate(flights_count=Count("flights"))
+                        .prefetch_related(Prefetch(
+                            "flights",
+                            queryset=airplane_flights_window(
+                                window.validated_data["flights_window"]
+                            )[:AIRPLANE_FLIGHTS_WINDOW_LIMIT],
+                            to_attr="flights_window"
+                        ))
                 )
-        )
+
+        return queryset
 
     def get_serializer_class(self):
         match self.action:
@@ -423,6 +620,8 @@ class AirplaneViewSet(viewsets.ModelViewSet):
                 return AirplaneListSerializer
             case "retrieve":
                 return AirplaneRetrieveSerializer
+            case "flights":
+                return AirplaneFlightsSerializer
         return AirplaneSerializer
 
     def create(self, request, *args, **kwargs):
@@ -448,6 +647,153 @@ class AirplaneViewSet(viewsets.ModelViewSet):
 
         return Response(outer_serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        summary="Airplane flights",
+        description="Get the full flight history of an airplane, earliest first, page by page.",
+        tags=["Airplanes"],
+        request=None,
+        responses={200: AirplaneFlightsSerializer(many=True)}
+    )
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="flights",
+        pagination_class=KeysetListPagination,
+    )
+    def flights(self, request, pk=None):
+        airplane = self.get_object()
+        queryset = (
+            airplane.flights
+                .select_related("route__source", "route__destination")
+                .order_by("departure_time", "id")
+        )
+
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+
+        return self.get_paginated_response(serializer.data)
+
+    @extend_schema(
+        summary="Fleet utilization",
+        description=(
+            "Busy hours, utilization and idle gaps of every airplane within "
+            "a time window. Staff only."
+        ),
+        tags=["Airplanes"],
+        request=None,
+        parameters=[FleetUtilizationQuerySerializer],
+        responses={200: FleetUtilizationSerializer},
+    )
+    @action(
+        methods=["GET"],
+        detail=False,
+        url_path="utilization",
+        permission_classes=[IsAdminUser],
+    )
+    def utilization(self, request):
+        query = FleetUtilizationQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        after, before = query.validated_data["after"], query.validated_data["before"]
+        serializer = FleetUtilizationSerializer({
+            "after": after,
+            "before": before,
+            "airplanes": fleet_utilization(
+                after,
+                before,
+                timedelta(hours=query.validated_data["min_gap_hours"])
+            ),
+        })
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Crew list",
+        description=(
+            "Get a list of crew members ordered by name, optionally searched "
+            "by name prefix and filtered by crew type and position."
+        ),
+        tags=["Crew"],
+        request=None,
+    ),
+    retrieve=extend_schema(
+        summary="Crew member details",
+        description="Get details of a crew member.",
+        tags=["Crew"],
+        request=None,
+    ),
+    create=extend_schema(
+        summary="Create crew member",
+        description="Create a new crew member.",
+        tags=["Crew"],
+    ),
+    update=extend_schema(
+        summary="Update crew member",
+        description="Update an existing crew member.",
+        tags=["Crew"],
+    ),
+    partial_update=extend_schema(
+        summary="Partial update crew member",
+        description="Partial update an existing crew member.",
+        tags=["Crew"],
+    ),
+    destroy=extend_schema(
+        summary="Delete crew member",
+        description="Delete an existing crew member.",
+        tags=["Crew"],
+        request=None,
+    )
+)
+class CrewViewSet(CachedResponseMixin, viewsets.ModelViewSet):
+    queryset = Crew.objects.all()
+    serializer_class = CrewSerializer
+    filterset_class = CrewFilterSet
+    pagination_class = KeysetListPagination
+    # Walks the (first_name, last_name) index.
+    keyset_ordering = ("first_name", "last_name", "id")
+    cache_dependencies = (Crew,)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "list":
+            return queryset.order_by(*self.keyset_ordering)
+
+        return queryset
+
+    @extend_schema(
+        summary="Crew member schedule",
+        description="Get the flights a crew member is rostered on within a time window, earliest first.",
+        tags=["Crew"],
+        request=None,
+        parameters=[CrewScheduleQuerySerializer],
+        responses={200: TicketFlightSerializer(many=True)},
+    )
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="schedule",
+    )
+    def schedule(self, request, pk=None):
+        crew = self.get_object()
+        query = CrewScheduleQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        flights = (
+            crew.flights
+                .filter(
+                    departure_time__lt=query.validated_data["before"],
+                    arrival_time__gt=query.validated_data["after"],
+                )
+                .select_related("route__source", "route__destination", "airplane")
+                .order_by("departure_time", "id")
+        )
+        serializer = TicketFlightSerializer(flights, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -455,6 +801,62 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         description="Get a list of flights.",
         tags=["Flights"],
         request=None,
+        parameters=[
+            OpenApiParameter(
+                name="source",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Filter by source airport id.",
+            ),
+            OpenApiParameter(
+                name="destination",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Filter by destination airport id.",
+            ),
+            OpenApiParameter(
+                name="source_city",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Filter by source airport city.",
+            ),
+            OpenApiParameter(
+                name="destination_city",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Filter by destination airport city.",
+            ),
+            OpenApiParameter(
+                name="departure_after",
+                type=OpenApiTypes.DATE,
+                required=False,
+                description="Departure date from (inclusive).",
+            ),
+            OpenApiParameter(
+                name="departure_before",
+                type=OpenApiTypes.DATE,
+                required=False,
+                description="Departure date to (inclusive).",
+            ),
+            OpenApiParameter(
+                name="airplane_type",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Filter by airplane type name.",
+            ),
+            OpenApiParameter(
+                name="manufacturer",
+                type=OpenApiTypes.STR,
+                required=False,
+                description="Filter by airplane manufacturer name.",
+            ),
+            OpenApiParameter(
+                name="min_seats",
+                type=OpenApiTypes.INT,
+                required=False,
+                description="Only flights with at least this many seats available.",
+            ),
+        ]
     ),
     retrieve=extend_schema(
         summary="Flight details",
@@ -490,27 +892,236 @@ class AirplaneViewSet(viewsets.ModelViewSet):
         request=None
     )
 )
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(ConditionalResponseMixin, viewsets.ModelViewSet):
     model = Flight
-    pagination_class = DefaultListPagination
+    pagination_class = KeysetListPagination
+    filterset_class = FlightFilterSet
+    cache_dependencies = (Flight, Ticket, Route, Airport, Airplane, Manufacturer, Crew)
 
     def get_serializer_class(self):
         match self.action:
             case "list" | "retrieve":
                 return FlightReadSerializer
+            case "schedule":
+                return FlightScheduleSerializer
+            case "available_crew":
+                return AvailableCrewSerializer
         return FlightSerializer
 
     def get_queryset(self):
+        if self.action in ("seat_map", "seat_events", "holds", "available_crew"):
+            return Flight.objects.select_related("airplane")
+
         return (
             Flight.objects
                 .select_related(
-                    "airplane",
+                    "airplane__manufacturer",
                     "route__source",
                     "route__destination"
                 )
                 .prefetch_related("crew")
             )
 
+    @extend_schema(
+        summary="Create recurring flights",
+        description=(
+            "Create a flight on every matching day and departure time between "
+            "two dates, all with the same route, airplane and crew. Flights "
+            "overlapping existing flights of the airplane are returned with "
+            "409, or left out when skip_conflicts is set. Admin only."
+        ),
+        tags=["Flights"],
+        request=FlightScheduleSerializer,
+        responses={
+            201: FlightScheduleResultSerializer,
+            409: OpenApiResponse(description="Some flights overlap existing flights of the airplane."),
+        },
+    )
+    @action(
+        methods=["POST"],
+        url_path="schedule",
+        detail=False,
+    )
+    def schedule(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        output_serializer = FlightScheduleResultSerializer(serializer.save())
+
+        return Response(output_serializer.data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Available crew",
+        description=(
+            "Crew members who could be rostered on the flight: not on it or "
+            "on any overlapping flight, and within duty limits. Ordered by "
+            "position. Admin only."
+        ),
+        tags=["Flights"],
+        request=None,
+        parameters=[AvailableCrewQuerySerializer],
+        responses={200: AvailableCrewSerializer(many=True)},
+    )
+    @action(
+        methods=["GET"],
+        url_path="available-crew",
+        detail=True,
+        permission_classes=[IsAdminUser],
+    )
+    def available_crew(self, request, pk=None):
+        flight = self.get_object()
+        query = AvailableCrewQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        crew = eligible_crew(flight, **query.validated_data)
+        serializer = self.get_serializer(crew, many=True)
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Flight seat map",
+        description="Get free and occupied seats of a flight, row by row.",
+        tags=["Flights"],
+        request=None,
+        responses={200: FlightSeatMapSerializer},
+    )
+    @action(
+        methods=["GET"],
+        url_path="seat-map",
+        detail=True,
+    )
+    def seat_map(self, request, pk=None):
+        flight = self.get_object()
+        serializer = FlightSeatMapSerializer(get_seat_map(flight))
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Flight seat events",
+        description=(
+            "Server-sent events of a flight instead of polling it: a 'snapshot' "
+            "event with the seat map, then a 'seat' event with row, seat and "
+            "taken for every seat booked or released. A 'reset' event asks "
+            "the client to reconnect. Needs the ASGI server."
+        ),
+        tags=["Flights"],
+        request=None,
+        responses={
+            (200, "text/event-stream"): OpenApiTypes.STR,
+            501: OpenApiResponse(description="Not served by the ASGI server."),
+        },
+    )
+    @action(
+        methods=["GET"],
+        url_path="seat-events",
+        detail=True,
+        renderer_classes=[JSONRenderer, EventStreamRenderer],
+    )
+    def seat_events(self, request, pk=None):
+        if not isinstance(request._request, ASGIRequest):
+            # A WSGI worker would be held for as long as the stream is open.
+            return Response(
+                {"detail": "Seat events are only served by the ASGI server."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+
+        flight = self.get_object()
+        # Read from tickets once the stream listens: a cached map may predate
+        # changes that no delta would correct.
+        snapshot = sync_to_async(lambda: FlightSeatMapSerializer(build_seat_map(flight)).data)
+        response = StreamingHttpResponse(seat_event_stream(flight.id, snapshot), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+
+        return response
+
+    @extend_schema(
+        methods=["POST"],
+        summary="Hold seats",
+        description=(
+            "Reserve seats of a flight for the current user for a limited time. "
+            "Either all requested seats are held or none, in which case the "
+            "unavailable seats are returned with 409."
+        ),
+        tags=["Flights"],
+        request=SeatHoldRequestSerializer,
+        responses={
+            201: SeatHoldSerializer(many=True),
+            409: OpenApiResponse(description="Some of the requested seats are booked or held."),
+        },
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        summary="Release seat holds",
+        description="Release all seats of a flight held by the current user.",
+        tags=["Flights"],
+        request=None,
+        responses={204: None},
+    )
+    @action(
+        methods=["POST", "DELETE"],
+        url_path="holds",
+        detail=True,
+        permission_classes=[IsAuthenticated],
+    )
+    def holds(self, request, pk=None):
+        flight = self.get_object()
+
+        if request.method == "DELETE":
+            release_seat_holds(flight, request.user)
+
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        serializer = SeatHoldRequestSerializer(data=request.data, context={"flight": flight})
+        serializer.is_valid(raise_exception=True)
+
+        holds = hold_seats(
+            flight,
+            request.user,
+            [(seat["row"], seat["seat"]) for seat in serializer.validated_data["seats"]]
+        )
+
+        return Response(SeatHoldSerializer(holds, many=True).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Itinerary search",
+        description=(
+            "Find journeys of up to max_legs connecting flights between two airports. "
+            "The first leg departs within the given dates, every connection lasts "
+            "between min_connection and max_connection minutes. X-Itineraries-Truncated "
+            "is true when the search had too many connections to follow them all, so "
+            "journeys arriving later may be missing."
+        ),
+        tags=["Flights"],
+        request=None,
+        parameters=[ItinerarySearchSerializer],
+        responses={200: ItinerarySerializer(many=True)},
+    )
+    @action(
+        methods=["GET"],
+        url_path="itineraries",
+        detail=False,
+    )
+    def itineraries(self, request):
+        search = ItinerarySearchSerializer(data=request.query_params)
+        search.is_valid(raise_exception=True)
+        data = search.validated_data
+
+        itineraries, truncated = search_itineraries(
+            source=data["source"].id,
+            destination=data["destination"].id,
+            departure_from=datetime.combine(data["departure_after"], time.min),
+            departure_to=datetime.combine(data["departure_before"], time.max),
+            max_legs=data["max_legs"],
+            min_connection=timedelta(minutes=data["min_connection"]),
+            max_connection=timedelta(minutes=data["max_connection"]),
+        )
+        serializer = ItinerarySerializer(itineraries, many=True)
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        response["X-Itineraries-Truncated"] = "true" if truncated else "false"
+
+        return response
+
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
@@ -555,7 +1166,10 @@ class FlightViewSet(viewsets.ModelViewSet):
         description="Create a new order.",
         tags=["Orders"],
         request=OrderSerializer,
-        responses={201: OrderReadSerializer}
+        responses={
+            201: OrderReadSerializer,
+            409: OpenApiResponse(description="Some of the requested seats are already booked."),
+        }
     ),
     destroy=extend_schema(
         summary="Delete order",
@@ -565,6 +1179,7 @@ class FlightViewSet(viewsets.ModelViewSet):
     )
 )
 class OrdersViewSet(
+    ConditionalResponseMixin,
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -572,8 +1187,9 @@ class OrdersViewSet(
     mixins.DestroyModelMixin,
 ):
     queryset = Order.objects.all()
-    pagination_class = DefaultListPagination
+    pagination_class = KeysetListPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
+    cache_dependencies = (Order, Ticket, Flight, Route, Airport, Airplane)
 
     def get_queryset(self):
         if self.request.user.is_authenticated:
@@ -593,10 +1209,19 @@ class OrdersViewSet(
 
         return Order.objects.none()
 
+    def get_cache_role(self) -> str:
+        # Orders are per user, so are their versions.
+        if self.request.user.is_authenticated:
+            return f"user-{self.request.user.pk}"
+
+        return super().get_cache_role()
+
     def get_serializer_class(self):
         match self.action:
             case "list" | "retrieve":
                 return OrderReadSerializer
+            case "group":
+                return GroupOrderSerializer
         return OrderSerializer
 
     def create(self, request, *args, **kwargs):
@@ -605,9 +1230,129 @@ class OrdersViewSet(
 
         self.perform_create(serializer)
 
-        output_serializer = OrderReadSerializer(serializer.instance)
+        output_serializer = OrderReadSerializer(self.get_queryset().get(pk=serializer.instance.pk))
 
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @extend_schema(
+        summary="Create group order",
+        description=(
+            "Book seats for a group on one flight. The server picks adjacent "
+            "seats in one row, or the smallest block of rows when no row fits."
+        ),
+        tags=["Orders"],
+        request=GroupOrderSerializer,
+        responses={
+            201: OrderReadSerializer,
+            409: OpenApiResponse(description="The flight has not enough free seats for this group."),
+        }
+    )
+    @action(
+        methods=["POST"],
+        url_path="group",
+        detail=False,
+    )
+    def group(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        order = serializer.save(user=request.user)
+        output_serializer = OrderReadSerializer(self.get_queryset().get(pk=order.pk))
+
+        return Response(output_serializer.data, status=status.HTTP_201_CREATED)
+
+
+def export_schema(dataset: str):
+    return extend_schema(
+        summary=f"Export {dataset}",
+        description=(
+            f"Stream all {dataset} as NDJSON, CSV, Parquet or an Arrow IPC "
+            f"stream, optionally limited to a date range and an airport. "
+            f"Staff only."
+        ),
+        tags=["Exports"],
+        request=None,
+        parameters=[ExportQuerySerializer],
+        responses={
+            (200, content_type): OpenApiTypes.STR
+            for content_type, _extension, _chunks, _binary in EXPORT_FORMATS.values()
+        }
+    )
+
+
+class ExportViewSet(viewsets.ViewSet):
+    permission_classes = [IsAdminUser]
+
+    def export(self, request, dataset):
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        airport = query.validated_data.get("airport")
+        columns, rows = export_rows(
+            dataset,
+            after=query.validated_data.get("after"),
+            before=query.validated_data.get("before"),
+            airport=airport.id if airport else None,
+        )
+        content_type, extension, chunks, _binary = EXPORT_FORMATS[query.validated_data["output"]]
+
+        content = chunks(dataset, columns, rows)
+
+        if isinstance(request._request, ASGIRequest):
+            content = iterate_in_thread(content)
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.{extension}"'
+
+        return response
+
+    @export_schema("flights")
+    @action(methods=["GET"], detail=False)
+    def flights(self, request):
+        return self.export(request, "flights")
+
+    @export_schema("tickets")
+    @action(methods=["GET"], detail=False)
+    def tickets(self, request):
+        return self.export(request, "tickets")
+
+    @export_schema("orders")
+    @action(methods=["GET"], detail=False)
+    def orders(self, request):
+        return self.export(request, "orders")
+
+    @export_schema("routes")
+    @action(methods=["GET"], detail=False)
+    def routes(self, request):
+        return self.export(request, "routes")
+
+    @export_schema("airplanes")
+    @action(methods=["GET"], detail=False)
+    def airplanes(self, request):
+        return self.export(request, "airplanes")
+
+    @export_schema("crew")
+    @action(methods=["GET"], detail=False)
+    def crew(self, request):
+        return self.export(request, "crew")
+
+
+class DatabasePoolViewSet(viewsets.ViewSet):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Database connection pools",
+        description=(
+            "Statistics of the connection pool of every database in the "
+            "process serving the request, null for databases without a pool "
+            "(POSTGRES_POOL unset). Staff only."
+        ),
+        tags=["Databases"],
+        request=None,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def list(self, request):
+        return Response(get_pool_stats())